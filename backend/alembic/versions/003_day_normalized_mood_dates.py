@@ -0,0 +1,41 @@
+"""Normalize country_mood.date to the calendar day
+
+Revision ID: 003_day_normalized_mood_dates
+Revises: 002_add_news_fields
+Create Date: 2026-10-19
+
+Rows used to be stamped with the full utcnow() timestamp, so uq_country_date
+never deduplicated anything.  Keep the most recent row per country per day
+and truncate every date to midnight so the bulk upsert can key on the day.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_day_normalized_mood_dates'
+down_revision: Union[str, None] = '002_add_news_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop all but the latest snapshot of each (country, day)
+    op.execute("""
+        DELETE FROM country_mood a
+        USING country_mood b
+        WHERE a.country_code = b.country_code
+          AND date_trunc('day', a.date) = date_trunc('day', b.date)
+          AND (a.date < b.date OR (a.date = b.date AND a.id < b.id))
+    """)
+    op.execute("""
+        UPDATE country_mood
+        SET date = date_trunc('day', date)
+        WHERE date <> date_trunc('day', date)
+    """)
+
+
+def downgrade() -> None:
+    # Collapsed intra-day snapshots cannot be restored.
+    pass
@@ -0,0 +1,63 @@
+"""Add country_mood_latest table
+
+Revision ID: 004_country_mood_latest
+Revises: 003_day_normalized_mood_dates
+Create Date: 2026-10-19
+
+Holds the newest country_mood row per country so /mood/global reads ~60 rows
+instead of a DISTINCT ON over all history.  Kept current by the upsert write
+path; scripts/rebuild_latest.py verifies or rebuilds it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_country_mood_latest'
+down_revision: Union[str, None] = '003_day_normalized_mood_dates'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'country_mood_latest',
+        sa.Column('country_code', sa.String(length=3), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('country_name', sa.String(length=120), nullable=False),
+        sa.Column('mood_score', sa.Float(), nullable=False),
+        sa.Column('mood_label', sa.String(length=20), nullable=False),
+        sa.Column('color_code', sa.String(length=7), nullable=False),
+        sa.Column('valence', sa.Float(), nullable=True),
+        sa.Column('energy', sa.Float(), nullable=True),
+        sa.Column('danceability', sa.Float(), nullable=True),
+        sa.Column('acousticness', sa.Float(), nullable=True),
+        sa.Column('top_genre', sa.String(length=60), nullable=True),
+        sa.Column('top_track', sa.String(length=200), nullable=True),
+        sa.Column('news_sentiment', sa.Float(), nullable=True),
+        sa.Column('news_headlines', sa.Text(), nullable=True),
+        sa.Column('news_summary', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('country_code'),
+    )
+
+    # Seed from existing history
+    op.execute("""
+        INSERT INTO country_mood_latest (
+            country_code, date, country_name, mood_score, mood_label, color_code,
+            valence, energy, danceability, acousticness, top_genre, top_track,
+            news_sentiment, news_headlines, news_summary
+        )
+        SELECT DISTINCT ON (country_code)
+            country_code, date, country_name, mood_score, mood_label, color_code,
+            valence, energy, danceability, acousticness, top_genre, top_track,
+            news_sentiment, news_headlines, news_summary
+        FROM country_mood
+        ORDER BY country_code, date DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('country_mood_latest')
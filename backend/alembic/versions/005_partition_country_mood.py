@@ -0,0 +1,134 @@
+"""Partition country_mood by month on date
+
+Revision ID: 005_partition_country_mood
+Revises: 004_country_mood_latest
+Create Date: 2026-10-19
+
+Rebuilds country_mood as a declaratively range-partitioned table with one
+partition per calendar month.  The three overlapping indexes
+(idx_country_mood_code, _date, _code_date) are replaced by the
+uq_country_date index, which serves per-country lookups while date-range
+filters prune whole partitions.  Future partitions and retention are handled
+by scripts/manage_partitions.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_partition_country_mood'
+down_revision: Union[str, None] = '004_country_mood_latest'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_MONTHS = 3
+
+COLUMNS = """
+    country_code, date, country_name, mood_score, mood_label, color_code,
+    valence, energy, danceability, acousticness, top_genre, top_track,
+    news_sentiment, news_headlines, news_summary, created_at
+"""
+
+
+def upgrade() -> None:
+    # Move the heap table aside; keep its id sequence alive for the new table.
+    op.execute("ALTER TABLE country_mood RENAME TO country_mood_unpartitioned")
+    op.execute("ALTER TABLE country_mood_unpartitioned RENAME CONSTRAINT uq_country_date TO uq_country_date_unpartitioned")
+    op.execute("ALTER TABLE country_mood_unpartitioned RENAME CONSTRAINT country_mood_pkey TO country_mood_unpartitioned_pkey")
+    op.execute("ALTER SEQUENCE country_mood_id_seq OWNED BY NONE")
+    op.execute("DROP INDEX IF EXISTS idx_country_mood_code")
+    op.execute("DROP INDEX IF EXISTS idx_country_mood_date")
+    op.execute("DROP INDEX IF EXISTS idx_country_mood_code_date")
+    op.execute("DROP INDEX IF EXISTS ix_country_mood_country_code")
+
+    op.execute("""
+        CREATE TABLE country_mood (
+            id INTEGER NOT NULL DEFAULT nextval('country_mood_id_seq'),
+            country_code VARCHAR(3) NOT NULL,
+            country_name VARCHAR(120) NOT NULL,
+            date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            mood_score DOUBLE PRECISION NOT NULL,
+            mood_label VARCHAR(20) NOT NULL,
+            color_code VARCHAR(7) NOT NULL,
+            valence DOUBLE PRECISION,
+            energy DOUBLE PRECISION,
+            danceability DOUBLE PRECISION,
+            acousticness DOUBLE PRECISION,
+            top_genre VARCHAR(60),
+            top_track VARCHAR(200),
+            news_sentiment DOUBLE PRECISION,
+            news_headlines TEXT,
+            news_summary TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+            CONSTRAINT country_mood_pkey PRIMARY KEY (id, date),
+            CONSTRAINT uq_country_date UNIQUE (country_code, date)
+        ) PARTITION BY RANGE (date)
+    """)
+    op.execute("ALTER SEQUENCE country_mood_id_seq OWNED BY country_mood.id")
+
+    # One partition per month from the oldest row through PREMAKE_MONTHS ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            m DATE;
+            last_month DATE := date_trunc('month', now())::date + INTERVAL '{PREMAKE_MONTHS} months';
+        BEGIN
+            SELECT COALESCE(date_trunc('month', min(date))::date, date_trunc('month', now())::date)
+              INTO m FROM country_mood_unpartitioned;
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF country_mood FOR VALUES FROM (%L) TO (%L)',
+                    'country_mood_' || to_char(m, 'YYYY_MM'), m, (m + INTERVAL '1 month')::date
+                );
+                m := (m + INTERVAL '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"""
+        INSERT INTO country_mood (id, {COLUMNS})
+        SELECT id, {COLUMNS} FROM country_mood_unpartitioned
+    """)
+    op.execute("DROP TABLE country_mood_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE country_mood RENAME TO country_mood_partitioned")
+    op.execute("ALTER TABLE country_mood_partitioned RENAME CONSTRAINT uq_country_date TO uq_country_date_partitioned")
+    op.execute("ALTER TABLE country_mood_partitioned RENAME CONSTRAINT country_mood_pkey TO country_mood_partitioned_pkey")
+    op.execute("ALTER SEQUENCE country_mood_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE country_mood (
+            id INTEGER NOT NULL DEFAULT nextval('country_mood_id_seq'),
+            country_code VARCHAR(3) NOT NULL,
+            country_name VARCHAR(120) NOT NULL,
+            date TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            mood_score DOUBLE PRECISION NOT NULL,
+            mood_label VARCHAR(20) NOT NULL,
+            color_code VARCHAR(7) NOT NULL,
+            valence DOUBLE PRECISION,
+            energy DOUBLE PRECISION,
+            danceability DOUBLE PRECISION,
+            acousticness DOUBLE PRECISION,
+            top_genre VARCHAR(60),
+            top_track VARCHAR(200),
+            news_sentiment DOUBLE PRECISION,
+            news_headlines TEXT,
+            news_summary TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+            CONSTRAINT country_mood_pkey PRIMARY KEY (id),
+            CONSTRAINT uq_country_date UNIQUE (country_code, date)
+        )
+    """)
+    op.execute("ALTER SEQUENCE country_mood_id_seq OWNED BY country_mood.id")
+    op.execute(f"""
+        INSERT INTO country_mood (id, {COLUMNS})
+        SELECT id, {COLUMNS} FROM country_mood_partitioned
+    """)
+    op.execute("DROP TABLE country_mood_partitioned")  # drops its partitions too
+
+    op.create_index('idx_country_mood_code', 'country_mood', ['country_code'])
+    op.create_index('idx_country_mood_date', 'country_mood', ['date'])
+    op.create_index('idx_country_mood_code_date', 'country_mood', ['country_code', 'date'])
@@ -0,0 +1,65 @@
+"""Add weekly/monthly country_mood rollups
+
+Revision ID: 006_country_mood_rollups
+Revises: 005_partition_country_mood
+Create Date: 2026-10-19
+
+country_mood_rollup holds one row per (country, resolution, period) with the
+mean/min/max score, dominant label and mean audio features, so long-range
+history charts read ~52 rows a year instead of ~365.  Kept current by the
+upsert write path for the periods it touches; seeded here from history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_country_mood_rollups'
+down_revision: Union[str, None] = '005_partition_country_mood'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RESOLUTIONS = ("week", "month")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'country_mood_rollup',
+        sa.Column('country_code', sa.String(length=3), nullable=False),
+        sa.Column('resolution', sa.String(length=5), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('mood_score_mean', sa.Float(), nullable=False),
+        sa.Column('mood_score_min', sa.Float(), nullable=False),
+        sa.Column('mood_score_max', sa.Float(), nullable=False),
+        sa.Column('dominant_label', sa.String(length=20), nullable=False),
+        sa.Column('valence', sa.Float(), nullable=True),
+        sa.Column('energy', sa.Float(), nullable=True),
+        sa.Column('danceability', sa.Float(), nullable=True),
+        sa.Column('acousticness', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('country_code', 'resolution', 'period_start'),
+    )
+
+    # Seed from existing history
+    for resolution in RESOLUTIONS:
+        op.execute(f"""
+            INSERT INTO country_mood_rollup (
+                country_code, resolution, period_start, sample_count,
+                mood_score_mean, mood_score_min, mood_score_max, dominant_label,
+                valence, energy, danceability, acousticness
+            )
+            SELECT
+                country_code, '{resolution}', date_trunc('{resolution}', date), count(*),
+                avg(mood_score), min(mood_score), max(mood_score),
+                mode() WITHIN GROUP (ORDER BY mood_label),
+                avg(valence), avg(energy), avg(danceability), avg(acousticness)
+            FROM country_mood
+            GROUP BY country_code, date_trunc('{resolution}', date)
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table('country_mood_rollup')
@@ -0,0 +1,90 @@
+"""Move news text out of country_mood into country_news
+
+Revision ID: 007_country_news
+Revises: 006_country_mood_rollups
+Create Date: 2026-10-19
+
+news_headlines (JSON text) and news_summary were carried on every
+country_mood and country_mood_latest row, widening the rows that list and
+trend queries scan.  They now live in country_news keyed by
+(country_code, day) with headlines as JSONB, joined only by detail views.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_country_news'
+down_revision: Union[str, None] = '006_country_mood_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'country_news',
+        sa.Column('country_code', sa.String(length=3), nullable=False),
+        sa.Column('day', sa.DateTime(), nullable=False),
+        sa.Column('headlines', postgresql.JSONB(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('country_code', 'day'),
+    )
+
+    # news_headlines was free text written by several code paths, so not
+    # every row holds a JSON array: JSON strings become one-element arrays,
+    # anything that does not parse becomes an array of its non-blank lines.
+    op.execute("""
+        CREATE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb
+        LANGUAGE plpgsql IMMUTABLE AS $$
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        INSERT INTO country_news (country_code, day, headlines, summary)
+        SELECT country_code, date,
+               CASE
+                   WHEN news_headlines IS NULL THEN NULL
+                   WHEN jsonb_typeof(parsed) = 'array' THEN parsed
+                   WHEN jsonb_typeof(parsed) = 'string' THEN jsonb_build_array(parsed)
+                   WHEN parsed IS NULL THEN coalesce(
+                       (SELECT jsonb_agg(btrim(line))
+                        FROM regexp_split_to_table(news_headlines, E'\\r?\\n') AS line
+                        WHERE btrim(line) <> ''),
+                       '[]'::jsonb)
+                   ELSE '[]'::jsonb
+               END,
+               news_summary
+        FROM (
+            SELECT country_code, date, news_headlines, news_summary,
+                   pg_temp.try_jsonb(news_headlines) AS parsed
+            FROM country_mood
+            WHERE news_headlines IS NOT NULL OR news_summary IS NOT NULL
+        ) AS legacy
+    """)
+    op.execute("DROP FUNCTION pg_temp.try_jsonb(text)")
+
+    for table in ('country_mood', 'country_mood_latest'):
+        op.drop_column(table, 'news_headlines')
+        op.drop_column(table, 'news_summary')
+
+
+def downgrade() -> None:
+    for table in ('country_mood', 'country_mood_latest'):
+        op.add_column(table, sa.Column('news_headlines', sa.Text(), nullable=True))
+        op.add_column(table, sa.Column('news_summary', sa.Text(), nullable=True))
+        op.execute(f"""
+            UPDATE {table} t
+            SET news_headlines = n.headlines::text, news_summary = n.summary
+            FROM country_news n
+            WHERE n.country_code = t.country_code AND n.day = t.date
+        """)
+
+    op.drop_table('country_news')
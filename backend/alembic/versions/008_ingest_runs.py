@@ -0,0 +1,51 @@
+"""Add ingest_run / ingest_item checkpoint tables
+
+Revision ID: 008_ingest_runs
+Revises: 007_country_news
+Create Date: 2026-10-19
+
+The daily ingest records each country's last finished stage and its
+intermediate artifacts (features, headlines, sentiment, summary) so a
+failed run can be resumed without re-fetching finished countries.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_ingest_runs'
+down_revision: Union[str, None] = '007_country_news'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingest_run',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('status', sa.String(length=12), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'ingest_item',
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('country_code', sa.String(length=3), nullable=False),
+        sa.Column('stage', sa.String(length=12), nullable=False),
+        sa.Column('features', postgresql.JSONB(), nullable=True),
+        sa.Column('headlines', postgresql.JSONB(), nullable=True),
+        sa.Column('sentiment', sa.Float(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['run_id'], ['ingest_run.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('run_id', 'country_code'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingest_item')
+    op.drop_table('ingest_run')
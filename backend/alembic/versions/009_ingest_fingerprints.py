@@ -0,0 +1,32 @@
+"""Add input fingerprints and track lists to ingest_item
+
+Revision ID: 009_ingest_fingerprints
+Revises: 008_ingest_runs
+Create Date: 2026-10-19
+
+The ingest hashes each country's top-track list and headline set; when
+the hash matches the country's last persisted item, that item's features,
+sentiment and summary are reused instead of recomputed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_ingest_fingerprints'
+down_revision: Union[str, None] = '008_ingest_runs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ingest_item', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+    op.add_column('ingest_item', sa.Column('tracks', postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingest_item', 'tracks')
+    op.drop_column('ingest_item', 'fingerprint')
@@ -0,0 +1,38 @@
+"""Add mood_spike_state for the streaming spike detector
+
+Revision ID: 010_spike_state
+Revises: 009_ingest_fingerprints
+Create Date: 2026-10-19
+
+One row per country with the running mean / variance of mood_score, so
+each new score is checked and folded in without re-reading history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_spike_state'
+down_revision: Union[str, None] = '009_ingest_fingerprints'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mood_spike_state',
+        sa.Column('country_code', sa.String(length=3), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('mean', sa.Float(), nullable=False),
+        sa.Column('variance', sa.Float(), nullable=False),
+        sa.Column('last_label', sa.String(length=20), nullable=True),
+        sa.Column('observed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('country_code'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('mood_spike_state')
@@ -0,0 +1,32 @@
+"""Record which detector fired on mood_spike
+
+Revision ID: 011_spike_detector
+Revises: 010_spike_state
+Create Date: 2026-10-19
+
+Spikes can now come from the z-score rule, the streaming detector or the
+anomaly engine (EWMA chart, CUSUM, IsolationForest); existing rows were
+all produced by the z-score rule.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_spike_detector'
+down_revision: Union[str, None] = '010_spike_state'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'mood_spike',
+        sa.Column('detector', sa.String(length=12), server_default='zscore', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('mood_spike', 'detector')
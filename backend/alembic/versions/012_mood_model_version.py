@@ -0,0 +1,37 @@
+"""Record the mood classifier version on country_mood rows
+
+Revision ID: 012_mood_model_version
+Revises: 011_spike_detector
+Create Date: 2026-10-19
+
+mood_label can now come from a trained classifier instead of the rule
+engine; every row records which one chose it.  Existing rows were all
+labelled by the rules.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012_mood_model_version'
+down_revision: Union[str, None] = '011_spike_detector'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('country_mood', 'country_mood_latest')
+
+
+def upgrade() -> None:
+    # On the partitioned country_mood this reaches every partition
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column('model_version', sa.String(length=40), server_default='rules', nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'model_version')
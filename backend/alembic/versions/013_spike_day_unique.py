@@ -0,0 +1,41 @@
+"""One mood_spike per country, day and detector
+
+Revision ID: 013_spike_day_unique
+Revises: 012_mood_model_version
+Create Date: 2026-10-19
+
+detected_at used to be the wall-clock time of the ingest run, so every
+intraday or resumed run re-stored the spike it had already found that
+day.  Spikes are now stamped with the start of the observed day, like
+country_mood.date, and unique per (country_code, detected_at, detector);
+existing rows are truncated to the day and the earliest of each key kept.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013_spike_day_unique'
+down_revision: Union[str, None] = '012_mood_model_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE mood_spike SET detected_at = date_trunc('day', detected_at)")
+    op.execute("""
+        DELETE FROM mood_spike a
+        USING mood_spike b
+        WHERE a.country_code = b.country_code
+          AND a.detected_at = b.detected_at
+          AND a.detector = b.detector
+          AND a.id > b.id
+    """)
+    op.create_unique_constraint(
+        'uq_spike_country_day_detector', 'mood_spike', ['country_code', 'detected_at', 'detector']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_spike_country_day_detector', 'mood_spike', type_='unique')
@@ -0,0 +1,35 @@
+"""Keep the pre-day statistics on mood_spike_state
+
+Revision ID: 014_spike_state_prior
+Revises: 013_spike_day_unique
+Create Date: 2026-10-19
+
+The streaming detector is now fed the observation time instead of the day,
+so a second ingest run on the same day revises that day's score: it is
+checked against, and folded into, the statistics from before the day.
+Existing states have no such snapshot yet; their next same-day revision is
+skipped, as before, and the following day starts keeping one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014_spike_state_prior'
+down_revision: Union[str, None] = '013_spike_day_unique'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('mood_spike_state', sa.Column('prior_count', sa.Integer(), nullable=True))
+    op.add_column('mood_spike_state', sa.Column('prior_mean', sa.Float(), nullable=True))
+    op.add_column('mood_spike_state', sa.Column('prior_variance', sa.Float(), nullable=True))
+    op.add_column('mood_spike_state', sa.Column('prior_label', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    for column in ('prior_label', 'prior_variance', 'prior_mean', 'prior_count'):
+        op.drop_column('mood_spike_state', column)
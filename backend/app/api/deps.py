@@ -5,7 +5,10 @@ from __future__ import annotations
 import logging
 from typing import AsyncGenerator, Optional
 
+from fastapi import Request
+
 from app.config import get_settings
+from app.db.instrumentation import query_tag
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -44,17 +47,27 @@ async def get_redis():
 _db_failed = False
 
 
-async def get_db():
-    """Get database session with graceful fallback."""
+async def get_db(request: Request):
+    """Get database session with graceful fallback.
+
+    Also tags the request's SQL with its route template for the timing
+    metrics (``/mood/country/{country_code}``, not the raw path).
+    """
     global _db_failed
     if _db_failed:
         yield None
         return
     try:
-        from app.db.session import async_session_factory
-        async with async_session_factory() as session:
-            yield session
+        from app.db.session import get_session_factory
+        session_factory = get_session_factory()
     except Exception as e:
         logger.warning(f"Database unavailable: {e} – running in live-only mode")
         _db_failed = True
         yield None
+        return
+    route = request.scope.get("route")
+    query_tag.set(getattr(route, "path", request.url.path))
+    # Exceptions raised by the route (e.g. HTTPException) are re-thrown into
+    # this generator; they must propagate, not be swallowed as a DB failure.
+    async with session_factory() as session:
+        yield session
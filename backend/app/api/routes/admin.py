@@ -0,0 +1,90 @@
+"""POST /admin/recompute – re-score stored mood history from its raw features
+(dry run by default; see ``app.services.recompute_service``).
+
+Only mounted when ADMIN_API_TOKEN is set; callers send it as a bearer token."""
+
+from __future__ import annotations
+
+import logging
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.api.deps import get_db, get_redis
+from app.config import get_settings
+from app.core.mood_engine import MoodParams
+from app.core.mood_model import RuleModel
+from app.models.schemas import LabelTransition, RecomputeRequest, RecomputeResponse
+from app.services.recompute_service import RecomputeService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def require_admin_token(authorization: Optional[str] = Header(None)) -> None:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.strip().encode(), settings.ADMIN_API_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or missing admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)]
+)
+
+
+@router.post("/recompute", response_model=RecomputeResponse)
+async def recompute_moods(
+    request: RecomputeRequest,
+    cache=Depends(get_redis),
+    db=Depends(get_db),
+):
+    try:
+        params = MoodParams.from_dict(request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if request.start and request.end and request.start > request.end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    if db is None:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    report = await RecomputeService(db, cache).run(
+        params,
+        write=not request.dry_run,
+        countries=request.countries,
+        start=request.start,
+        end=request.end,
+        model=RuleModel() if request.rules else None,
+    )
+    logger.info(
+        "Recompute (%s, %s): %d of %d rows changed in %.2fs",
+        report.model_version,
+        "dry run" if request.dry_run else "written",
+        report.changed,
+        report.rows,
+        report.seconds,
+    )
+    return RecomputeResponse(
+        model_version=report.model_version,
+        dry_run=not report.written,
+        rows=report.rows,
+        changed=report.changed,
+        score_changes=report.score_changes,
+        label_changes=report.label_changes,
+        mean_abs_delta=report.mean_abs_delta,
+        max_abs_delta=report.max_abs_delta,
+        transitions=[
+            LabelTransition(previous_label=old, new_label=new, rows=count)
+            for (old, new), count in report.transitions.most_common()
+        ],
+        countries=report.countries,
+        first=report.first,
+        last=report.last,
+        seconds=round(report.seconds, 3),
+    )
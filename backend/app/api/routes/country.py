@@ -1,93 +1,170 @@
-"""GET /mood/country/{country_code} – detail + 7-day trend for one country."""
+"""GET /mood/country/{country_code} – detail + 7-day trend for one country.
+GET /mood/country/{country_code}/history?range=1y – long-range downsampled history.
+GET /mood/countries?codes=US,GB,… – the same detail for many countries at once."""
 
 from __future__ import annotations
 
 import logging
+import re
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.api.deps import get_db
-from app.models.schemas import CountryDetailResponse
+from app.api.deps import get_db, get_redis
+from app.config import get_settings
+from app.models.schemas import CountryBatchResponse, CountryDetailResponse, CountryHistoryResponse
+from app.services import mood_cache
 from app.services.trends_service import TrendsService
 from app.services.lastfm_service import LastFmService, SUPPORTED_COUNTRIES
 from app.services.news_service import NewsService
-from app.core.mood_engine import compute_mood
+from app.services.model_registry import predict_mood
+from app.services.summary_worker import fallback_summary, summary_worker
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/mood", tags=["mood"])
 
+settings = get_settings()
+
+MAX_BATCH_COUNTRIES = 100
+
+# Bucket width in days, finest first
+RESOLUTION_DAYS = {"day": 1, "week": 7, "month": 30}
+RANGE_UNIT_DAYS = {"d": 1, "w": 7, "m": 30, "y": 365}
+_RANGE_RE = re.compile(r"^(\d+)([dwmy])$")
+
+
+def parse_range(value: str) -> int:
+    """``30d`` / ``12w`` / ``6m`` / ``1y`` → number of days."""
+    match = _RANGE_RE.match(value.strip().lower())
+    if not match:
+        raise ValueError("range must look like 30d, 12w, 6m or 1y")
+    days = int(match.group(1)) * RANGE_UNIT_DAYS[match.group(2)]
+    if not 1 <= days <= settings.HISTORY_MAX_RANGE_DAYS:
+        raise ValueError(f"range must be between 1 and {settings.HISTORY_MAX_RANGE_DAYS} days")
+    return days
+
+
+def choose_resolution(days: int, requested: Optional[str] = None) -> str:
+    """Coarsest resolution that still satisfies the request.
+
+    An explicit *requested* resolution is honoured as-is; otherwise pick the
+    widest bucket that still yields ``HISTORY_MIN_POINTS`` points, falling
+    back to daily rows for short ranges.
+    """
+    if requested:
+        return requested
+    for resolution in reversed(RESOLUTION_DAYS):
+        if days // RESOLUTION_DAYS[resolution] >= settings.HISTORY_MIN_POINTS:
+            return resolution
+    return "day"
+
+
+def _with_summary(detail: CountryDetailResponse) -> CountryDetailResponse:
+    """Never block on Gemini: serve a deterministic summary and let the
+    background worker persist the AI text for next time."""
+    if detail.news_summary:
+        return detail
+    return detail.model_copy(update={
+        "news_summary": fallback_summary(detail),
+        "summary_pending": summary_worker.submit(detail),
+    })
+
+
+@router.get("/countries", response_model=CountryBatchResponse)
+async def get_countries_mood(
+    codes: str = Query(..., description="Comma-separated ISO-2 codes, e.g. US,GB,DE"),
+    days: int = Query(7, ge=1, le=90),
+    cache=Depends(get_redis),
+    db=Depends(get_db),
+):
+    requested = list(dict.fromkeys(c.strip().upper() for c in codes.split(",") if c.strip()))
+    if not requested:
+        raise HTTPException(status_code=422, detail="codes must list at least one country")
+    if len(requested) > MAX_BATCH_COUNTRIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"at most {MAX_BATCH_COUNTRIES} countries per request",
+        )
+
+    # 1. Cache: one MGET for every requested country
+    found = await mood_cache.get_countries(cache, requested, days)
+
+    # 2. DB: set-based load for the misses, written back in one pipeline
+    misses = [cc for cc in requested if cc not in found]
+    if misses and db:
+        try:
+            loaded = await TrendsService(db).get_country_details(misses, days)
+            await mood_cache.set_countries(cache, list(loaded.values()), days)
+            found.update(loaded)
+        except Exception as e:
+            logger.warning("Batch country lookup failed: %s", e)
+
+    return CountryBatchResponse(
+        countries={cc: _with_summary(found[cc]) for cc in requested if cc in found},
+        missing=[cc for cc in requested if cc not in found],
+    )
+
+
+@router.get("/country/{country_code}/history", response_model=CountryHistoryResponse)
+async def get_country_history(
+    country_code: str,
+    range_: str = Query("1y", alias="range", description="Lookback such as 30d, 12w, 6m or 1y"),
+    resolution: Optional[str] = Query(None, pattern="^(day|week|month)$"),
+    db=Depends(get_db),
+):
+    try:
+        days = parse_range(range_)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not db:
+        raise HTTPException(status_code=503, detail="History requires the database")
+
+    chosen = choose_resolution(days, resolution)
+    try:
+        points = await TrendsService(db).get_country_history(country_code, days, chosen)
+    except Exception as e:
+        logger.warning("History lookup failed for %s: %s", country_code, e)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return CountryHistoryResponse(
+        country_code=country_code.upper(),
+        range=range_,
+        resolution=chosen,
+        points=points,
+    )
+
 
 @router.get("/country/{country_code}", response_model=CountryDetailResponse)
 async def get_country_mood(
     country_code: str,
+    days: int = Query(mood_cache.DEFAULT_TREND_DAYS, ge=1, le=90),
+    cache=Depends(get_redis),
     db=Depends(get_db),
 ):
     cc = country_code.upper()
 
-    # Try DB first
+    # 1. Try cache
+    cached = await mood_cache.get_countries(cache, [cc], days)
+    if cc in cached:
+        return _with_summary(cached[cc])
+
+    # 2. Try DB
     if db:
         try:
             svc = TrendsService(db)
-            latest = await svc.get_latest_country(cc)
-            if latest:
-                trend = await svc.get_country_trend(cc)
-                spike = await svc.has_active_spike(cc)
-
-                # Parse news_headlines from JSON string
-                import json
-                headlines = None
-                if latest.news_headlines:
-                    try:
-                        headlines = json.loads(latest.news_headlines)
-                    except:
-                        pass
-
-                # Always generate a live AI summary for country detail
-                summary = latest.news_summary
-                news = NewsService()
-                if not headlines:
-                    headlines_live = await news.fetch_headlines(cc)
-                    headlines = headlines_live[:5] if headlines_live else None
-                if not summary:
-                    summary = await news.generate_mood_summary(
-                        country_code=cc,
-                        country_name=latest.country_name,
-                        mood_label=latest.mood_label,
-                        valence=latest.valence or 0.5,
-                        energy=latest.energy or 0.5,
-                        top_track=latest.top_track,
-                        top_genre=latest.top_genre,
-                        headlines=headlines,
-                    )
-
-                return CountryDetailResponse(
-                    country_code=latest.country_code,
-                    country_name=latest.country_name,
-                    mood_score=latest.mood_score,
-                    mood_label=latest.mood_label,
-                    color_code=latest.color_code,
-                    valence=latest.valence,
-                    energy=latest.energy,
-                    danceability=latest.danceability,
-                    acousticness=latest.acousticness,
-                    top_genre=latest.top_genre,
-                    top_track=latest.top_track,
-                    news_sentiment=latest.news_sentiment,
-                    news_headlines=headlines,
-                    news_summary=summary,
-                    trend=trend,
-                    spike_active=spike,
-                )
+            detail = await svc.get_country_detail(cc, days)
+            if detail:
+                await mood_cache.set_countries(cache, [detail], days)
+                return _with_summary(detail)
         except Exception:
             pass
 
-    # Fallback: compute live from Last.fm + Gemini news
+    # 3. Fallback: compute live from Last.fm + Gemini news
     lastfm = LastFmService()
     news = NewsService()
     feat = await lastfm.fetch_country_features(cc)
     sentiment = await news.fetch_sentiment(cc)
     headlines = await news.fetch_headlines(cc)
-    mood = compute_mood(
+    mood = predict_mood(
         valence=feat["valence"],
         energy=feat["energy"],
         danceability=feat.get("danceability", 0.5),
@@ -108,7 +185,7 @@ async def get_country_mood(
         headlines=headlines[:5] if headlines else None,
     )
 
-    return CountryDetailResponse(
+    detail = CountryDetailResponse(
         country_code=cc,
         country_name=country_name,
         mood_score=mood.mood_score,
@@ -126,3 +203,5 @@ async def get_country_mood(
         trend=[],
         spike_active=False,
     )
+    await mood_cache.set_countries(cache, [detail], days)
+    return detail
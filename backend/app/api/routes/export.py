@@ -0,0 +1,92 @@
+"""GET /export/{table}?format=parquet&start=…&end=…&countries=US,GB – streamed
+Parquet / Arrow IPC export of ``country_mood`` or ``mood_spike`` history.
+
+Only mounted when EXPORT_API_TOKEN is set; callers send it as a bearer token."""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.db.instrumentation import tagged
+from app.services.export_service import (
+    EXPORT_TABLES,
+    FORMATS,
+    MEDIA_TYPES,
+    Compression,
+    ExportRequest,
+    ExportService,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def require_export_token(authorization: Optional[str] = Header(None)) -> None:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.strip().encode(), settings.EXPORT_API_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or missing export token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    prefix="/export", tags=["export"], dependencies=[Depends(require_export_token)]
+)
+
+
+@router.get("/{table}")
+async def export_history(
+    table: str,
+    format: str = Query("parquet", description=" | ".join(FORMATS)),
+    start: Optional[dt.date] = Query(None, description="First day (inclusive)"),
+    end: Optional[dt.date] = Query(None, description="Last day (inclusive)"),
+    countries: Optional[str] = Query(None, description="Comma-separated ISO codes"),
+    compression: Optional[str] = Query(
+        None, description="Codec, optionally with per-column overrides: zstd,reason=gzip"
+    ),
+):
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export table: {table}")
+    try:
+        request = ExportRequest(
+            table=table,
+            format=format,
+            start=start,
+            end=end,
+            countries=tuple(c.strip() for c in (countries or "").split(",") if c.strip()),
+            **({"compression": Compression.parse(compression)} if compression else {}),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        from app.db.session import get_session_factory
+        session_factory = get_session_factory()
+    except Exception as e:
+        logger.warning(f"Database unavailable for export: {e}")
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    # The session must live as long as the response body, so it is opened
+    # here rather than through the get_db dependency.
+    async def body():
+        with tagged("/export/{table}"):
+            async with session_factory() as db:
+                async for chunk in ExportService(db).iter_bytes(request):
+                    yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[request.format],
+        headers={"Content-Disposition": f'attachment; filename="{request.filename}"'},
+    )
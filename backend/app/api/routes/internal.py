@@ -0,0 +1,20 @@
+"""GET /internal/metrics/sql – SQL timing histograms per route / ingest stage.
+
+Only mounted when SQL_METRICS_ENABLED is set; keep /internal off the public
+ingress."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.db.instrumentation import metrics
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/metrics/sql")
+async def sql_metrics(reset: bool = False):
+    snapshot = metrics.snapshot()
+    if reset:
+        metrics.reset()
+    return snapshot
@@ -15,14 +15,15 @@ from app.models.schemas import GlobalMoodResponse, CountryMoodResponse
 from app.services.trends_service import TrendsService
 from app.services.lastfm_service import LastFmService, SUPPORTED_COUNTRIES
 from app.services.news_service import NewsService
-from app.core.mood_engine import compute_mood
-from app.db.session import async_session_factory
+from app.services.model_registry import get_mood_model, predict_mood
+from app.services.event_bus import publish_events, EVENT_COUNTRY_MOOD
+from app.services.mood_cache import GLOBAL_CACHE_KEY, write_through
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/mood", tags=["mood"])
 settings = get_settings()
 
-CACHE_KEY = "mood:global:latest"
+CACHE_KEY = GLOBAL_CACHE_KEY
 
 
 async def _process_country(
@@ -31,7 +32,7 @@ async def _process_country(
     """Process a single country: news sentiment + mood computation."""
     sentiment = await news.fetch_sentiment(cc)
     headlines = await news.fetch_headlines(cc)
-    mood = compute_mood(
+    mood = predict_mood(
         valence=feat["valence"],
         energy=feat["energy"],
         danceability=feat.get("danceability", 0.5),
@@ -125,10 +126,8 @@ async def get_global_mood(
     if db:
         try:
             svc = TrendsService(db)
-            for country in countries:
-                headlines_json = json.dumps(country.news_headlines) if country.news_headlines else None
-
-                await svc.upsert_mood({
+            await svc.upsert_moods([
+                {
                     "country_code": country.country_code,
                     "country_name": country.country_name,
                     "date": country.date,
@@ -142,10 +141,17 @@ async def get_global_mood(
                     "top_genre": country.top_genre,
                     "top_track": country.top_track,
                     "news_sentiment": country.news_sentiment,
-                    "news_headlines": headlines_json,
-                    "news_summary": country.news_summary if hasattr(country, 'news_summary') else None,
-                })
+                    "news_headlines": country.news_headlines,
+                    "news_summary": country.news_summary,
+                    "model_version": get_mood_model().version,
+                }
+                for country in countries
+            ])
             logger.info("Saved %d mood records to database", len(countries))
+            await write_through(cache, svc, [c.country_code for c in countries])
+            await publish_events(cache, [
+                (EVENT_COUNTRY_MOOD, c.model_dump(mode="json")) for c in countries
+            ])
         except Exception as e:
             logger.error("Failed to save mood to DB: %s", e)
 
@@ -0,0 +1,40 @@
+"""GET /mood/stream – Server-Sent Events push of mood updates and spikes."""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.services.event_bus import broadcaster
+
+router = APIRouter(prefix="/mood", tags=["mood"])
+
+KEEPALIVE_SECONDS = 15
+
+
+@router.get("/stream")
+async def stream_mood_events(request: Request):
+    """Stream ``country_mood`` and ``mood_spike`` events as they are written."""
+    queue = await broadcaster.subscribe()
+
+    async def event_source():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                    yield frame
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
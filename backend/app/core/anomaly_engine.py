@@ -0,0 +1,293 @@
+"""
+AnomalyEngine – vectorized spike detectors over a dense country × day
+mood_score matrix.
+
+All countries are scored together.  Each country's observed days are
+packed left (missing days are skipped, not imputed), the linear recurrences
+run through ``scipy.signal.lfilter`` along the day axis and only CUSUM
+steps through it in Python, vectorized across countries – so scoring every
+country's full history takes milliseconds.
+
+Every detector compares a day against the running baseline of the days
+before it – the mean / variance that ``spike_detector.update_rolling``
+keeps, weighted ``max(alpha, 1 / count)``:
+
+* ``ewma``    – EWMA control chart: the smoothed score leaves
+                ``mean ± limit · σ · sqrt(λ / (2 − λ))``.
+* ``cusum``   – two-sided tabular CUSUM of the standardized residuals
+                (slack ``k``, decision interval ``h``); resets after firing.
+* ``iforest`` – sklearn IsolationForest over (score, residual z, day-over-day
+                change); needs scikit-learn.  Fitted on a random subsample
+                of at most ``iforest_fit_samples`` positions and only the
+                reported positions are scored.  Unlike the others it is not
+                milliseconds: ~0.3 s for one day of 60 countries, ~1.5 s to
+                report 60 countries × 10 years (100 trees; both scale with
+                ``iforest_estimators``).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+from scipy.signal import lfilter
+
+from app.core.spike_detector import SPIKE_MIN_HISTORY, SPIKE_STREAM_ALPHA
+
+ENGINE_DETECTORS = ("ewma", "cusum", "iforest")
+
+_EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+
+
+@dataclass
+class EngineParams:
+    alpha: float = SPIKE_STREAM_ALPHA  # baseline weight
+    min_history: int = SPIKE_MIN_HISTORY
+    ewma_lambda: float = 0.3
+    ewma_limit: float = 3.0
+    cusum_k: float = 0.5
+    cusum_h: float = 4.0
+    contamination: float = 0.01  # IsolationForest
+    iforest_fit_samples: int = 8192  # fit subsample, bounds the fit's cost
+    iforest_estimators: int = 100
+
+    @classmethod
+    def from_settings(cls, settings) -> "EngineParams":
+        return cls(
+            alpha=settings.SPIKE_STREAM_ALPHA,
+            ewma_lambda=settings.SPIKE_EWMA_LAMBDA,
+            ewma_limit=settings.SPIKE_EWMA_LIMIT,
+            cusum_k=settings.SPIKE_CUSUM_K,
+            cusum_h=settings.SPIKE_CUSUM_H,
+            contamination=settings.SPIKE_IFOREST_CONTAMINATION,
+            iforest_fit_samples=settings.SPIKE_IFOREST_FIT_SAMPLES,
+            iforest_estimators=settings.SPIKE_IFOREST_ESTIMATORS,
+        )
+
+
+@dataclass
+class ScoreMatrix:
+    codes: list[str]
+    days: np.ndarray    # datetime64[D], ascending
+    scores: np.ndarray  # (countries, days), NaN where there is no row
+    labels: np.ndarray  # (countries, days) object, None where there is no row
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping]) -> "ScoreMatrix":
+        """Build from ``{country_code, date, mood_score, mood_label}`` rows;
+        the last row wins for a country and day."""
+        rows = list(rows)
+        if not rows:
+            return cls([], np.array([], dtype="datetime64[D]"), np.empty((0, 0)), np.empty((0, 0), dtype=object))
+        codes = sorted({r["country_code"] for r in rows})
+        index = {cc: i for i, cc in enumerate(codes)}
+        ci = np.fromiter((index[r["country_code"]] for r in rows), np.intp, len(rows))
+        # Proleptic ordinals are much cheaper to get than datetime64 casts
+        day = np.fromiter((r["date"].toordinal() for r in rows), np.int64, len(rows))
+        first = int(day.min())
+        days = np.arange(first, int(day.max()) + 1) - _EPOCH_ORDINAL
+        di = day - first
+
+        scores = np.full((len(codes), len(days)), np.nan)
+        labels = np.full((len(codes), len(days)), None, dtype=object)
+        scores[ci, di] = np.fromiter((r["mood_score"] for r in rows), float, len(rows))
+        labels[ci, di] = [r["mood_label"] for r in rows]
+        return cls(codes, days.astype("datetime64[D]"), scores, labels)
+
+
+@dataclass
+class Anomaly:
+    country_code: str
+    day: dt.datetime
+    detector: str
+    statistic: float
+    delta: float  # score − baseline mean
+    previous_label: str
+    new_label: str
+
+    @property
+    def reason(self) -> str:
+        return {
+            "ewma": "EWMA chart {:.2f}σ outside control limit",
+            "cusum": "CUSUM {:.2f} exceeds decision interval",
+            "iforest": "IsolationForest anomaly score {:.2f}",
+        }[self.detector].format(self.statistic)
+
+
+def _ewma(values: np.ndarray, weight: float, initial: np.ndarray) -> np.ndarray:
+    """``y[j] = weight · values[j] + (1 − weight) · y[j − 1]`` along axis 1,
+    starting from ``y[−1] = initial``."""
+    zi = ((1.0 - weight) * initial)[:, None]
+    return lfilter([weight], [1.0, weight - 1.0], values, axis=1, zi=zi)[0]
+
+
+def pack(scores: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Left-align each row's present values.
+
+    Returns ``(values, cols, valid)``: ``values[i, j]`` is row *i*'s *j*-th
+    present score, found in column ``cols[i, j]``; past a row's last score
+    ``valid`` is False (and ``values`` is 0).
+    """
+    present = ~np.isnan(scores)
+    cols = np.argsort(~present, axis=1, kind="stable")
+    valid = np.arange(scores.shape[1]) < present.sum(axis=1)[:, None]
+    values = np.where(valid, np.take_along_axis(scores, cols, axis=1), 0.0)
+    return values, cols, valid
+
+
+def baseline(values: np.ndarray, alpha: float) -> tuple[np.ndarray, np.ndarray]:
+    """Mean and std of the observations before each packed position.
+
+    Weights are ``max(alpha, 1 / count)``: the first ``1 / alpha``
+    observations are folded in one step at a time, the rest – a constant
+    weight, i.e. a linear filter – through ``lfilter``.
+    """
+    n, m = values.shape
+    post_mean, post_var = np.empty((n, m)), np.empty((n, m))
+    mean, var = np.zeros(n), np.zeros(n)
+    warm = min(m, int(1.0 / alpha))
+    for j in range(warm):
+        weight = max(alpha, 1.0 / (j + 1))
+        diff = values[:, j] - mean
+        mean = mean + weight * diff
+        var = (1.0 - weight) * (var + weight * diff * diff)
+        post_mean[:, j], post_var[:, j] = mean, var
+    if m > warm:
+        rest = values[:, warm:]
+        post_mean[:, warm:] = _ewma(rest, alpha, mean)
+        diff = rest - post_mean[:, warm - 1 : -1]
+        # var[j] = (1 − a) · var[j − 1] + (1 − a) · a · diff²
+        post_var[:, warm:] = _ewma(diff * diff * (1.0 - alpha), alpha, var)
+
+    means, variances = np.zeros((n, m)), np.zeros((n, m))
+    means[:, 1:], variances[:, 1:] = post_mean[:, :-1], post_var[:, :-1]
+    return means, np.sqrt(variances)
+
+
+def ewma_chart(
+    values: np.ndarray, means: np.ndarray, stds: np.ndarray, ready: np.ndarray, lam: float, limit: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """(flags, statistic in control-limit σ units) per position."""
+    smoothed = np.empty_like(values)
+    smoothed[:, 0] = values[:, 0]
+    smoothed[:, 1:] = _ewma(values[:, 1:], lam, values[:, 0])
+    width = np.sqrt(lam / (2.0 - lam))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stat = np.where(ready, np.abs(smoothed - means) / (stds * width), 0.0)
+    return stat > limit, stat
+
+
+def cusum(
+    values: np.ndarray, means: np.ndarray, stds: np.ndarray, ready: np.ndarray, k: float, h: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """(flags, max(S⁺, S⁻)) per position.  Positions that are not ready
+    count as in control (residual 0)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        resid = np.where(ready, (values - means) / stds, 0.0)
+    # Day-major so every step reads contiguous rows
+    up, down = np.ascontiguousarray((resid - k).T), np.ascontiguousarray((-resid - k).T)
+    stat = np.empty_like(up)
+    high, low = np.zeros(values.shape[0]), np.zeros(values.shape[0])
+    for j in range(len(up)):
+        np.maximum(high + up[j], 0.0, out=high)
+        np.maximum(low + down[j], 0.0, out=low)
+        np.maximum(high, low, out=stat[j])
+        in_control = stat[j] <= h
+        high *= in_control
+        low *= in_control
+    stat = stat.T
+    return stat > h, stat
+
+
+def isolation_forest(
+    values: np.ndarray,
+    means: np.ndarray,
+    stds: np.ndarray,
+    ready: np.ndarray,
+    score: np.ndarray,
+    params: EngineParams,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(flags, anomaly score) on the *score* positions; one fit over a
+    subsample of the ready positions (fitting also scores every training
+    sample, to place the contamination threshold)."""
+    from sklearn.ensemble import IsolationForest
+
+    flags = np.zeros(values.shape, dtype=bool)
+    stat = np.zeros(values.shape)
+    if ready.sum() < 2 or not score.any():
+        return flags, stat
+    change = np.zeros(values.shape)
+    change[:, 1:] = np.diff(values, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (values - means) / stds
+    features = np.column_stack([values[ready], z[ready], change[ready]])
+    if len(features) > params.iforest_fit_samples:
+        rng = np.random.default_rng(0)
+        features = features[rng.choice(len(features), params.iforest_fit_samples, replace=False)]
+
+    model = IsolationForest(
+        n_estimators=params.iforest_estimators,
+        contamination=params.contamination,
+        random_state=0,
+    ).fit(features)
+    samples = model.score_samples(np.column_stack([values[score], z[score], change[score]]))
+    flags[score] = samples < model.offset_  # == predict() == -1
+    stat[score] = -samples
+    return flags, stat
+
+
+def detect(
+    matrix: ScoreMatrix,
+    detectors: Iterable[str],
+    params: Optional[EngineParams] = None,
+    since: Optional[dt.date] = None,
+) -> list[Anomaly]:
+    """Run *detectors* over *matrix*; report anomalies on days >= *since*."""
+    params = params or EngineParams()
+    detectors = list(detectors)
+    unknown = set(detectors) - set(ENGINE_DETECTORS)
+    if unknown:
+        raise ValueError(f"Unknown anomaly detectors: {sorted(unknown)}")
+    if not matrix.scores.size:
+        return []
+
+    values, cols, valid = pack(matrix.scores)
+    means, stds = baseline(values, params.alpha)
+    # Position j has j earlier observations
+    ready = valid & (np.arange(values.shape[1]) >= max(1, params.min_history)) & (stds > 0)
+    report = ready
+    if since is not None:
+        report = ready & (matrix.days[cols] >= np.datetime64(since, "D"))
+
+    anomalies: list[Anomaly] = []
+    for name in detectors:
+        if name == "ewma":
+            flags, stat = ewma_chart(values, means, stds, ready, params.ewma_lambda, params.ewma_limit)
+        elif name == "cusum":
+            flags, stat = cusum(values, means, stds, ready, params.cusum_k, params.cusum_h)
+        else:
+            flags, stat = isolation_forest(values, means, stds, ready, report, params)
+        rows, pos = np.nonzero(flags & report)
+        day_cols = cols[rows, pos]
+        anomalies.extend(
+            Anomaly(
+                country_code=matrix.codes[i],
+                day=day,
+                detector=name,
+                statistic=round(statistic, 4),
+                delta=round(delta, 4),
+                previous_label=matrix.labels[i, prev],
+                new_label=matrix.labels[i, col],
+            )
+            for i, col, prev, day, statistic, delta in zip(
+                rows.tolist(),
+                day_cols.tolist(),
+                cols[rows, pos - 1].tolist(),
+                matrix.days[day_cols].astype("datetime64[us]").tolist(),
+                stat[rows, pos].tolist(),
+                (values - means)[rows, pos].tolist(),
+            )
+        )
+    return anomalies
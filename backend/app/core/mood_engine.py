@@ -4,12 +4,22 @@ based on aggregated audio features and optional news sentiment.
 
 The algorithm is intentionally rule-based so it works without a trained model,
 but is structured so you can drop in an sklearn classifier later.
+
+``compute_moods`` is the same algorithm over NumPy column arrays, for
+scoring many rows at once; its results match ``compute_mood`` exactly.
+
+The weights and thresholds are the defaults of ``MoodParams``; tune them
+there (or pass another set) and re-score stored history with
+``scripts/recompute_moods.py``.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import hashlib
+import json
+from dataclasses import asdict, dataclass, fields, replace
+from functools import cached_property
+from typing import Any, Mapping, Optional, Union
 
 import numpy as np
 
@@ -25,12 +35,72 @@ MOOD_MAP: dict[str, dict] = {
 }
 
 
+# Label indices used by the array API: MOOD_LABELS[i] ↔ MOOD_COLORS[i]
+MOOD_LABELS: tuple[str, ...] = tuple(MOOD_MAP)
+MOOD_COLORS = np.array([MOOD_MAP[k]["color"] for k in MOOD_LABELS])
+_HAPPY, _CALM, _SAD, _ANGRY, _ANXIOUS = (MOOD_LABELS.index(k) for k in ("Happy", "Calm", "Sad", "Angry", "Anxious"))
+
+ArrayLike = Union[np.ndarray, list, float]
+
+
+@dataclass(frozen=True)
+class MoodParams:
+    """Weights of the score formula and thresholds of the label ladder."""
+
+    # Score: weighted sum of the features remapped to -1…1
+    valence_weight: float = 0.40
+    energy_weight: float = 0.20
+    danceability_weight: float = 0.15
+    acousticness_weight: float = 0.10  # subtracted
+    news_weight: float = 0.50  # share of news sentiment when there is one
+    energy_flip_valence: float = 0.45  # below this valence, energy counts negative
+
+    # Label by score
+    happy_min: float = 0.20
+    calm_min: float = 0.05
+    sad_max: float = -0.05
+    angry_max: float = -0.35
+    anxious_energy: float = 0.55  # negative zone: Anxious above, Sad below
+
+    # Near-zero zone tie-breakers
+    news_negative: float = -0.15
+    news_positive: float = 0.15
+    news_anxious_energy: float = 0.5
+    news_happy_valence: float = 0.5
+    neutral_anxious_energy: float = 0.6
+    neutral_sad_valence: float = 0.4
+
+    @classmethod
+    def from_dict(cls, values: Mapping[str, Any]) -> "MoodParams":
+        """Defaults overridden by *values*; unknown names raise ValueError."""
+        names = {f.name for f in fields(cls)}
+        unknown = set(values) - names
+        if unknown:
+            raise ValueError(f"Unknown mood parameters: {sorted(unknown)}")
+        try:
+            return replace(cls(), **{k: float(v) for k, v in values.items()})
+        except (TypeError, ValueError):
+            raise ValueError(f"Mood parameters must be numbers: {dict(values)}") from None
+
+    @cached_property
+    def version(self) -> str:
+        """``"rules"`` for the defaults, else ``"rules-<digest>"``."""
+        if self == DEFAULT_PARAMS:
+            return "rules"
+        digest = hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()
+        return f"rules-{digest[:8]}"
+
+
+DEFAULT_PARAMS = MoodParams()
+
+
 @dataclass
 class MoodResult:
     mood_score: float      # -1.0 … 1.0
     mood_label: str        # Happy | Calm | Sad | Angry | Anxious
     color_code: str        # hex
     emoji: str
+    model_version: str = "rules"  # what chose the label (app.core.mood_model)
 
 
 def compute_mood(
@@ -39,67 +109,72 @@ def compute_mood(
     danceability: float = 0.5,
     acousticness: float = 0.5,
     news_sentiment: Optional[float] = None,
+    params: MoodParams = DEFAULT_PARAMS,
 ) -> MoodResult:
     """Return a ``MoodResult`` from audio features (0-1 scale) and optional
     news sentiment (-1 … 1).
 
-    Scoring formula (weights sum to 1.0):
+    Scoring formula (default weights sum to 1.0):
         base = 0.40 * valence
              + 0.20 * energy_component
              + 0.15 * danceability
              - 0.10 * acousticness
         If news_sentiment is provided it contributes 0.50 weight (50/50 blend).
     """
+    p = params
 
     # Energy is bimodal: high energy + low valence → anger, otherwise positive
-    energy_component = energy if valence >= 0.45 else -energy
+    energy_component = energy if valence >= p.energy_flip_valence else -energy
 
     base = (
-        0.40 * (valence * 2 - 1)           # remap 0-1 → -1…1
-        + 0.20 * (energy_component * 2 - 1)
-        + 0.15 * (danceability * 2 - 1)
-        - 0.10 * (acousticness * 2 - 1)
+        p.valence_weight * (valence * 2 - 1)           # remap 0-1 → -1…1
+        + p.energy_weight * (energy_component * 2 - 1)
+        + p.danceability_weight * (danceability * 2 - 1)
+        - p.acousticness_weight * (acousticness * 2 - 1)
     )
 
     if news_sentiment is not None:
-        base = base * 0.50 + news_sentiment * 0.50
+        base = base * (1 - p.news_weight) + news_sentiment * p.news_weight
 
     mood_score = float(np.clip(base, -1.0, 1.0))
 
-    label, color, emoji = _classify(mood_score, energy, valence, news_sentiment)
+    label, color, emoji = _classify(mood_score, energy, valence, news_sentiment, p)
 
     return MoodResult(
         mood_score=round(mood_score, 4),
         mood_label=label,
         color_code=color,
         emoji=emoji,
+        model_version=p.version,
     )
 
 
 def _classify(
     score: float, energy: float, valence: float,
     news_sentiment: Optional[float] = None,
+    params: MoodParams = DEFAULT_PARAMS,
 ) -> tuple[str, str, str]:
     """Map score to a mood label. Uses news sentiment + energy for better variety."""
+    p = params
 
-    if score >= 0.20:
+    if score >= p.happy_min:
         key = "Happy"
-    elif score <= -0.35:
+    elif score <= p.angry_max:
         key = "Angry"
-    elif score <= -0.05:
+    elif score <= p.sad_max:
         # Negative zone: Sad vs Anxious based on energy
-        key = "Anxious" if energy > 0.55 else "Sad"
-    elif score >= 0.05:
+        key = "Anxious" if energy > p.anxious_energy else "Sad"
+    elif score >= p.calm_min:
         key = "Calm"
     else:
         # Near-zero zone (-0.05 to 0.05): use news + energy to break ties
-        if news_sentiment is not None and news_sentiment < -0.15:
-            key = "Anxious" if energy > 0.5 else "Sad"
-        elif news_sentiment is not None and news_sentiment > 0.15:
-            key = "Happy" if valence > 0.5 else "Calm"
-        elif energy > 0.6:
+        if news_sentiment is not None and news_sentiment < p.news_negative:
+            key = "Anxious" if energy > p.news_anxious_energy else "Sad"
+        elif news_sentiment is not None and news_sentiment > p.news_positive:
+            key = "Happy" if valence > p.news_happy_valence else "Calm"
+        elif energy > p.neutral_anxious_energy:
             key = "Anxious"
-        elif valence < 0.4:
+        elif valence < p.neutral_sad_valence:
             key = "Sad"
         else:
             key = "Calm"
@@ -108,16 +183,138 @@ def _classify(
     return key, meta["color"], meta["emoji"]
 
 
+@dataclass
+class MoodBatch:
+    """Parallel arrays for a batch of rows."""
+
+    mood_score: np.ndarray   # float64, rounded to 4 places
+    label_index: np.ndarray  # int8 into MOOD_LABELS
+    model_version: str = "rules"
+
+    def __len__(self) -> int:
+        return len(self.mood_score)
+
+    @property
+    def mood_label(self) -> np.ndarray:
+        return np.array(MOOD_LABELS)[self.label_index]
+
+    @property
+    def color_code(self) -> np.ndarray:
+        return MOOD_COLORS[self.label_index]
+
+    def results(self) -> list[MoodResult]:
+        meta = [(label, MOOD_MAP[label]) for label in MOOD_LABELS]
+        return [
+            MoodResult(
+                mood_score=score,
+                mood_label=meta[i][0],
+                color_code=meta[i][1]["color"],
+                emoji=meta[i][1]["emoji"],
+                model_version=self.model_version,
+            )
+            for score, i in zip(self.mood_score.tolist(), self.label_index.tolist())
+        ]
+
+
+def compute_moods(
+    valence: ArrayLike,
+    energy: ArrayLike,
+    danceability: ArrayLike = 0.5,
+    acousticness: ArrayLike = 0.5,
+    news_sentiment: Optional[ArrayLike] = None,
+    params: MoodParams = DEFAULT_PARAMS,
+) -> MoodBatch:
+    """``compute_mood`` over column arrays (scalars broadcast); NaN
+    ``news_sentiment`` means none for that row."""
+    p = params
+    valence = np.atleast_1d(np.asarray(valence, dtype=float))
+    energy = np.atleast_1d(np.asarray(energy, dtype=float))
+    danceability = np.asarray(danceability, dtype=float)
+    acousticness = np.asarray(acousticness, dtype=float)
+    n = np.broadcast(valence, energy, danceability, acousticness).shape
+    news = np.full(n, np.nan) if news_sentiment is None else np.asarray(news_sentiment, dtype=float)
+
+    # Same operations in the same order as compute_mood, so bit-identical
+    energy_component = np.where(valence >= p.energy_flip_valence, energy, -energy)
+    base = (
+        p.valence_weight * (valence * 2 - 1)
+        + p.energy_weight * (energy_component * 2 - 1)
+        + p.danceability_weight * (danceability * 2 - 1)
+        - p.acousticness_weight * (acousticness * 2 - 1)
+    )
+    has_news = ~np.isnan(news)
+    base = np.where(has_news, base * (1 - p.news_weight) + news * p.news_weight, base)
+    score = np.clip(base, -1.0, 1.0)
+
+    return MoodBatch(
+        mood_score=_round4(score),
+        label_index=_classify_array(score, energy, valence, news, p),
+        model_version=p.version,
+    )
+
+
+def _classify_array(
+    score: np.ndarray,
+    energy: np.ndarray,
+    valence: np.ndarray,
+    news: np.ndarray,
+    params: MoodParams = DEFAULT_PARAMS,
+) -> np.ndarray:
+    """``_classify`` as one ``np.select``; NaN *news* never compares true."""
+    p = params
+    energy, valence = np.broadcast_to(energy, score.shape), np.broadcast_to(valence, score.shape)
+    labels = np.select(
+        [
+            score >= p.happy_min,
+            score <= p.angry_max,
+            score <= p.sad_max,
+            score >= p.calm_min,
+            # Near-zero zone (-0.05 to 0.05)
+            news < p.news_negative,
+            news > p.news_positive,
+            energy > p.neutral_anxious_energy,
+            valence < p.neutral_sad_valence,
+        ],
+        [
+            _HAPPY,
+            _ANGRY,
+            np.where(energy > p.anxious_energy, _ANXIOUS, _SAD),
+            _CALM,
+            np.where(energy > p.news_anxious_energy, _ANXIOUS, _SAD),
+            np.where(valence > p.news_happy_valence, _HAPPY, _CALM),
+            _ANXIOUS,
+            _SAD,
+        ],
+        default=_CALM,
+    )
+    return labels.astype(np.int8)
+
+
+def _round4(values: np.ndarray) -> np.ndarray:
+    """``round(x, 4)`` elementwise.
+
+    ``np.round`` scales by 10⁴ first and can land on the other side of a
+    half-way point than Python's correctly rounded ``round``; the few
+    values that close to one are redone with ``round``.
+    """
+    rounded = np.round(values, 4)
+    scaled = values * 1e4
+    close = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(close):
+        rounded.flat[i] = round(float(values.flat[i]), 4)
+    return rounded
+
+
 def batch_compute(rows: list[dict]) -> list[MoodResult]:
-    """Vectorised convenience wrapper.  Each dict must contain at least
-    ``valence`` and ``energy`` keys."""
-    return [
-        compute_mood(
-            valence=r["valence"],
-            energy=r["energy"],
-            danceability=r.get("danceability", 0.5),
-            acousticness=r.get("acousticness", 0.5),
-            news_sentiment=r.get("news_sentiment"),
-        )
-        for r in rows
-    ]
+    """``compute_mood`` for many rows (via ``compute_moods``).  Each dict
+    must contain at least ``valence`` and ``energy`` keys."""
+    if not rows:
+        return []
+    news = [r.get("news_sentiment") for r in rows]
+    return compute_moods(
+        valence=[r["valence"] for r in rows],
+        energy=[r["energy"] for r in rows],
+        danceability=[r.get("danceability", 0.5) for r in rows],
+        acousticness=[r.get("acousticness", 0.5) for r in rows],
+        news_sentiment=[np.nan if v is None else v for v in news],
+    ).results()
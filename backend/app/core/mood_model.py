@@ -0,0 +1,110 @@
+"""
+MoodModel – pluggable classifiers for the mood label.
+
+The mood_score is always the ``compute_mood`` formula; what can be swapped
+is the step that turns features into a label (and so a color).
+``RuleModel`` is ``_classify`` itself; ``TrainedModel`` wraps any
+scikit-learn classifier over ``FEATURES`` whose classes are mood labels.
+
+Trained models are stored as joblib artifacts – a dict with the fitted
+``model``, its ``version``, the ``features`` it was trained on and any
+metadata – named ``<version>.joblib``.  ``news_sentiment`` is NaN when a
+row has none, so the estimator must accept NaN (e.g. a
+HistGradientBoostingClassifier, or a pipeline with an imputer).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+
+from app.core.mood_engine import MOOD_LABELS, compute_moods
+
+FEATURES = ("valence", "energy", "danceability", "acousticness", "news_sentiment")
+RULES_VERSION = "rules"
+
+
+def feature_matrix(
+    valence, energy, danceability=0.5, acousticness=0.5, news_sentiment=None
+) -> np.ndarray:
+    """``(rows, FEATURES)`` float matrix; scalars broadcast, missing news is NaN."""
+    columns = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(valence, dtype=float)),
+        np.asarray(energy, dtype=float),
+        np.asarray(danceability, dtype=float),
+        np.asarray(acousticness, dtype=float),
+        np.asarray(np.nan if news_sentiment is None else news_sentiment, dtype=float),
+    )
+    return np.column_stack(columns)
+
+
+class RuleModel:
+    """The rule engine behind the model interface."""
+
+    version = RULES_VERSION
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Label indices into ``MOOD_LABELS``."""
+        return compute_moods(*X.T).label_index
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return np.eye(len(MOOD_LABELS))[self.predict(X)]
+
+
+class TrainedModel:
+    """A fitted scikit-learn classifier loaded from a joblib artifact."""
+
+    def __init__(self, artifact: dict[str, Any]) -> None:
+        self.model = artifact["model"]
+        self.version = str(artifact["version"])
+        self.metadata = {k: v for k, v in artifact.items() if k != "model"}
+        if tuple(artifact.get("features", FEATURES)) != FEATURES:
+            raise ValueError(f"Model {self.version} was trained on {artifact['features']}, expected {FEATURES}")
+        unknown = set(self.model.classes_) - set(MOOD_LABELS)
+        if unknown:
+            raise ValueError(f"Model {self.version} predicts unknown labels: {sorted(unknown)}")
+        # Position of each of the model's classes in MOOD_LABELS
+        self._label_index = np.array([MOOD_LABELS.index(c) for c in self.model.classes_], dtype=np.int8)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        predicted = self.model.predict(X)
+        return self._label_index[np.searchsorted(self.model.classes_, predicted)]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """``(rows, len(MOOD_LABELS))``; labels the model never saw get 0."""
+        proba = np.zeros((len(X), len(MOOD_LABELS)))
+        proba[:, self._label_index] = self.model.predict_proba(X)
+        return proba
+
+
+MoodModel = Union[RuleModel, TrainedModel]
+
+
+def artifact_path(directory: Union[str, Path], version: str) -> Path:
+    return Path(directory) / f"{version}.joblib"
+
+
+def load_model(directory: Union[str, Path], version: str) -> TrainedModel:
+    import joblib
+
+    return TrainedModel(joblib.load(artifact_path(directory, version)))
+
+
+def save_model(model: Any, directory: Union[str, Path], version: str, **metadata: Any) -> Path:
+    import joblib
+
+    path = artifact_path(directory, version)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    artifact = {
+        "model": model,
+        "version": version,
+        "features": FEATURES,
+        "trained_at": dt.datetime.utcnow().isoformat(timespec="seconds"),
+        **metadata,
+    }
+    TrainedModel(artifact)  # validate before writing
+    joblib.dump(artifact, path)
+    return path
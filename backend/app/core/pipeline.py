@@ -0,0 +1,138 @@
+"""
+Pipeline – runs items through a chain of async stages connected by bounded
+queues.
+
+Every stage has its own worker count (its concurrency limit) and inbound
+queue size.  A full queue blocks the upstream workers, so a slow stage
+throttles the ones before it instead of letting work pile up in memory,
+and total run time approaches that of the slowest stage rather than the
+sum of all of them.
+
+A stage handler returns the item to pass on, or ``None`` to drop it.  With
+``batch_size > 1`` the handler receives (and returns) a list of up to that
+many items, taken from whatever is already queued.  An exception fails
+only the item being handled; it is logged and counted.  A batch that
+raises is retried one item at a time, so one bad item does not take the
+rest of its batch down with it – batch handlers must therefore be safe to
+re-run on items they may have partly handled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0  # summed over workers
+
+
+@dataclass
+class Stage:
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    queue_size: int = 10
+    batch_size: int = 1
+    stats: StageStats = field(default_factory=StageStats)
+
+
+async def _worker(stage: Stage, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]) -> None:
+    while True:
+        item = await inbox.get()
+        if item is _DONE:
+            return
+        batch = [item]
+        while len(batch) < stage.batch_size and not inbox.empty():
+            extra = inbox.get_nowait()
+            if extra is _DONE:
+                # Keep the shutdown marker for a sibling (or for our next loop)
+                inbox.put_nowait(_DONE)
+                break
+            batch.append(extra)
+
+        started = time.perf_counter()
+        try:
+            results, failed = await _handle(stage, batch)
+        finally:
+            stage.stats.busy_seconds += time.perf_counter() - started
+
+        stage.stats.failed += failed
+        stage.stats.processed += len(batch) - failed
+        stage.stats.dropped += len(batch) - failed - len(results)
+        if outbox is not None:
+            for out in results:
+                await outbox.put(out)
+
+
+async def _handle(stage: Stage, batch: list) -> tuple[list, int]:
+    """What *stage* emits for *batch*, and how many of its items failed."""
+    try:
+        result = await stage.handler(batch if stage.batch_size > 1 else batch[0])
+    except Exception:
+        if len(batch) == 1:
+            logger.exception("Pipeline stage %s failed on 1 item", stage.name)
+            return [], 1
+        logger.exception(
+            "Pipeline stage %s failed on %d items; retrying them one at a time", stage.name, len(batch)
+        )
+        results, failed = [], 0
+        for item in batch:
+            out, n = await _handle(stage, [item])
+            results.extend(out)
+            failed += n
+        return results, failed
+    if stage.batch_size > 1:
+        return list(result or []), 0
+    return ([] if result is None else [result]), 0
+
+
+async def run_pipeline(items: Iterable[Any], stages: list[Stage]) -> list[Any]:
+    """Feed *items* through *stages* in order; returns what the last stage emits."""
+    queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in stages]
+    sink: asyncio.Queue = asyncio.Queue()
+    outboxes = queues[1:] + [sink]
+
+    workers = [
+        [asyncio.create_task(_worker(stage, queues[i], outboxes[i])) for _ in range(stage.concurrency)]
+        for i, stage in enumerate(stages)
+    ]
+
+    started = time.perf_counter()
+    try:
+        for item in items:
+            await queues[0].put(item)
+        for i, stage in enumerate(stages):
+            for _ in range(stage.concurrency):
+                await queues[i].put(_DONE)
+            await asyncio.gather(*workers[i])
+    except BaseException:
+        for tasks in workers:
+            for task in tasks:
+                task.cancel()
+        raise
+
+    elapsed = time.perf_counter() - started
+    for stage in stages:
+        s = stage.stats
+        logger.info(
+            "stage %-10s workers=%-2d items=%-4d dropped=%-3d failed=%-3d busy=%.1fs",
+            stage.name, stage.concurrency, s.processed, s.dropped, s.failed, s.busy_seconds,
+        )
+    logger.info("Pipeline finished in %.1fs", elapsed)
+
+    results = []
+    while not sink.empty():
+        results.append(sink.get_nowait())
+    return results
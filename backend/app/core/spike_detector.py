@@ -2,10 +2,16 @@
 SpikeDetector – identifies sudden mood shifts for a country by comparing the
 latest mood_score against a rolling window.  Uses a simple z-score approach
 that can later be replaced with an sklearn IsolationForest or similar.
+
+``update_rolling`` is the streaming variant: the same z-score rule against a
+per-country running mean / variance that each new score updates in O(1),
+so no history has to be re-read.
 """
 
 from __future__ import annotations
 
+import datetime as dt
+import math
 from dataclasses import dataclass
 from typing import Optional
 
@@ -13,6 +19,14 @@ import numpy as np
 
 
 SPIKE_Z_THRESHOLD = 2.0  # standard-deviations from rolling mean
+SPIKE_WINDOW = 7  # past scores compared against
+SPIKE_MIN_HISTORY = 3
+SPIKE_STREAM_ALPHA = 0.25  # EWMA weight; 2 / (SPIKE_WINDOW + 1)
+
+# SPIKE_DETECTOR values (comma-separated): rolling-window z-score over
+# stored history, the streaming detector over persisted per-country state,
+# and the app.core.anomaly_engine detectors
+SPIKE_DETECTORS = ("zscore", "streaming", "ewma", "cusum", "iforest")
 
 
 @dataclass
@@ -22,6 +36,7 @@ class SpikeEvent:
     new_label: str
     delta: float
     reason: str
+    detector: str = "zscore"
 
 
 def detect_spike(
@@ -30,7 +45,7 @@ def detect_spike(
     history_labels: list[str],
     current_score: float,
     current_label: str,
-    window: int = 7,
+    window: int = SPIKE_WINDOW,
 ) -> Optional[SpikeEvent]:
     """Compare *current_score* against the last *window* scores.
 
@@ -38,7 +53,7 @@ def detect_spike(
     otherwise ``None``.
     """
 
-    if len(history_scores) < 3:
+    if len(history_scores) < SPIKE_MIN_HISTORY:
         return None  # not enough data
 
     recent = np.array(history_scores[-window:])
@@ -63,33 +78,160 @@ def detect_spike(
     return None
 
 
+@dataclass
+class RollingState:
+    """Running mean / variance of one country's mood_score."""
+
+    country_code: str
+    count: int = 0
+    mean: float = 0.0
+    variance: float = 0.0
+    last_label: Optional[str] = None
+    observed_at: Optional[dt.datetime] = None
+    # The statistics before the day of observed_at was folded in, so a
+    # later revision of that day can replace its score instead of adding
+    # to it (None: not known, e.g. state written before it was kept)
+    prior_count: Optional[int] = None
+    prior_mean: Optional[float] = None
+    prior_variance: Optional[float] = None
+    prior_label: Optional[str] = None
+
+
+def update_rolling(
+    state: RollingState,
+    score: float,
+    label: str,
+    observed_at: Optional[dt.datetime] = None,
+    alpha: float = SPIKE_STREAM_ALPHA,
+) -> Optional[SpikeEvent]:
+    """Check *score* against *state*, then fold it into *state* in place.
+
+    Each observation is weighted ``max(alpha, 1 / count)``: the first
+    ``1 / alpha`` scores give the exact (Welford) mean and population
+    variance, later ones an exponentially weighted mean and variance.
+
+    A day counts once: a newer observation on the same calendar day as
+    ``state.observed_at`` is a revision of that day's score – it is checked
+    against, and folded into, the statistics from before the day, replacing
+    the earlier value.  Observations not newer than ``state.observed_at``
+    are ignored.
+    """
+    if observed_at is not None and state.observed_at is not None:
+        if observed_at <= state.observed_at:
+            return None
+        if observed_at.date() == state.observed_at.date():
+            if state.prior_count is None:
+                return None
+            state.count, state.mean, state.variance, state.last_label = (
+                state.prior_count, state.prior_mean, state.prior_variance, state.prior_label
+            )
+
+    event = None
+    diff = score - state.mean
+    std = math.sqrt(state.variance)
+    if state.count >= SPIKE_MIN_HISTORY and std > 0:
+        z = abs(diff) / std
+        if z >= SPIKE_Z_THRESHOLD and label != state.last_label:
+            event = SpikeEvent(
+                country_code=state.country_code,
+                previous_label=state.last_label,
+                new_label=label,
+                delta=round(diff, 4),
+                reason=f"EWMA z-score {z:.2f} exceeds threshold {SPIKE_Z_THRESHOLD}",
+                detector="streaming",
+            )
+
+    state.prior_count, state.prior_mean, state.prior_variance, state.prior_label = (
+        state.count, state.mean, state.variance, state.last_label
+    )
+    state.count += 1
+    weight = max(alpha, 1.0 / state.count)
+    state.mean += weight * diff
+    state.variance = (1.0 - weight) * (state.variance + weight * diff * diff)
+    state.last_label = label
+    if observed_at is not None:
+        state.observed_at = observed_at
+    return event
+
+
+def score_matrix(histories: list[list[float]], window: int = SPIKE_WINDOW) -> np.ndarray:
+    """Right-align the last *window* scores of each history into a
+    ``(countries, window)`` matrix, padding the missing days with NaN."""
+    matrix = np.full((len(histories), window), np.nan)
+    for i, scores in enumerate(histories):
+        recent = scores[-window:]
+        if recent:
+            matrix[i, window - len(recent):] = recent
+    return matrix
+
+
+def zscores_matrix(matrix: np.ndarray, current: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """z-score and delta of each row's *current* score against the row.
+
+    Computed as ``detect_spike`` does (population std, sequential sums over
+    the present days), so results match it exactly.  Rows with fewer than
+    ``SPIKE_MIN_HISTORY`` days or no spread get a z-score of 0.
+    """
+    present = ~np.isnan(matrix)
+    counts = present.sum(axis=1)
+    filled = np.where(present, matrix, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=1) / counts
+        dev = np.where(present, matrix - mean[:, None], 0.0)
+        std = np.sqrt((dev * dev).sum(axis=1) / counts)
+        delta = current - mean
+        z = np.abs(delta) / std
+    z[(counts < SPIKE_MIN_HISTORY) | ~(std > 0)] = 0.0
+    return z, delta
+
+
 def detect_spikes_batch(
     country_histories: dict[str, list[dict]],
     current_moods: dict[str, dict],
+    window: int = SPIKE_WINDOW,
 ) -> list[SpikeEvent]:
-    """Run spike detection across all countries.
+    """Run spike detection across all countries at once.
+
+    Same rule and results as calling ``detect_spike`` per country, computed
+    over a countries × days matrix.
 
     Parameters
     ----------
     country_histories:
-        ``{country_code: [{date, mood_score, mood_label}, ...]}``
+        ``{country_code: [{date, mood_score, mood_label}, ...]}``, oldest first
     current_moods:
         ``{country_code: {mood_score, mood_label}}``
     """
+    codes = [cc for cc in current_moods if country_histories.get(cc)]
+    if not codes:
+        return []
+    histories = [country_histories[cc] for cc in codes]
+    matrix = score_matrix([[h["mood_score"] for h in hist] for hist in histories], window)
+    current = np.array([current_moods[cc]["mood_score"] for cc in codes], dtype=float)
+    z, delta = zscores_matrix(matrix, current)
+
     events: list[SpikeEvent] = []
-    for cc, current in current_moods.items():
-        hist = country_histories.get(cc, [])
-        if not hist:
+    for i in np.flatnonzero(z >= SPIKE_Z_THRESHOLD):
+        cc, previous_label = codes[i], histories[i][-1]["mood_label"]
+        new_label = current_moods[cc]["mood_label"]
+        if new_label == previous_label:
             continue
-        scores = [h["mood_score"] for h in hist]
-        labels = [h["mood_label"] for h in hist]
-        evt = detect_spike(
-            country_code=cc,
-            history_scores=scores,
-            history_labels=labels,
-            current_score=current["mood_score"],
-            current_label=current["mood_label"],
+        events.append(
+            SpikeEvent(
+                country_code=cc,
+                previous_label=previous_label,
+                new_label=new_label,
+                delta=round(float(delta[i]), 4),
+                reason=f"z-score {z[i]:.2f} exceeds threshold {SPIKE_Z_THRESHOLD}",
+            )
         )
-        if evt:
-            events.append(evt)
     return events
+
+
+def parse_detectors(value: str) -> list[str]:
+    """``"zscore,ewma"`` → ``["zscore", "ewma"]``, validated."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(SPIKE_DETECTORS))
+    if not names or unknown:
+        raise ValueError(f"SPIKE_DETECTOR must be a comma-separated subset of {SPIKE_DETECTORS}")
+    return names
@@ -0,0 +1,103 @@
+"""
+Dialect hooks that let ``TrendsService`` run on PostgreSQL or on an embedded
+SQLite file (``DATABASE_URL=sqlite+aiosqlite:///./worldmood.db``).
+
+PostgreSQL stays the production backend; SQLite (WAL mode) lets small
+deployments and CI persist and serve history with no database server.
+Only the handful of constructs that differ are routed through here:
+upserts, day/period truncation, and the ``country_mood`` primary key
+(which includes the partition key on PostgreSQL).
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+from sqlalchemy import Date, DateTime, Integer, PrimaryKeyConstraint, Table, cast, event, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+
+POSTGRESQL = "postgresql"
+SQLITE = "sqlite"
+
+# SQLAlchemy's own SQLite DATETIME storage format; truncated periods must
+# match it exactly so text comparisons and the rollup primary key line up.
+_SQLITE_DATETIME = "%Y-%m-%d 00:00:00.000000"
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def name_of(bind: Union[AsyncSession, AsyncConnection, AsyncEngine, None]) -> str:
+    engine = getattr(bind, "bind", bind)
+    dialect = getattr(engine, "dialect", None)
+    return dialect.name if dialect is not None else POSTGRESQL
+
+
+def insert(dialect: str, table):
+    """``INSERT`` supporting ``on_conflict_do_update`` for *dialect*."""
+    if dialect == SQLITE:
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def day(dialect: str, column):
+    """Calendar date of a timestamp column."""
+    if dialect == SQLITE:
+        return func.date(column, type_=Date)
+    return cast(column, Date)
+
+
+def truncate(dialect: str, column, resolution: str):
+    """Start of the ISO week / month containing *column* (``date_trunc``)."""
+    if dialect != SQLITE:
+        return func.date_trunc(resolution, column, type_=DateTime)
+    if resolution == "week":
+        # %w: 0 = Sunday … 6 = Saturday; step back to Monday.
+        back = func.printf(
+            "-%d days", (cast(func.strftime("%w", column), Integer) + 6) % 7
+        )
+        return func.strftime(_SQLITE_DATETIME, column, back, type_=DateTime)
+    if resolution == "month":
+        return func.strftime(_SQLITE_DATETIME, column, "start of month", type_=DateTime)
+    return func.strftime(_SQLITE_DATETIME, column, type_=DateTime)
+
+
+def configure_sqlite(engine: AsyncEngine) -> None:
+    """WAL journaling and sane concurrency settings on every new connection."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+# country_mood's PostgreSQL key is (id, date) because date is the partition
+# key.  SQLite only auto-assigns a lone INTEGER key, so there the key is just
+# ``id`` (a rowid alias); uq_country_date still keeps one row per country/day.
+
+def _is_partitioned_key(table: Table) -> bool:
+    return table.name == "country_mood" and "id" in table.c
+
+
+@compiles(CreateColumn, SQLITE)
+def _sqlite_column(element: CreateColumn, compiler, **kw) -> str:
+    column = element.element
+    if column.name == "id" and column.table is not None and _is_partitioned_key(column.table):
+        return f"{compiler.preparer.format_column(column)} INTEGER NOT NULL"
+    return compiler.visit_create_column(element, **kw)
+
+
+@compiles(PrimaryKeyConstraint, SQLITE)
+def _sqlite_primary_key(constraint: PrimaryKeyConstraint, compiler, **kw) -> str:
+    if _is_partitioned_key(constraint.table):
+        return "PRIMARY KEY (id)"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
@@ -0,0 +1,234 @@
+"""
+SQL timing instrumentation.
+
+When ``SQL_METRICS_ENABLED`` is set, engine event hooks record per-statement
+latency and rows returned, and a timed pool records how long each
+connection checkout waited.  Every sample is tagged with the current
+``query_tag`` (the API route template or an ingest stage) and aggregated
+into fixed-bucket histograms served by ``/internal/metrics/sql``.
+Statements slower than ``SQL_SLOW_QUERY_MS`` are logged.
+
+When disabled nothing is registered: no listeners, the stock pool class.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+UNTAGGED = "untagged"
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+MAX_STATEMENTS_PER_TAG = 50
+
+query_tag: ContextVar[str] = ContextVar("query_tag", default=UNTAGGED)
+
+_PARAM_LIST_RE = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*|%\(\w+\)s|\?(?:\s*,\s*\?)*")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def enabled() -> bool:
+    return settings.SQL_METRICS_ENABLED
+
+
+@contextmanager
+def tagged(tag: str) -> Iterator[None]:
+    """Attribute every statement run inside the block to *tag*."""
+    token = query_tag.set(tag)
+    try:
+        yield
+    finally:
+        query_tag.reset(token)
+
+
+def fingerprint(statement: str) -> str:
+    """Collapse whitespace and bind placeholders (including expanded IN
+    lists) so one logical query maps to one key."""
+    return _SPACE_RE.sub(" ", _PARAM_LIST_RE.sub("?", statement)).strip()[:200]
+
+
+class Histogram:
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last = overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the *q* quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.max, 3),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                **{f"le_{b}": n for b, n in zip(self.buckets, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class SqlMetrics:
+    """Histograms keyed by tag, plus per-statement latency within each tag."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency: dict[str, Histogram] = {}
+            self.rows: dict[str, Histogram] = {}
+            self.checkout_wait: dict[str, Histogram] = {}
+            self.statements: dict[str, dict[str, Histogram]] = {}
+            self.slow = 0
+
+    def record_query(
+        self, tag: str, statement: str, elapsed_ms: float, rows: int, slow: bool = False
+    ) -> None:
+        with self._lock:
+            self.slow += slow
+            self.latency.setdefault(tag, Histogram(LATENCY_BUCKETS_MS)).observe(elapsed_ms)
+            if rows >= 0:
+                self.rows.setdefault(tag, Histogram(ROW_BUCKETS)).observe(rows)
+            per_tag = self.statements.setdefault(tag, {})
+            key = fingerprint(statement)
+            if key in per_tag or len(per_tag) < MAX_STATEMENTS_PER_TAG:
+                per_tag.setdefault(key, Histogram(LATENCY_BUCKETS_MS)).observe(elapsed_ms)
+
+    def record_checkout(self, tag: str, waited_ms: float) -> None:
+        with self._lock:
+            self.checkout_wait.setdefault(tag, Histogram(LATENCY_BUCKETS_MS)).observe(waited_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            tags = sorted(set(self.latency) | set(self.checkout_wait))
+            return {
+                "slow_queries": self.slow,
+                "slow_query_ms": settings.SQL_SLOW_QUERY_MS,
+                "tags": {
+                    tag: {
+                        "query_ms": self.latency[tag].snapshot() if tag in self.latency else None,
+                        "rows": self.rows[tag].snapshot() if tag in self.rows else None,
+                        "checkout_wait_ms": (
+                            self.checkout_wait[tag].snapshot() if tag in self.checkout_wait else None
+                        ),
+                        "statements": sorted(
+                            (
+                                {"statement": sql, **{k: v for k, v in h.snapshot().items() if k != "buckets"}}
+                                for sql, h in self.statements.get(tag, {}).items()
+                            ),
+                            key=lambda s: s["sum"],
+                            reverse=True,
+                        ),
+                    }
+                    for tag in tags
+                },
+            }
+
+
+metrics = SqlMetrics()
+
+
+class _TimedCheckout:
+    """Pool mixin timing how long ``connect()`` waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.record_checkout(query_tag.get(), (time.perf_counter() - start) * 1000)
+
+
+class TimedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    # Log under SQLAlchemy's pool logger, like the stock class does.
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.NullPool"
+
+
+def timed_pool_class(poolclass: Optional[type]) -> type:
+    return TimedNullPool if poolclass is NullPool else TimedQueuePool
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    tag = query_tag.get()
+    threshold = settings.SQL_SLOW_QUERY_MS
+    slow = bool(threshold) and elapsed_ms >= threshold
+    metrics.record_query(tag, statement, elapsed_ms, getattr(cursor, "rowcount", -1), slow)
+    if slow:
+        logger.warning(
+            "Slow query (%.1f ms, tag=%s): %s", elapsed_ms, tag, fingerprint(statement)
+        )
+
+
+def log_summary() -> None:
+    """Log one line per tag; for processes without a metrics endpoint."""
+    if not enabled():
+        return
+    for tag, data in metrics.snapshot()["tags"].items():
+        q = data["query_ms"] or {}
+        w = data["checkout_wait_ms"] or {}
+        logger.info(
+            "SQL %-28s queries=%-5s total=%.1fms p95≤%sms checkout_p95≤%sms",
+            tag, q.get("count", 0), q.get("sum", 0.0), q.get("p95"), w.get("p95"),
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the timing hooks to *engine* (no-op when disabled)."""
+    if not enabled():
+        return
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
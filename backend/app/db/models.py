@@ -3,15 +3,18 @@ from __future__ import annotations
 import datetime as dt
 
 from sqlalchemy import (
+    JSON,
     Column,
     DateTime,
     Float,
+    ForeignKey,
     Integer,
     String,
     Text,
     UniqueConstraint,
     func,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -19,18 +22,10 @@ class Base(DeclarativeBase):
     pass
 
 
-class CountryMood(Base):
-    """Aggregated mood snapshot per country per day."""
+class MoodSnapshotColumns:
+    """Columns shared by the history table and the latest-per-country table."""
 
-    __tablename__ = "country_mood"
-    __table_args__ = (
-        UniqueConstraint("country_code", "date", name="uq_country_date"),
-    )
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    country_code = Column(String(3), nullable=False, index=True)
     country_name = Column(String(120), nullable=False)
-    date = Column(DateTime, nullable=False, default=dt.datetime.utcnow)
 
     # Mood metrics
     mood_score = Column(Float, nullable=False)  # -1.0 … 1.0
@@ -47,16 +42,94 @@ class CountryMood(Base):
     top_genre = Column(String(60), nullable=True)
     top_track = Column(String(200), nullable=True)
     news_sentiment = Column(Float, nullable=True)
-    news_headlines = Column(Text, nullable=True)  # JSON array of headlines
-    news_summary = Column(Text, nullable=True)    # AI-generated summary
+
+    # Classifier that chose mood_label: "rules" or a trained model's version
+    model_version = Column(String(40), nullable=False, default="rules", server_default="rules")
+
+
+class CountryMood(MoodSnapshotColumns, Base):
+    """Aggregated mood snapshot per country per day.
+
+    Range-partitioned by month on ``date`` (see ``app.db.partitions``); the
+    partition key is therefore part of the primary key, and the
+    ``uq_country_date`` index doubles as the per-country lookup index.
+    """
+
+    __tablename__ = "country_mood"
+    __table_args__ = (
+        UniqueConstraint("country_code", "date", name="uq_country_date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    country_code = Column(String(3), nullable=False)
+    date = Column(DateTime, primary_key=True, default=dt.datetime.utcnow)
 
     created_at = Column(DateTime, server_default=func.now())
 
 
+class CountryMoodLatest(MoodSnapshotColumns, Base):
+    """Most recent ``country_mood`` row per country, maintained on write.
+
+    Lets /mood/global read ~60 rows instead of a DISTINCT ON over all history.
+    """
+
+    __tablename__ = "country_mood_latest"
+
+    country_code = Column(String(3), primary_key=True)
+    date = Column(DateTime, nullable=False)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class CountryNews(Base):
+    """News text behind a country's daily mood, kept out of ``country_mood``
+    so list and trend queries never read it.  ``day`` matches
+    ``country_mood.date``."""
+
+    __tablename__ = "country_news"
+
+    country_code = Column(String(3), primary_key=True)
+    day = Column(DateTime, primary_key=True)
+
+    headlines = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # list of strings
+    summary = Column(Text, nullable=True)     # AI-generated summary
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class CountryMoodRollup(Base):
+    """Weekly / monthly downsampled ``country_mood`` history, maintained by ingest."""
+
+    __tablename__ = "country_mood_rollup"
+
+    country_code = Column(String(3), primary_key=True)
+    resolution = Column(String(5), primary_key=True)  # week | month
+    period_start = Column(DateTime, primary_key=True)
+
+    sample_count = Column(Integer, nullable=False)
+    mood_score_mean = Column(Float, nullable=False)
+    mood_score_min = Column(Float, nullable=False)
+    mood_score_max = Column(Float, nullable=False)
+    dominant_label = Column(String(20), nullable=False)
+
+    # Audio feature means
+    valence = Column(Float, nullable=True)
+    energy = Column(Float, nullable=True)
+    danceability = Column(Float, nullable=True)
+    acousticness = Column(Float, nullable=True)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
 class MoodSpike(Base):
     """Detected mood anomalies / spikes per country."""
 
     __tablename__ = "mood_spike"
+    # One spike per country, day (start of the observed day) and detector
+    __table_args__ = (
+        UniqueConstraint("country_code", "detected_at", "detector", name="uq_spike_country_day_detector"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     country_code = Column(String(3), nullable=False, index=True)
@@ -65,3 +138,61 @@ class MoodSpike(Base):
     new_label = Column(String(20), nullable=False)
     delta = Column(Float, nullable=False)
     reason = Column(Text, nullable=True)
+    detector = Column(String(12), nullable=False, default="zscore", server_default="zscore")  # which rule fired
+
+
+class MoodSpikeState(Base):
+    """Per-country running statistics for the streaming spike detector
+    (``app.core.spike_detector.update_rolling``)."""
+
+    __tablename__ = "mood_spike_state"
+
+    country_code = Column(String(3), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+    variance = Column(Float, nullable=False, default=0.0)
+    last_label = Column(String(20), nullable=True)
+    observed_at = Column(DateTime, nullable=True)  # newest score folded in
+    # Statistics before observed_at's day, for same-day revisions
+    prior_count = Column(Integer, nullable=True)
+    prior_mean = Column(Float, nullable=True)
+    prior_variance = Column(Float, nullable=True)
+    prior_label = Column(String(20), nullable=True)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class IngestRun(Base):
+    """One execution of the daily ingest; ``--resume`` continues the latest
+    unfinished run instead of starting over."""
+
+    __tablename__ = "ingest_run"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    status = Column(String(12), nullable=False, default="running")  # running | completed | failed
+    started_at = Column(DateTime, nullable=False, default=dt.datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class IngestItem(Base):
+    """Per-country checkpoint of an ingest run: the last stage that finished
+    plus the artifacts needed to skip it on resume."""
+
+    __tablename__ = "ingest_item"
+
+    run_id = Column(Integer, ForeignKey("ingest_run.id", ondelete="CASCADE"), primary_key=True)
+    country_code = Column(String(3), primary_key=True)
+    stage = Column(String(12), nullable=False)  # music | news | analyze | summarize | persist | spikes
+
+    # sha256 of the top-track list + headline set; an unchanged fingerprint
+    # lets the next run carry this item's results forward.
+    fingerprint = Column(String(64), nullable=True)
+
+    # Artifacts
+    tracks = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # [{name, artist}]
+    features = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    headlines = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    sentiment = Column(Float, nullable=True)
+    summary = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
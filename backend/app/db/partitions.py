@@ -0,0 +1,139 @@
+"""
+Monthly range partitions for ``country_mood``.
+
+Each calendar month lives in its own partition named ``country_mood_YYYY_MM``
+so trend queries prune to the one or two relevant months and retention is a
+``DETACH`` + ``DROP`` (or move to the ``archive`` schema) instead of a
+row-by-row ``DELETE``.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PARENT_TABLE = "country_mood"
+ARCHIVE_SCHEMA = "archive"
+_PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value: dt.date) -> dt.date:
+    return dt.date(value.year, value.month, 1)
+
+
+def add_months(month: dt.date, n: int) -> dt.date:
+    index = month.year * 12 + (month.month - 1) + n
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: dt.date) -> str:
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+def _is_partitioned(conn: AsyncConnection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+async def list_partitions(conn: AsyncConnection) -> dict[str, dt.date]:
+    """Map of attached partition name → first day of the month it holds."""
+    result = await conn.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = :parent
+    """), {"parent": PARENT_TABLE})
+    partitions: dict[str, dt.date] = {}
+    for (name,) in result:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions[name] = dt.date(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    months_ahead: Optional[int] = None,
+    since: Optional[dt.date] = None,
+) -> list[str]:
+    """Create any missing monthly partitions from *since* (default: this
+    month) through *months_ahead* months into the future.
+
+    Returns the names of the partitions that were created.
+    """
+    if not _is_partitioned(conn):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.MOOD_PARTITION_PREMAKE_MONTHS
+
+    existing = await list_partitions(conn)
+    current = month_start(dt.datetime.utcnow().date())
+    month = month_start(since) if since else current
+    last = add_months(current, months_ahead)
+
+    created: list[str] = []
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            await conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+
+    if created:
+        logger.info("Created country_mood partitions: %s", ", ".join(created))
+    return created
+
+
+async def apply_retention(
+    conn: AsyncConnection,
+    keep_months: Optional[int] = None,
+    mode: Optional[str] = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Detach partitions entirely older than *keep_months* months and either
+    drop them or move them to the ``archive`` schema.
+
+    ``keep_months`` of 0 disables retention.  Returns the affected partitions.
+    """
+    if not _is_partitioned(conn):
+        return []
+    keep_months = settings.MOOD_RETENTION_MONTHS if keep_months is None else keep_months
+    mode = (mode or settings.MOOD_RETENTION_MODE).lower()
+    if keep_months <= 0:
+        return []
+    if mode not in ("drop", "archive"):
+        raise ValueError(f"Unknown retention mode: {mode!r} (expected 'drop' or 'archive')")
+
+    cutoff = add_months(month_start(dt.datetime.utcnow().date()), -keep_months)
+    expired = sorted(
+        name for name, month in (await list_partitions(conn)).items() if month < cutoff
+    )
+    if dry_run or not expired:
+        return expired
+
+    if mode == "archive":
+        await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    for name in expired:
+        await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if mode == "drop":
+            await conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            # Detached partitions still default id from the parent's sequence;
+            # drop that dependency so the parent stays droppable.
+            await conn.execute(text(f"ALTER TABLE {name} ALTER COLUMN id DROP DEFAULT"))
+            await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+    logger.info("Retention (%s) applied to: %s", mode, ", ".join(expired))
+    return expired
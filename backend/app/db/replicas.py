@@ -0,0 +1,109 @@
+"""
+Read replica pool with lag-aware health checks.
+
+A background task probes every replica each
+``REPLICA_HEALTH_INTERVAL_SECONDS`` and marks it usable only while its
+replay lag stays under ``REPLICA_MAX_LAG_SECONDS``.  Replicas that have not
+passed a check yet (or whose monitor is not running, e.g. in scripts) are
+never chosen, so reads fall back to the primary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    from app.db.session import EngineProfile
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Zero when the replica has replayed everything it received, otherwise the
+# age of the last replayed transaction.  A primary (not in recovery) is 0.
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def parse_replica_urls(value: str) -> list[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+class ReplicaSet:
+    def __init__(self, engines: list[AsyncEngine], max_lag: float, interval: float) -> None:
+        self.engines = engines
+        self.max_lag = max_lag
+        self.interval = interval
+        self.lag: dict[int, Optional[float]] = {i: None for i in range(len(engines))}
+        self._healthy: list[int] = []
+        self._down: set[int] = set()
+        self._cycle = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls, profile: "EngineProfile") -> "ReplicaSet":
+        urls = parse_replica_urls(settings.DATABASE_REPLICA_URLS)
+        return cls(
+            [create_async_engine(url, **profile.engine_kwargs(url)) for url in urls],
+            settings.REPLICA_MAX_LAG_SECONDS,
+            settings.REPLICA_HEALTH_INTERVAL_SECONDS,
+        )
+
+    def choose(self) -> Optional[Engine]:
+        """Round-robin over healthy replicas; ``None`` means use the primary."""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        index = healthy[next(self._cycle) % len(healthy)]
+        return self.engines[index].sync_engine
+
+    async def check(self) -> None:
+        """Probe every replica once and refresh the healthy set."""
+        for i, engine in enumerate(self.engines):
+            try:
+                async with engine.connect() as conn:
+                    self.lag[i] = float(await conn.scalar(LAG_QUERY))
+            except Exception as e:
+                if i not in self._down:
+                    logger.warning("Read replica %d unavailable: %s", i, e)
+                    self._down.add(i)
+                self.lag[i] = None
+                continue
+            self._down.discard(i)
+        healthy = [i for i, lag in self.lag.items() if lag is not None and lag <= self.max_lag]
+        if healthy != self._healthy:
+            logger.info("Healthy read replicas: %s of %d", len(healthy), len(self.engines))
+        self._healthy = healthy
+
+    async def _monitor(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.engines and self._task is None:
+            self._task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._healthy = []
+        for engine in self.engines:
+            await engine.dispose()
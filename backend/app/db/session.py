@@ -1,25 +1,183 @@
+"""
+Role-aware, lazily created database engines.
+
+Each process role has its own :class:`EngineProfile` from ``Settings``:
+
+* ``api``     – long-running multi-worker server, larger pool, pre-ping;
+* ``ingest``  – the daily batch job, a few connections with big statement
+  caches;
+* ``scripts`` – short-lived maintenance commands, minimal pool.
+
+Nothing connects (or even builds an engine) at import time; the first
+``get_engine(role)`` / ``get_session_factory(role)`` call does.  The legacy
+``engine`` and ``async_session_factory`` names still resolve to the ``api``
+role through the module ``__getattr__``.
+"""
+
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from dataclasses import dataclass
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import UpdateBase
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
+from app.db import dialects, instrumentation
+from app.db.replicas import ReplicaSet
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=20,
-    max_overflow=10,
-)
+ROLES = ("api", "ingest", "scripts")
+DEFAULT_ROLE = "api"
 
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+# Pass as ``bind_arguments`` on statements that may be served by a replica.
+READ_ONLY = {"read_only": True}
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    pool_size: int
+    max_overflow: int
+    pool_recycle: int  # seconds, -1 = never
+    pool_pre_ping: bool
+    statement_cache_size: int  # asyncpg prepared statements per connection
+    pgbouncer: bool  # transaction-pooling safe mode
+
+    @classmethod
+    def for_role(cls, role: str) -> "EngineProfile":
+        if role not in ROLES:
+            raise ValueError(f"Unknown database role: {role!r} (expected one of {ROLES})")
+        prefix = f"DB_{role.upper()}_"
+        return cls(
+            pool_size=getattr(settings, prefix + "POOL_SIZE"),
+            max_overflow=getattr(settings, prefix + "MAX_OVERFLOW"),
+            pool_recycle=getattr(settings, prefix + "POOL_RECYCLE"),
+            pool_pre_ping=getattr(settings, prefix + "PRE_PING"),
+            statement_cache_size=getattr(settings, prefix + "STATEMENT_CACHE_SIZE"),
+            pgbouncer=getattr(settings, prefix + "PGBOUNCER"),
+        )
+
+    def engine_kwargs(self, url: str) -> dict:
+        kwargs: dict = {"echo": settings.DB_ECHO, "pool_pre_ping": self.pool_pre_ping}
+        connect_args: dict = {}
+        if self.pgbouncer:
+            # PgBouncer already pools; server-side prepared statements must not
+            # outlive a transaction or collide across backends.
+            kwargs["poolclass"] = NullPool
+            connect_args = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            kwargs.update(
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_recycle=self.pool_recycle,
+            )
+            connect_args = {"prepared_statement_cache_size": self.statement_cache_size}
+        if make_url(url).get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = connect_args
+        if instrumentation.enabled():
+            kwargs["poolclass"] = instrumentation.timed_pool_class(kwargs.get("poolclass"))
+        return kwargs
+
+
+class RoutingSession(Session):
+    """Sends ``READ_ONLY`` statements to a healthy replica (when the
+    session's factory has a replica set), everything else to its primary.
+
+    Once the session has written anything its reads stay on the primary
+    for the rest of its life, so callers always see their own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, read_only: bool = False, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        elif read_only and not self.info.get("wrote"):
+            replica_set: Optional[ReplicaSet] = self.info.get("replicas")
+            replica = replica_set.choose() if replica_set else None
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+_engines: dict[str, AsyncEngine] = {}
+_session_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+_replicas: Optional[ReplicaSet] = None
+
+
+def get_engine(role: str = DEFAULT_ROLE) -> AsyncEngine:
+    """Primary engine for *role*, created on first use."""
+    engine = _engines.get(role)
+    if engine is None:
+        profile = EngineProfile.for_role(role)
+        engine = create_async_engine(
+            settings.DATABASE_URL, **profile.engine_kwargs(settings.DATABASE_URL)
+        )
+        if engine.dialect.name == dialects.SQLITE:
+            dialects.configure_sqlite(engine)
+        instrumentation.instrument_engine(engine)
+        _engines[role] = engine
+    return engine
+
+
+def get_replicas() -> ReplicaSet:
+    """Read replicas for API traffic (empty unless DATABASE_REPLICA_URLS is set)."""
+    global _replicas
+    if _replicas is None:
+        _replicas = ReplicaSet.from_settings(EngineProfile.for_role("api"))
+        for engine in _replicas.engines:
+            instrumentation.instrument_engine(engine)
+    return _replicas
+
+
+def get_session_factory(role: str = DEFAULT_ROLE) -> async_sessionmaker[AsyncSession]:
+    factory = _session_factories.get(role)
+    if factory is None:
+        factory = async_sessionmaker(
+            get_engine(role),
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+            # Only API sessions may read from replicas.
+            info={"replicas": get_replicas()} if role == "api" else None,
+        )
+        _session_factories[role] = factory
+    return factory
+
+
+async def dispose_engines() -> None:
+    """Close every engine created so far (including replicas)."""
+    global _replicas
+    if _replicas is not None:
+        await _replicas.stop()
+        _replicas = None
+    for engine in _engines.values():
+        await engine.dispose()
+    _engines.clear()
+    _session_factories.clear()
+
+
+def __getattr__(name: str):
+    # Backwards-compatible, still lazy: ``from app.db.session import engine``
+    if name == "engine":
+        return get_engine()
+    if name == "async_session_factory":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def get_db() -> AsyncSession:  # type: ignore[misc]
-    async with async_session_factory() as session:
+    async with get_session_factory()() as session:
         yield session
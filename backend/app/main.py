@@ -9,9 +9,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.db.session import engine
+from app.db.session import dispose_engines, get_engine, get_replicas
 from app.db.models import Base
-from app.api.routes import mood, country, spikes
+from app.db.partitions import ensure_partitions
+from app.api.routes import mood, country, spikes, stream, internal, export, admin
+from app.db import instrumentation
+from app.services.event_bus import broadcaster
+from app.services.summary_worker import summary_worker
 
 settings = get_settings()
 logging.basicConfig(level=logging.DEBUG if settings.DEBUG else logging.INFO)
@@ -22,15 +26,19 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup: try to ensure tables exist, but don't crash if DB is unavailable
     try:
-        async with engine.begin() as conn:
+        async with get_engine().begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await ensure_partitions(conn)
         logger.info("Database tables ensured.")
     except Exception as e:
         logger.warning("Database unavailable at startup: %s – running in live-only mode", e)
+    get_replicas().start()
     yield
     # Shutdown
+    await broadcaster.stop()
+    await summary_worker.stop()
     try:
-        await engine.dispose()
+        await dispose_engines()
     except Exception:
         pass
 
@@ -53,6 +61,13 @@ app.add_middleware(
 app.include_router(mood.router)
 app.include_router(country.router)
 app.include_router(spikes.router)
+app.include_router(stream.router)
+if instrumentation.enabled():
+    app.include_router(internal.router)
+if settings.EXPORT_API_TOKEN:
+    app.include_router(export.router)
+if settings.ADMIN_API_TOKEN:
+    app.include_router(admin.router)
 
 
 @app.get("/health")
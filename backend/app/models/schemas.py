@@ -52,6 +52,33 @@ class MoodTrendPoint(BaseModel):
 class CountryDetailResponse(MoodBase):
     trend: list[MoodTrendPoint] = []
     spike_active: bool = False
+    summary_pending: bool = False  # AI summary is being generated in the background
+
+
+class MoodHistoryPoint(BaseModel):
+    period_start: dt.date
+    mood_score: float  # mean over the period
+    mood_score_min: float
+    mood_score_max: float
+    mood_label: str  # dominant label over the period
+    samples: int
+
+    valence: Optional[float] = None
+    energy: Optional[float] = None
+    danceability: Optional[float] = None
+    acousticness: Optional[float] = None
+
+
+class CountryHistoryResponse(BaseModel):
+    country_code: str
+    range: str
+    resolution: str  # day | week | month
+    points: list[MoodHistoryPoint]
+
+
+class CountryBatchResponse(BaseModel):
+    countries: dict[str, CountryDetailResponse]
+    missing: list[str] = []  # requested codes with no stored mood data
 
 
 # ---------- Spikes ----------
@@ -65,6 +92,7 @@ class SpikeResponse(BaseModel):
     new_label: str
     delta: float
     reason: Optional[str] = None
+    detector: str = "zscore"
 
     class Config:
         from_attributes = True
@@ -72,3 +100,37 @@ class SpikeResponse(BaseModel):
 
 class SpikeListResponse(BaseModel):
     spikes: list[SpikeResponse]
+
+
+# ---------- Admin ----------
+
+
+class RecomputeRequest(BaseModel):
+    params: dict[str, float] = {}  # MoodParams overrides
+    countries: list[str] = []  # empty = all
+    start: Optional[dt.date] = None
+    end: Optional[dt.date] = None
+    rules: bool = False  # label with the rule engine even if a model is configured
+    dry_run: bool = True
+
+
+class LabelTransition(BaseModel):
+    previous_label: str
+    new_label: str
+    rows: int
+
+
+class RecomputeResponse(BaseModel):
+    model_version: str
+    dry_run: bool
+    rows: int
+    changed: int
+    score_changes: int
+    label_changes: int
+    mean_abs_delta: float
+    max_abs_delta: float
+    transitions: list[LabelTransition]
+    countries: list[str]
+    first: Optional[dt.datetime] = None
+    last: Optional[dt.datetime] = None
+    seconds: float
@@ -0,0 +1,355 @@
+"""
+BackfillService – bulk-loads historical (or re-scored) mood history.
+
+Raw features and headlines are read from CSV / Parquet in batches, scored
+with ``score_moods`` (the configured mood model) a batch at a time and
+streamed into temporary staging tables (``COPY`` on PostgreSQL,
+``executemany`` on SQLite).  One set-based
+upsert then merges each staging table into ``country_mood`` /
+``country_news``, the latest and rollup tables are refreshed for the loaded
+range, and spikes are re-detected over the merged history and merged into
+``mood_spike`` without duplicating ones already recorded.
+
+Everything happens in one transaction.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import itertools
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    MetaData,
+    Table,
+    desc,
+    func,
+    select,
+    true,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.spike_detector import detect_spike
+from app.db import dialects
+from app.db.models import CountryMood, CountryNews, MoodSpike
+from app.db.partitions import ensure_partitions
+from app.services.lastfm_service import SUPPORTED_COUNTRIES
+from app.services.model_registry import score_moods
+from app.services.trends_service import TrendsService
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 10_000
+
+# Same look-back the daily ingest uses (get_country_trend(days=14)).
+SPIKE_LOOKBACK_DAYS = 14
+
+REQUIRED_COLUMNS = ("country_code", "date", "valence", "energy")
+NUMERIC_COLUMNS = ("valence", "energy", "danceability", "acousticness", "news_sentiment")
+MOOD_COLUMNS = [
+    "country_code",
+    "country_name",
+    "date",
+    "mood_score",
+    "mood_label",
+    "color_code",
+    "valence",
+    "energy",
+    "danceability",
+    "acousticness",
+    "top_genre",
+    "top_track",
+    "news_sentiment",
+    "model_version",
+]
+NEWS_COLUMNS = ["country_code", "day", "headlines", "summary"]
+SPIKE_COLUMNS = ["country_code", "detected_at", "previous_label", "new_label", "delta", "reason", "detector"]
+
+# Staging tables: the target's columns plus ``seq`` (input order, so the
+# last row for a key wins, as in ``upsert_moods``).  Created as temporary
+# tables inside the load's transaction and dropped before it commits.
+_staging = MetaData()
+
+
+def _stage(name: str, source: Table, columns: list[str]) -> Table:
+    return Table(
+        name,
+        _staging,
+        *[Column(c, source.c[c].type) for c in columns],
+        Column("seq", BigInteger),
+        prefixes=["TEMPORARY"],
+    )
+
+
+MOOD_STAGE = _stage("country_mood_stage", CountryMood.__table__, MOOD_COLUMNS)
+NEWS_STAGE = _stage("country_news_stage", CountryNews.__table__, NEWS_COLUMNS)
+SPIKE_STAGE = _stage("mood_spike_stage", MoodSpike.__table__, SPIKE_COLUMNS)
+
+
+@dataclass
+class BackfillReport:
+    rows: int = 0
+    news: int = 0
+    spikes: int = 0
+    countries: list[str] = field(default_factory=list)
+    first: Optional[dt.datetime] = None
+    last: Optional[dt.datetime] = None
+    seconds: float = 0.0
+
+
+# ── Input ─────────────────────────────────────────────────────────────────────
+
+def read_frames(path: str, batch_size: int = BACKFILL_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield *path* (``.csv`` or ``.parquet``) in DataFrames of *batch_size* rows."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+    elif suffix == ".csv":
+        yield from pd.read_csv(path, chunksize=batch_size)
+    else:
+        raise ValueError(f"Unsupported backfill file type: {path} (expected .csv or .parquet)")
+
+
+def _headlines(value) -> Optional[list[str]]:
+    """List column from Parquet, or a JSON list / ``|``-separated string from CSV."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        items = json.loads(value) if value.startswith("[") else value.split("|")
+    else:
+        items = list(value)
+    items = [str(h).strip() for h in items if str(h).strip()]
+    return items or None
+
+
+def score_frame(frame: pd.DataFrame) -> tuple[list[dict], list[dict]]:
+    """Score one input batch; returns ``(mood_rows, news_rows)``."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Backfill input is missing column(s): {', '.join(missing)}")
+    frame = frame.rename(columns={"news_headlines": "headlines", "news_summary": "summary"})
+    for column in NUMERIC_COLUMNS:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    frame["date"] = pd.to_datetime(frame["date"], utc=True).dt.tz_localize(None).dt.normalize()
+    incomplete = frame[list(REQUIRED_COLUMNS)].isna().any(axis=1)
+    if incomplete.any():
+        logger.warning("Skipping %d backfill rows without %s", incomplete.sum(), ", ".join(REQUIRED_COLUMNS))
+        frame = frame[~incomplete].copy()
+    frame["country_code"] = frame["country_code"].str.upper()
+
+    # Score the numeric columns in one pass; missing danceability /
+    # acousticness score as 0.5, like the daily ingest.
+    def column(name: str) -> np.ndarray:
+        if name not in frame.columns:
+            return np.full(len(frame), np.nan)
+        return frame[name].to_numpy(dtype=float, na_value=np.nan)
+
+    mood = score_moods(
+        valence=column("valence"),
+        energy=column("energy"),
+        danceability=np.nan_to_num(column("danceability"), nan=0.5),
+        acousticness=np.nan_to_num(column("acousticness"), nan=0.5),
+        news_sentiment=column("news_sentiment"),
+    )
+
+    frame = frame.astype(object).where(frame.notna(), None)
+    records = frame.to_dict("records")
+    moods, news = [], []
+    for r, score, label, color in zip(
+        records, mood.mood_score.tolist(), mood.mood_label.tolist(), mood.color_code.tolist()
+    ):
+        cc = r["country_code"]
+        moods.append({
+            **{c: r.get(c) for c in MOOD_COLUMNS},
+            "date": r["date"].to_pydatetime(),
+            "country_name": r.get("country_name") or SUPPORTED_COUNTRIES.get(cc, cc),
+            "mood_score": score,
+            "mood_label": label,
+            "color_code": color,
+            "model_version": mood.model_version,
+        })
+        headlines = _headlines(r.get("headlines"))
+        if headlines or r.get("summary"):
+            news.append({
+                "country_code": cc,
+                "day": r["date"].to_pydatetime(),
+                "headlines": headlines,
+                "summary": r.get("summary"),
+            })
+    return moods, news
+
+
+# ── Load ──────────────────────────────────────────────────────────────────────
+
+class BackfillService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+        self.dialect = dialects.name_of(db)
+        self._seq = itertools.count()
+
+    async def load(self, frames: Iterable[pd.DataFrame], spikes: bool = True) -> BackfillReport:
+        started = time.perf_counter()
+        report = BackfillReport()
+        conn = await self.db.connection()
+        stages = (MOOD_STAGE, NEWS_STAGE, SPIKE_STAGE)
+        for stage in stages:
+            await conn.run_sync(stage.create)
+
+        try:
+            for frame in frames:
+                moods, news = score_frame(frame)
+                await self._copy(conn, MOOD_STAGE, moods)
+                await self._copy(conn, NEWS_STAGE, news)
+                report.rows += len(moods)
+                logger.info("Staged %d rows (%d total)", len(moods), report.rows)
+
+            report.first, report.last = (await conn.execute(
+                select(func.min(MOOD_STAGE.c.date), func.max(MOOD_STAGE.c.date))
+            )).one()
+            if report.first is not None:
+                await ensure_partitions(conn, since=report.first.date())
+                report.rows = await self._merge_moods(conn)
+                report.news = await self._merge_news(conn)
+                codes = report.countries = sorted((await conn.execute(
+                    select(MOOD_STAGE.c.country_code).distinct()
+                )).scalars())
+                await TrendsService(self.db).refresh_derived(codes, report.first, report.last)
+                if spikes:
+                    report.spikes = await self._detect_spikes(conn, codes, report.first, report.last)
+        finally:
+            for stage in reversed(stages):
+                await conn.run_sync(stage.drop, checkfirst=True)
+
+        await self.db.commit()
+        report.seconds = time.perf_counter() - started
+        return report
+
+    async def _copy(self, conn: AsyncConnection, stage: Table, rows: list[dict]) -> None:
+        """Append *rows* to a staging table: binary ``COPY`` on PostgreSQL."""
+        if not rows:
+            return
+        columns = [c.name for c in stage.columns]
+        records = [
+            tuple(next(self._seq) if c == "seq" else row.get(c) for c in columns)
+            for row in rows
+        ]
+        if self.dialect == dialects.POSTGRESQL:
+            raw = await conn.get_raw_connection()
+            # JSONB goes over COPY as text
+            if stage is NEWS_STAGE:
+                i = columns.index("headlines")
+                records = [
+                    r[:i] + (None if r[i] is None else json.dumps(r[i]),) + r[i + 1 :]
+                    for r in records
+                ]
+            await raw.driver_connection.copy_records_to_table(
+                stage.name, records=records, columns=columns
+            )
+        else:
+            await conn.execute(stage.insert(), [dict(zip(columns, r)) for r in records])
+
+    def _newest_per_key(self, stage: Table, keys: list[str], columns: list[str]):
+        """Last staged row per *keys*; the WHERE also lets SQLite parse the upsert."""
+        ranked = select(
+            *[stage.c[c] for c in columns],
+            func.row_number()
+            .over(partition_by=[stage.c[k] for k in keys], order_by=desc(stage.c.seq))
+            .label("rank"),
+        ).subquery("ranked")
+        return select(*[ranked.c[c] for c in columns]).where(ranked.c.rank == 1)
+
+    async def _merge_moods(self, conn: AsyncConnection) -> int:
+        stmt = dialects.insert(self.dialect, CountryMood).from_select(
+            MOOD_COLUMNS, self._newest_per_key(MOOD_STAGE, ["country_code", "date"], MOOD_COLUMNS)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CountryMood.country_code, CountryMood.date],
+            set_={c: stmt.excluded[c] for c in MOOD_COLUMNS if c not in ("country_code", "date")},
+        )
+        return (await conn.execute(stmt)).rowcount
+
+    async def _merge_news(self, conn: AsyncConnection) -> int:
+        stmt = dialects.insert(self.dialect, CountryNews).from_select(
+            NEWS_COLUMNS, self._newest_per_key(NEWS_STAGE, ["country_code", "day"], NEWS_COLUMNS)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CountryNews.country_code, CountryNews.day],
+            set_={
+                "headlines": func.coalesce(stmt.excluded.headlines, CountryNews.headlines),
+                "summary": func.coalesce(stmt.excluded.summary, CountryNews.summary),
+                "updated_at": func.now(),
+            },
+        )
+        return (await conn.execute(stmt)).rowcount
+
+    async def _detect_spikes(
+        self, conn: AsyncConnection, codes: list[str], first: dt.datetime, last: dt.datetime
+    ) -> int:
+        """Replay the daily spike check over each loaded day.
+
+        Each day is compared with the days before it inside the ingest
+        look-back window, using merged history (so rows loaded earlier, and
+        pre-existing history just before *first*, count too).  Spikes land at
+        the start of their day; ones already recorded for that day and
+        detector (e.g. by the daily ingest) are kept as is.
+        """
+        lookback = dt.timedelta(days=SPIKE_LOOKBACK_DAYS)
+        result = await conn.stream(
+            select(CountryMood.country_code, CountryMood.date, CountryMood.mood_score, CountryMood.mood_label)
+            .where(
+                CountryMood.country_code.in_(codes),
+                CountryMood.date > first - lookback,
+                CountryMood.date <= last,
+            )
+            .order_by(CountryMood.country_code, CountryMood.date)
+        )
+        spikes: list[dict] = []
+        window: list = []
+        async for row in result:
+            if window and window[-1].country_code != row.country_code:
+                window = []
+            window = [w for w in window if w.date > row.date - lookback]
+            if row.date >= first and window:
+                evt = detect_spike(
+                    country_code=row.country_code,
+                    history_scores=[w.mood_score for w in window],
+                    history_labels=[w.mood_label for w in window],
+                    current_score=row.mood_score,
+                    current_label=row.mood_label,
+                )
+                if evt:
+                    spikes.append({
+                        "country_code": evt.country_code,
+                        "detected_at": row.date,
+                        "previous_label": evt.previous_label,
+                        "new_label": evt.new_label,
+                        "delta": evt.delta,
+                        "reason": evt.reason,
+                        "detector": evt.detector,
+                    })
+            window.append(row)
+
+        await self._copy(conn, SPIKE_STAGE, spikes)
+        # Same (country, day, detector) key as the ingest's spikes
+        stmt = dialects.insert(self.dialect, MoodSpike).from_select(
+            SPIKE_COLUMNS, select(*[SPIKE_STAGE.c[c] for c in SPIKE_COLUMNS]).where(true())
+        )
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[MoodSpike.country_code, MoodSpike.detected_at, MoodSpike.detector]
+        )
+        return (await conn.execute(stmt)).rowcount
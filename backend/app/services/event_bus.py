@@ -0,0 +1,185 @@
+"""
+EventBus – pushes mood updates and spike events to connected clients.
+
+Writers (daily ingest, the live path in /mood/global) publish JSON events on a
+single Redis pub/sub channel.  Every API process holds ONE subscription to that
+channel and fans each message out to in-memory queues, one per connected
+client, so thousands of idle subscribers cost a queue each instead of a Redis
+connection or a polling request each.
+
+The subscription has a connection of its own: the shared client's read
+timeout would end an idle ``listen()`` every few seconds.  A dead connection
+is caught by periodic health-check pings instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CHANNEL = "mood:events"
+
+# Resubscribe delay after a lost connection, doubled per failed attempt
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+# PING interval on the idle subscription connection
+HEALTH_CHECK_SECONDS = 30
+
+EVENT_COUNTRY_MOOD = "country_mood"
+EVENT_MOOD_SPIKE = "mood_spike"
+
+
+async def publish_events(redis, events: list[tuple[str, dict]]) -> None:
+    """Publish ``(event_type, payload)`` pairs in one pipelined round trip.
+
+    Publishing is best-effort: a missing or failing Redis never breaks the
+    write path that produced the events.
+    """
+    if not redis or not events:
+        return
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for event_type, payload in events:
+            pipe.publish(CHANNEL, json.dumps({"type": event_type, "data": payload}, default=str))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning("Event publish failed: %s", e)
+
+
+async def publish_event(redis, event_type: str, payload: dict) -> None:
+    await publish_events(redis, [(event_type, payload)])
+
+
+class EventBroadcaster:
+    """Per-process fan-out from one Redis subscription to many local queues."""
+
+    def __init__(self, queue_size: int = 100) -> None:
+        self.queue_size = queue_size
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._redis = None
+        self._pubsub = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(self) -> asyncio.Queue:
+        """Register a client queue, starting the shared listener on first use."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        await self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self._close_pubsub()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _ensure_listener(self) -> None:
+        if self._task and not self._task.done():
+            return
+
+        from app.api.deps import get_redis
+
+        if not await get_redis():
+            return  # no Redis → clients only receive keep-alives
+
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=None,  # block in listen() for as long as it is idle
+                health_check_interval=HEALTH_CHECK_SECONDS,
+            )
+        self._task = asyncio.create_task(self._listen(self._redis))
+
+    async def _listen(self, redis) -> None:
+        """Relay channel messages to the subscriber queues.
+
+        A lost connection is re-subscribed with exponential backoff for as
+        long as clients are connected, so their streams resume without them
+        having to reconnect.  Any other error ends the listener; the next
+        ``subscribe()`` starts a new one.
+        """
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                self._pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                await self._pubsub.subscribe(CHANNEL)
+                logger.info("Event broadcaster subscribed to %s", CHANNEL)
+                delay = RECONNECT_MIN_SECONDS
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    frame = self._to_sse(message["data"])
+                    if frame:
+                        self._fan_out(frame)
+            except asyncio.CancelledError:
+                raise
+            except RedisConnectionError as e:
+                logger.warning("Event listener lost its connection: %s", e)
+            except Exception:
+                logger.exception("Event listener failed")
+                await self._close_pubsub()
+                return
+            await self._close_pubsub()
+            if not self._subscribers:
+                return  # the next subscribe() starts a new listener
+            logger.info("Resubscribing to %s in %.0fs", CHANNEL, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+
+    def _fan_out(self, frame: str) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than block everyone.
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(frame)
+
+    @staticmethod
+    def _to_sse(raw: str) -> Optional[str]:
+        """Render a published message as an SSE frame (once, shared by all clients)."""
+        try:
+            event = json.loads(raw)
+            return f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception:
+            logger.warning("Dropping malformed event: %r", raw)
+            return None
+
+
+broadcaster = EventBroadcaster()
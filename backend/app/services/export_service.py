@@ -0,0 +1,239 @@
+"""
+ExportService – streams ``country_mood`` / ``mood_spike`` history out as
+Apache Parquet or Arrow IPC.
+
+Rows are read through a server-side cursor ``EXPORT_BATCH_SIZE`` at a time
+and each batch is encoded and handed to the sink before the next is
+fetched, so memory stays flat however much history is exported.  Reads go
+to a read replica when one is healthy.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import JSON, Date, DateTime, Float, Integer, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.models import CountryMood, MoodSpike
+from app.db.session import READ_ONLY
+
+settings = get_settings()
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+PARQUET_CODECS = ("none", "snappy", "gzip", "brotli", "lz4", "zstd")
+# Arrow IPC compresses whole buffers and only supports these codecs.
+ARROW_CODECS = ("lz4", "zstd")
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    table: Table
+    time_column: str
+
+
+EXPORT_TABLES = {
+    "country_mood": ExportTable(CountryMood.__table__, "date"),
+    "mood_spike": ExportTable(MoodSpike.__table__, "detected_at"),
+}
+
+
+def _arrow_type(column) -> pa.DataType:
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    if isinstance(column.type, JSON):
+        return pa.list_(pa.string())
+    return pa.string()
+
+
+def arrow_schema(table: Table) -> pa.Schema:
+    return pa.schema(
+        [pa.field(c.name, _arrow_type(c), nullable=c.nullable) for c in table.columns]
+    )
+
+
+@dataclass(frozen=True)
+class Compression:
+    """``zstd`` or ``zstd,country_code=snappy,reason=gzip`` – a default codec
+    plus optional per-column overrides (Parquet only)."""
+
+    default: str = "zstd"
+    columns: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Compression":
+        default, columns = "none", {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            if "=" in part:
+                name, codec = (s.strip() for s in part.split("=", 1))
+                columns[name] = codec.lower()
+            else:
+                default = part.lower()
+        return cls(default, columns)
+
+    def for_parquet(self, schema: pa.Schema) -> dict[str, str]:
+        unknown = set(self.columns) - set(schema.names)
+        if unknown:
+            raise ValueError(f"Unknown column(s) in compression spec: {', '.join(sorted(unknown))}")
+        for codec in (self.default, *self.columns.values()):
+            if codec not in PARQUET_CODECS:
+                raise ValueError(f"Unknown compression codec {codec!r}")
+        return {name: self.columns.get(name, self.default) for name in schema.names}
+
+    def for_arrow(self) -> Optional[str]:
+        if self.columns:
+            raise ValueError("Arrow IPC has no per-column compression; use parquet")
+        if self.default == "none":
+            return None
+        if self.default not in ARROW_CODECS:
+            raise ValueError(f"Arrow IPC supports {' or '.join(ARROW_CODECS)} compression")
+        return self.default
+
+
+@dataclass(frozen=True)
+class ExportRequest:
+    table: str = "country_mood"
+    format: str = "parquet"
+    start: Optional[dt.date] = None
+    end: Optional[dt.date] = None  # inclusive
+    countries: tuple[str, ...] = ()
+    batch_size: int = 0  # 0 = EXPORT_BATCH_SIZE
+    compression: Compression = field(
+        default_factory=lambda: Compression.parse(settings.EXPORT_COMPRESSION)
+    )
+
+    def __post_init__(self) -> None:
+        if self.table not in EXPORT_TABLES:
+            raise ValueError(f"table must be one of {', '.join(EXPORT_TABLES)}")
+        if self.format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        if self.start and self.end and self.start > self.end:
+            raise ValueError("start must not be after end")
+        # Fail before streaming starts, not halfway through a response.
+        if self.format == "parquet":
+            self.compression.for_parquet(arrow_schema(EXPORT_TABLES[self.table].table))
+        else:
+            self.compression.for_arrow()
+
+    @property
+    def filename(self) -> str:
+        span = "-".join(d.isoformat() for d in (self.start, self.end) if d) or "all"
+        return f"{self.table}_{span}{FORMATS[self.format]}"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose bytes are drained after every batch."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _statement(self, request: ExportRequest):
+        spec = EXPORT_TABLES[request.table]
+        table = spec.table
+        time_column = table.c[spec.time_column]
+        stmt = select(table)
+        if request.start:
+            stmt = stmt.where(time_column >= dt.datetime.combine(request.start, dt.time.min))
+        if request.end:
+            stmt = stmt.where(
+                time_column < dt.datetime.combine(request.end + dt.timedelta(days=1), dt.time.min)
+            )
+        if request.countries:
+            stmt = stmt.where(table.c.country_code.in_([c.upper() for c in request.countries]))
+        return stmt.order_by(time_column, table.c.country_code)
+
+    async def record_batches(self, request: ExportRequest) -> AsyncIterator[pa.RecordBatch]:
+        """Matching rows as Arrow record batches, read via a server-side cursor."""
+        schema = arrow_schema(EXPORT_TABLES[request.table].table)
+        batch_size = request.batch_size or settings.EXPORT_BATCH_SIZE
+        result = await self.db.stream(
+            self._statement(request).execution_options(yield_per=batch_size),
+            bind_arguments=READ_ONLY,
+        )
+        async for rows in result.partitions(batch_size):
+            columns = list(zip(*rows))
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=f.type) for values, f in zip(columns, schema)],
+                schema=schema,
+            )
+
+    @staticmethod
+    def _open_writer(request: ExportRequest, sink):
+        schema = arrow_schema(EXPORT_TABLES[request.table].table)
+        if request.format == "parquet":
+            return pq.ParquetWriter(
+                sink, schema, compression=request.compression.for_parquet(schema)
+            )
+        return pa.ipc.new_file(
+            sink,
+            schema,
+            options=pa.ipc.IpcWriteOptions(compression=request.compression.for_arrow()),
+        )
+
+    async def iter_bytes(self, request: ExportRequest) -> AsyncIterator[bytes]:
+        """Encoded export, one chunk per batch (for HTTP streaming)."""
+        sink = _ChunkSink()
+        writer = self._open_writer(request, sink)
+        try:
+            async for batch in self.record_batches(request):
+                writer.write_batch(batch)  # one Parquet row group per batch
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        tail = sink.drain()
+        if tail:
+            yield tail
+
+    async def write_file(self, request: ExportRequest, path: str) -> int:
+        """Export to *path*; returns the number of rows written."""
+        rows = 0
+        with pa.OSFile(path, "wb") as sink:
+            writer = self._open_writer(request, sink)
+            try:
+                async for batch in self.record_batches(request):
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+            finally:
+                writer.close()
+        return rows
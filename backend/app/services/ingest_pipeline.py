@@ -0,0 +1,419 @@
+"""
+IngestPipeline – the daily ingest as a staged, concurrent pipeline.
+
+    music ─▶ news ─▶ analyze ─▶ score ─▶ summarize ─▶ persist ─▶ spikes
+
+Each country flows through the stages independently; every stage has its
+own concurrency limit (``INGEST_*_CONCURRENCY``) and a bounded inbound
+queue, so Last.fm, Google News and Gemini calls overlap across countries
+while the database stages write in batches.  The final stage also
+refreshes the cache and publishes events for its batch, so clients see
+countries as soon as they are stored rather than at the end of the run.
+
+With an ``IngestRunStore`` every country is checkpointed after each costly
+stage; a resumed run skips the stages (and the Last.fm / Gemini calls) that
+already finished and leaves fully finished countries out entirely.
+
+Every record of a run is stamped with the run's start time, so a run that
+crosses midnight – or is resumed on a later day – stores, checks for spikes
+and caches one observation day.
+
+The cheap stages (music: one chart call, news: one RSS fetch) produce a
+fingerprint of the country's inputs.  When it matches the country's last
+persisted run, the costly ones (analyze: per-track tag lookups and Gemini
+sentiment; summarize: Gemini summary) are skipped and that run's results
+are carried forward.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.mood_engine import MoodResult
+from app.core.pipeline import Stage, run_pipeline
+from app.core import anomaly_engine
+from app.core.spike_detector import (
+    SPIKE_WINDOW,
+    RollingState,
+    SpikeEvent,
+    detect_spikes_batch,
+    parse_detectors,
+    update_rolling,
+)
+from app.db.instrumentation import query_tag
+from app.models.schemas import CountryMoodResponse, SpikeResponse
+from app.services.event_bus import EVENT_COUNTRY_MOOD, EVENT_MOOD_SPIKE, publish_events
+from app.services.gemini_service import GeminiService
+from app.services.ingest_runs import (
+    RUN_COMPLETED,
+    RUN_FAILED,
+    IngestRunStore,
+    stage_reached,
+)
+from app.services.lastfm_service import SUPPORTED_COUNTRIES, LastFmService
+from app.services.model_registry import score_moods
+from app.services.mood_cache import write_through
+from app.services.news_service import NewsService
+from app.services.trends_service import TrendsService, day_start
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+SPIKE_TREND_DAYS = 14
+
+
+def input_fingerprint(tracks: list[dict], headlines: list[str]) -> Optional[str]:
+    """sha256 of a country's chart (in order) and headline set; ``None``
+    without a chart, so Last.fm fallbacks are never carried forward."""
+    if not tracks:
+        return None
+    payload = json.dumps(
+        {"tracks": [[t["name"], t["artist"]] for t in tracks], "headlines": sorted(set(headlines))},
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CountryItem:
+    """One country's way through the pipeline."""
+
+    country_code: str
+    tracks: list[dict] = field(default_factory=list)
+    fingerprint: Optional[str] = None
+    features: dict = field(default_factory=dict)
+    sentiment: Optional[float] = None
+    headlines: list[str] = field(default_factory=list)
+    mood: Optional[MoodResult] = None
+    summary: Optional[str] = None
+    record: Optional[dict] = None
+    stage: Optional[str] = None  # last checkpointed stage
+
+    @property
+    def country_name(self) -> str:
+        return SUPPORTED_COUNTRIES.get(self.country_code, self.country_code)
+
+    def done(self, stage: str) -> bool:
+        return stage_reached(self.stage, stage)
+
+    def to_record(self, observed_at: dt.datetime) -> dict:
+        """The ``country_mood`` row (plus news fields) for ``upsert_moods``."""
+        feat, mood = self.features, self.mood
+        return {
+            "country_code": self.country_code,
+            "country_name": self.country_name,
+            "date": observed_at,
+            "mood_score": mood.mood_score,
+            "mood_label": mood.mood_label,
+            "color_code": mood.color_code,
+            "valence": feat["valence"],
+            "energy": feat["energy"],
+            "danceability": feat.get("danceability"),
+            "acousticness": feat.get("acousticness"),
+            "top_genre": feat.get("top_genre"),
+            "top_track": feat.get("top_track"),
+            "news_sentiment": self.sentiment,
+            "news_headlines": self.headlines or None,
+            "news_summary": self.summary,
+            "model_version": mood.model_version,
+        }
+
+
+class IngestPipeline:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        redis=None,
+        lastfm: Optional[LastFmService] = None,
+        news: Optional[NewsService] = None,
+        gemini: Optional[GeminiService] = None,
+        runs: Optional[IngestRunStore] = None,
+        skip_unchanged: Optional[bool] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.runs = runs
+        self.run_id: Optional[int] = None
+        self.observed_at: Optional[dt.datetime] = None  # stamped on every record
+        self.skip_unchanged = (
+            settings.INGEST_SKIP_UNCHANGED if skip_unchanged is None else skip_unchanged
+        )
+        self.previous: dict = {}  # country_code → last persisted IngestItem
+        self.unchanged: set[str] = set()
+        self.redis = redis
+        self.lastfm = lastfm or LastFmService()
+        self.news = news or NewsService()
+        self.gemini = gemini or GeminiService()
+        self.detectors = parse_detectors(settings.SPIKE_DETECTOR)
+        self.stored: list[str] = []
+        self.spikes = 0
+
+    def stages(self) -> list[Stage]:
+        queue = settings.INGEST_QUEUE_SIZE
+        batch = settings.INGEST_PERSIST_BATCH_SIZE
+        return [
+            Stage("music", self.fetch_music, settings.INGEST_MUSIC_CONCURRENCY, queue),
+            Stage("news", self.fetch_news, settings.INGEST_NEWS_CONCURRENCY, queue),
+            Stage("analyze", self.analyze, settings.INGEST_ANALYZE_CONCURRENCY, queue),
+            Stage("score", self.score, 1, queue, batch_size=batch),
+            Stage("summarize", self.summarize, settings.INGEST_SUMMARY_CONCURRENCY, queue),
+            Stage("persist", self.persist, 1, queue, batch_size=batch),
+            Stage("spikes", self.detect_spikes, 1, queue, batch_size=batch),
+        ]
+
+    async def run(
+        self, country_codes: Optional[Iterable[str]] = None, resume: bool = False
+    ) -> list[CountryItem]:
+        codes = list(country_codes or SUPPORTED_COUNTRIES)
+        items = [CountryItem(cc) for cc in codes]
+        self.observed_at = dt.datetime.utcnow()
+        if self.runs:
+            run, checkpoints = await self.runs.start(resume)
+            self.run_id = run.id
+            # A resumed run keeps its first attempt's day
+            self.observed_at = run.started_at
+            for item in items:
+                saved = checkpoints.get(item.country_code)
+                if saved is not None:
+                    item.stage = saved.stage
+                    item.fingerprint = saved.fingerprint
+                    item.tracks = saved.tracks or []
+                    item.features = saved.features or {}
+                    item.headlines = saved.headlines or []
+                    item.sentiment = saved.sentiment
+                    item.summary = saved.summary
+            finished = [i.country_code for i in items if i.done("spikes")]
+            if finished:
+                logger.info("Skipping %d countries finished in run %d", len(finished), run.id)
+            items = [i for i in items if not i.done("spikes")]
+            if self.skip_unchanged:
+                self.previous = await self.runs.previous_results(exclude_run_id=run.id)
+
+        logger.info("Ingesting %d countries", len(items))
+        stages = self.stages()
+        try:
+            results = await run_pipeline(items, stages)
+        except BaseException:
+            if self.run_id is not None:
+                await self.runs.finish(self.run_id, RUN_FAILED)
+            raise
+        if self.run_id is not None:
+            failed = sum(stage.stats.failed for stage in stages)
+            await self.runs.finish(self.run_id, RUN_FAILED if failed else RUN_COMPLETED)
+            if failed:
+                logger.warning("%d countries failed; rerun with --resume to retry them", failed)
+        if self.unchanged:
+            logger.info("Carried forward %d countries with unchanged inputs", len(self.unchanged))
+        return results
+
+    def _is_unchanged(self, item: CountryItem) -> bool:
+        previous = self.previous.get(item.country_code)
+        return (
+            previous is not None
+            and item.fingerprint is not None
+            and previous.fingerprint == item.fingerprint
+        )
+
+    async def _checkpoint(self, items: list[CountryItem], stage: str) -> None:
+        for item in items:
+            item.stage = stage
+            if self.run_id is not None:
+                await self.runs.checkpoint(self.run_id, item, stage)
+
+    # ── Stages ────────────────────────────────────────────────────────────────
+
+    async def fetch_music(self, item: CountryItem) -> CountryItem:
+        if not item.done("music"):
+            item.tracks = await self.lastfm.fetch_top_tracks(item.country_code)
+            await self._checkpoint([item], "music")
+        return item
+
+    async def fetch_news(self, item: CountryItem) -> CountryItem:
+        if not item.done("news"):
+            # Cached on the NewsService, so fetch_sentiment reuses them
+            headlines = await self.news.fetch_headlines(item.country_code)
+            item.headlines = headlines[:5]
+            item.fingerprint = input_fingerprint(item.tracks, headlines)
+            if self._is_unchanged(item):
+                previous = self.previous[item.country_code]
+                item.features = previous.features or {}
+                item.sentiment = previous.sentiment
+                item.summary = previous.summary
+            await self._checkpoint([item], "news")
+        if self._is_unchanged(item):
+            self.unchanged.add(item.country_code)
+        return item
+
+    async def analyze(self, item: CountryItem) -> CountryItem:
+        """Tag-based audio features and headline sentiment (the costly calls)."""
+        if item.done("analyze") or item.country_code in self.unchanged:
+            return item
+        item.features = await self.lastfm.features_from_tracks(item.country_code, item.tracks)
+        item.sentiment = await self.news.fetch_sentiment(item.country_code)
+        await self._checkpoint([item], "analyze")
+        return item
+
+    async def score(self, items: list[CountryItem]) -> list[CountryItem]:
+        """Score and classify whatever is queued with one model call."""
+        feats = [item.features for item in items]
+        batch = score_moods(
+            valence=[f["valence"] for f in feats],
+            energy=[f["energy"] for f in feats],
+            danceability=[f.get("danceability", 0.5) for f in feats],
+            acousticness=[f.get("acousticness", 0.5) for f in feats],
+            news_sentiment=[item.sentiment for item in items],
+        )
+        for item, mood in zip(items, batch.results()):
+            item.mood = mood
+        return items
+
+    async def summarize(self, item: CountryItem) -> CountryItem:
+        if item.done("summarize") or item.country_code in self.unchanged:
+            return item
+        if item.headlines:
+            try:
+                item.summary = await self.gemini.generate_mood_summary(
+                    country_name=item.country_name,
+                    headlines=item.headlines,
+                    mood_label=item.mood.mood_label,
+                )
+            except Exception as e:
+                logger.error(f"Gemini failed for {item.country_code}: {e}")
+        await self._checkpoint([item], "summarize")
+        return item
+
+    async def persist(self, items: list[CountryItem]) -> list[CountryItem]:
+        query_tag.set("ingest:persist")
+        for item in items:
+            item.record = item.to_record(self.observed_at)
+        pending = [item for item in items if not item.done("persist")]
+        if pending:
+            async with self.session_factory() as db:
+                await TrendsService(db).upsert_moods([item.record for item in pending])
+            await self._checkpoint(pending, "persist")
+        for item in pending:
+            logger.info("✓ %s – %s (%.3f)", item.country_code, item.mood.mood_label, item.mood.mood_score)
+        return items
+
+    async def detect_spikes(self, items: list[CountryItem]) -> list[CountryItem]:
+        """Spike check for a persisted batch, then cache refresh and events."""
+        query_tag.set("ingest:spikes")
+        events = [
+            (
+                EVENT_COUNTRY_MOOD,
+                CountryMoodResponse(
+                    **{**item.record, "date": day_start(item.record["date"])}
+                ).model_dump(mode="json"),
+            )
+            for item in items
+        ]
+        async with self.session_factory() as db:
+            svc = TrendsService(db)
+            codes = [item.country_code for item in items]
+            found: list[SpikeEvent] = []
+            if "zscore" in self.detectors:
+                found += await self._detect_window(svc, items)
+            if "streaming" in self.detectors:
+                found += await self._detect_streaming(svc, items)
+            engine = [d for d in self.detectors if d in anomaly_engine.ENGINE_DETECTORS]
+            if engine:
+                found += await self._detect_engine(svc, items, engine)
+            # Stamped with the observed day, so a later run the same day
+            # finds the spike already stored instead of adding it again
+            detected_at = {item.country_code: day_start(item.record["date"]) for item in items}
+            spikes = await svc.insert_spikes([
+                {
+                    "country_code": evt.country_code,
+                    "detected_at": detected_at[evt.country_code],
+                    "previous_label": evt.previous_label,
+                    "new_label": evt.new_label,
+                    "delta": evt.delta,
+                    "reason": evt.reason,
+                    "detector": evt.detector,
+                }
+                for evt in found
+            ])
+            for spike in spikes:
+                self.spikes += 1
+                events.append((
+                    EVENT_MOOD_SPIKE,
+                    SpikeResponse.model_validate(spike).model_dump(mode="json"),
+                ))
+                logger.warning(
+                    "SPIKE %s [%s]: %s → %s (Δ%.3f)",
+                    spike.country_code, spike.detector, spike.previous_label, spike.new_label, spike.delta,
+                )
+
+            query_tag.set("ingest:cache")
+            await write_through(self.redis, svc, codes)
+        await publish_events(self.redis, events)
+        await self._checkpoint(items, "spikes")
+        self.stored.extend(codes)
+        return items
+
+    async def _detect_window(self, svc: TrendsService, items: list[CountryItem]) -> list[SpikeEvent]:
+        codes = [item.country_code for item in items]
+        # Today's row (just persisted) is the newest; the rest is history
+        trends = await svc.get_recent_histories(codes, SPIKE_TREND_DAYS, SPIKE_WINDOW + 1)
+        return detect_spikes_batch(
+            {cc: trend[:-1] for cc, trend in trends.items()},
+            {item.country_code: item.record for item in items},
+        )
+
+    async def _detect_streaming(self, svc: TrendsService, items: list[CountryItem]) -> list[SpikeEvent]:
+        """O(1) per country against persisted running statistics; countries
+        without state yet are warmed up from their recent history first."""
+        codes = [item.country_code for item in items]
+        states = await svc.get_spike_states(codes)
+        missing = [cc for cc in codes if cc not in states]
+        if missing:
+            trends = await svc.get_recent_histories(missing, SPIKE_TREND_DAYS, SPIKE_TREND_DAYS + 1)
+            for cc in missing:
+                state = states[cc] = RollingState(cc)
+                for row in trends.get(cc, [])[:-1]:
+                    update_rolling(state, row["mood_score"], row["mood_label"], row["date"], settings.SPIKE_STREAM_ALPHA)
+
+        found = []
+        for item in items:
+            r = item.record
+            evt = update_rolling(
+                states[item.country_code],
+                r["mood_score"],
+                r["mood_label"],
+                r["date"],  # observation time: a later run the same day revises it
+                settings.SPIKE_STREAM_ALPHA,
+            )
+            if evt:
+                found.append(evt)
+        await svc.save_spike_states(list(states.values()))
+        return found
+
+    async def _detect_engine(
+        self, svc: TrendsService, items: list[CountryItem], detectors: list[str]
+    ) -> list[SpikeEvent]:
+        """EWMA chart / CUSUM / IsolationForest over the batch's recent
+        history; only today's anomalies are reported."""
+        days = settings.SPIKE_ENGINE_HISTORY_DAYS
+        trends = await svc.get_recent_histories([item.country_code for item in items], days, days + 1)
+        matrix = anomaly_engine.ScoreMatrix.from_rows(row for trend in trends.values() for row in trend)
+        today = day_start(items[0].record["date"]).date()
+        return [
+            SpikeEvent(
+                country_code=a.country_code,
+                previous_label=a.previous_label,
+                new_label=a.new_label,
+                delta=a.delta,
+                reason=a.reason,
+                detector=a.detector,
+            )
+            for a in anomaly_engine.detect(
+                matrix, detectors, anomaly_engine.EngineParams.from_settings(settings), since=today
+            )
+        ]
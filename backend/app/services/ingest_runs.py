@@ -0,0 +1,136 @@
+"""
+IngestRunStore – checkpoints for the daily ingest pipeline.
+
+Every ingest run gets an ``ingest_run`` row; as each country finishes a
+checkpointed stage its ``ingest_item`` row records the stage and the
+artifacts produced so far.  Resuming a run loads those rows so the
+pipeline only re-does what had not finished, and ``previous_results``
+feeds the ingest's change detection.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import and_, desc, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import dialects
+from app.db.models import IngestItem, IngestRun
+
+if TYPE_CHECKING:
+    from app.services.ingest_pipeline import CountryItem
+
+logger = logging.getLogger(__name__)
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+
+# Stages whose completion is recorded, in pipeline order
+CHECKPOINT_STAGES = ("music", "news", "analyze", "summarize", "persist", "spikes")
+PERSISTED_STAGES = ("persist", "spikes")
+
+
+def stage_reached(done: Optional[str], stage: str) -> bool:
+    """Whether a country checkpointed at *done* has already finished *stage*."""
+    return done is not None and CHECKPOINT_STAGES.index(done) >= CHECKPOINT_STAGES.index(stage)
+
+
+class IngestRunStore:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    async def start(self, resume: bool = False) -> tuple[IngestRun, dict[str, IngestItem]]:
+        """Open a new run, or with *resume* reopen the latest run if it did
+        not finish.
+
+        Returns the run and its existing checkpoints keyed by country.
+        """
+        async with self.session_factory() as db:
+            run = None
+            if resume:
+                # Only the most recent run: once a newer run has completed,
+                # an older unfinished one is superseded, not resumable.
+                run = await db.scalar(select(IngestRun).order_by(desc(IngestRun.id)).limit(1))
+                if run is not None and run.status == RUN_COMPLETED:
+                    run = None
+                if run is None:
+                    logger.info("No unfinished ingest run to resume; starting a new one")
+            if run is None:
+                run = IngestRun(status=RUN_RUNNING, started_at=dt.datetime.utcnow())
+                db.add(run)
+                await db.commit()
+                return run, {}
+
+            run.status = RUN_RUNNING
+            run.finished_at = None
+            await db.commit()
+            items = {
+                item.country_code: item
+                for item in await db.scalars(select(IngestItem).where(IngestItem.run_id == run.id))
+            }
+            logger.info("Resuming ingest run %d (%d countries checkpointed)", run.id, len(items))
+            return run, items
+
+    async def checkpoint(self, run_id: int, item: "CountryItem", stage: str) -> None:
+        """Record that *item* finished *stage*, with its artifacts so far."""
+        values = {
+            "run_id": run_id,
+            "country_code": item.country_code,
+            "stage": stage,
+            "fingerprint": item.fingerprint,
+            "tracks": item.tracks or None,
+            "features": item.features or None,
+            "headlines": item.headlines or None,
+            "sentiment": item.sentiment,
+            "summary": item.summary,
+        }
+        async with self.session_factory() as db:
+            stmt = dialects.insert(dialects.name_of(db), IngestItem).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[IngestItem.run_id, IngestItem.country_code],
+                set_={
+                    **{k: stmt.excluded[k] for k in values if k not in ("run_id", "country_code")},
+                    "updated_at": func.now(),
+                },
+            )
+            await db.execute(stmt)
+            await db.commit()
+
+    async def previous_results(self, exclude_run_id: Optional[int] = None) -> dict[str, IngestItem]:
+        """Each country's most recent persisted item from earlier runs,
+        for change detection."""
+        persisted = and_(
+            IngestItem.stage.in_(PERSISTED_STAGES), IngestItem.fingerprint.is_not(None)
+        )
+        if exclude_run_id is not None:
+            persisted = and_(persisted, IngestItem.run_id != exclude_run_id)
+        newest = (
+            select(IngestItem.country_code, func.max(IngestItem.run_id).label("run_id"))
+            .where(persisted)
+            .group_by(IngestItem.country_code)
+            .subquery("newest")
+        )
+        async with self.session_factory() as db:
+            items = await db.scalars(
+                select(IngestItem).join(
+                    newest,
+                    and_(
+                        IngestItem.country_code == newest.c.country_code,
+                        IngestItem.run_id == newest.c.run_id,
+                    ),
+                )
+            )
+            return {item.country_code: item for item in items}
+
+    async def finish(self, run_id: int, status: str) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(IngestRun)
+                .where(IngestRun.id == run_id)
+                .values(status=status, finished_at=dt.datetime.utcnow())
+            )
+            await db.commit()
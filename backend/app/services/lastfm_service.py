@@ -226,45 +226,57 @@ class LastFmService:
         Returns dict with: valence, energy, danceability, acousticness,
         top_genre, top_track.
         """
-        country_name = SUPPORTED_COUNTRIES.get(country_code, country_code)
+        tracks = await self.fetch_top_tracks(country_code, limit)
+        return await self.features_from_tracks(country_code, tracks)
 
+    async def fetch_top_tracks(self, country_code: str, limit: int = 50) -> list[dict]:
+        """One ``geo.getTopTracks`` call: ``[{"name", "artist"}, …]`` in chart
+        order, or ``[]`` if Last.fm has nothing (or fails)."""
+        country_name = SUPPORTED_COUNTRIES.get(country_code, country_code)
         try:
             async with httpx.AsyncClient() as client:
-                # 1. Get top tracks for this country
                 data = await self._api_call(client, {
                     "method": "geo.getTopTracks",
                     "country": country_name,
                     "limit": limit,
                 })
+        except Exception:
+            logger.exception("Last.fm top tracks failed for %s", country_code)
+            return []
+        return [
+            {"name": t["name"], "artist": t["artist"]["name"]}
+            for t in data.get("tracks", {}).get("track", [])
+            if t.get("name") and t.get("artist", {}).get("name")
+        ]
+
+    async def features_from_tracks(self, country_code: str, tracks: list[dict]) -> dict:
+        """Derive mood features from the tags of *tracks* (as returned by
+        ``fetch_top_tracks``); the costly part, one call per sampled track."""
+        if not tracks:
+            logger.warning("No tracks for %s, using fallback", country_code)
+            return self._fallback(country_code)
 
-                tracks = data.get("tracks", {}).get("track", [])
-                if not tracks:
-                    logger.warning("No tracks for %s, using fallback", country_code)
-                    return self._fallback(country_code)
-
-                top_track_name = tracks[0].get("name", "Unknown")
-                top_artist = tracks[0].get("artist", {}).get("name", "Unknown")
-
-                # 2. Get tags for top tracks (sample first 15 for speed)
+        try:
+            async with httpx.AsyncClient() as client:
+                # 1. Get tags for top tracks (sample first 15 for speed)
                 sample = tracks[:15]
                 tag_tasks = [
-                    self._get_track_tags(client, t["artist"]["name"], t["name"])
+                    self._get_track_tags(client, t["artist"], t["name"])
                     for t in sample
-                    if t.get("artist", {}).get("name") and t.get("name")
                 ]
                 all_tags = await asyncio.gather(*tag_tasks, return_exceptions=True)
 
-                # 3. Flatten all tags
+                # 2. Flatten all tags
                 flat_tags: list[tuple[str, int]] = []
                 for result in all_tags:
                     if isinstance(result, list):
                         flat_tags.extend(result)
 
-                # 4. Derive mood features from tags
+                # 3. Derive mood features from tags
                 features = self._tags_to_features(flat_tags)
-                features["top_track"] = f"{top_track_name} – {top_artist}"
+                features["top_track"] = f"{tracks[0]['name']} – {tracks[0]['artist']}"
 
-                # 5. Determine top genre from tags
+                # 4. Determine top genre from tags
                 features["top_genre"] = self._top_genre(flat_tags)
 
                 return features
@@ -0,0 +1,70 @@
+"""
+Model registry – which mood classifier this process uses.
+
+``MOOD_MODEL_VERSION`` names a joblib artifact in ``MOOD_MODEL_DIR``
+(``<version>.joblib``, see ``app.core.mood_model``); it is loaded on first
+use and kept for the life of the process.  Empty – or an artifact that
+cannot be loaded – means the rule engine.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from app.config import get_settings
+from app.core.mood_engine import DEFAULT_PARAMS, MoodBatch, MoodParams, MoodResult, compute_moods
+from app.core.mood_model import RULES_VERSION, MoodModel, RuleModel, feature_matrix, load_model
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@lru_cache(maxsize=1)
+def get_mood_model() -> MoodModel:
+    version = settings.MOOD_MODEL_VERSION
+    if not version:
+        return RuleModel()
+    try:
+        model = load_model(settings.MOOD_MODEL_DIR, version)
+    except Exception:
+        logger.exception("Could not load mood model %s from %s; using the rule engine", version, settings.MOOD_MODEL_DIR)
+        return RuleModel()
+    logger.info("Loaded mood model %s", model.version)
+    return model
+
+
+def score_moods(
+    valence,
+    energy,
+    danceability=0.5,
+    acousticness=0.5,
+    news_sentiment=None,
+    model: Optional[MoodModel] = None,
+    params: MoodParams = DEFAULT_PARAMS,
+) -> MoodBatch:
+    """``compute_moods`` with the label from *model* (default: the
+    configured one), predicted for all rows in one call.
+
+    *params* always shape the score; they choose the label only under the
+    rule engine, whose version then names them (``MoodParams.version``).
+    """
+    batch = compute_moods(valence, energy, danceability, acousticness, news_sentiment, params)
+    model = model or get_mood_model()
+    if model.version != RULES_VERSION:
+        X = feature_matrix(valence, energy, danceability, acousticness, news_sentiment)
+        batch.label_index = model.predict(X).astype(batch.label_index.dtype)
+        batch.model_version = model.version
+    return batch
+
+
+def predict_mood(
+    valence: float,
+    energy: float,
+    danceability: float = 0.5,
+    acousticness: float = 0.5,
+    news_sentiment: Optional[float] = None,
+) -> MoodResult:
+    """One country, same signature as ``compute_mood``."""
+    return score_moods(valence, energy, danceability, acousticness, news_sentiment).results()[0]
@@ -0,0 +1,135 @@
+"""
+MoodCache – Redis key layout and helpers shared by the API routes, the
+background summary worker and the ingest job.
+
+All helpers are best-effort: a missing or failing Redis is logged and
+otherwise ignored, exactly like the inline cache handling in the routes.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from app.config import get_settings
+from app.models.schemas import CountryDetailResponse
+
+if TYPE_CHECKING:
+    from app.services.trends_service import TrendsService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+GLOBAL_CACHE_KEY = "mood:global:latest"
+DEFAULT_TREND_DAYS = 7
+
+
+async def invalidate_global(cache) -> None:
+    """Drop the cached /mood/global payload so the next request re-reads the DB."""
+    if not cache:
+        return
+    try:
+        await cache.delete(GLOBAL_CACHE_KEY)
+    except Exception as e:
+        logger.warning("Global cache invalidation failed: %s", e)
+
+
+# ── Per-country detail entries ────────────────────────────────────────────────
+#
+# One string key per (country, trend window) so a batch of countries is a
+# single MGET.  Each country also keeps a small set of the windows it has
+# cached, which lets invalidation drop every window without a SCAN.
+
+
+def country_key(country_code: str, days: int) -> str:
+    return f"mood:country:{country_code.upper()}:{days}"
+
+
+def _windows_key(country_code: str) -> str:
+    return f"mood:country:{country_code.upper()}:windows"
+
+
+async def get_countries(
+    cache, country_codes: list[str], days: int
+) -> dict[str, CountryDetailResponse]:
+    """Return cached detail entries for *country_codes* in one MGET.
+
+    Entries that no longer validate are deleted and count as misses.
+    """
+    if not cache or not country_codes:
+        return {}
+    try:
+        raw = await cache.mget([country_key(cc, days) for cc in country_codes])
+    except Exception as e:
+        logger.warning("Country cache read failed: %s", e)
+        return {}
+    details: dict[str, CountryDetailResponse] = {}
+    stale: list[str] = []
+    for cc, value in zip(country_codes, raw):
+        if not value:
+            continue
+        try:
+            details[cc] = CountryDetailResponse.model_validate_json(value)
+        except ValueError as e:  # malformed, or written under an older schema
+            logger.warning("Dropping unreadable cache entry for %s: %s", cc, e)
+            stale.append(country_key(cc, days))
+    if stale:
+        try:
+            await cache.delete(*stale)
+        except Exception as e:
+            logger.warning("Country cache cleanup failed: %s", e)
+    return details
+
+
+async def set_countries(
+    cache, details: list[CountryDetailResponse], days: int
+) -> None:
+    """Write detail entries for one trend window in one pipelined round trip."""
+    if not cache or not details:
+        return
+    try:
+        pipe = cache.pipeline(transaction=False)
+        for detail in details:
+            cc = detail.country_code
+            pipe.setex(country_key(cc, days), settings.CACHE_TTL_SECONDS, detail.model_dump_json())
+            pipe.sadd(_windows_key(cc), days)
+            pipe.expire(_windows_key(cc), settings.CACHE_TTL_SECONDS)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning("Country cache write failed: %s", e)
+
+
+async def invalidate_countries(cache, country_codes: list[str]) -> None:
+    """Drop every cached trend window for *country_codes*."""
+    if not cache or not country_codes:
+        return
+    try:
+        pipe = cache.pipeline(transaction=False)
+        for cc in country_codes:
+            pipe.smembers(_windows_key(cc))
+        windows = await pipe.execute()
+
+        keys: list[str] = []
+        for cc, days in zip(country_codes, windows):
+            keys.extend(country_key(cc, int(d)) for d in days)
+            keys.append(_windows_key(cc))
+        await cache.delete(*keys)
+    except Exception as e:
+        logger.warning("Country cache invalidation failed: %s", e)
+
+
+async def write_through(cache, svc: "TrendsService", country_codes: list[str]) -> None:
+    """Replace cached entries after new rows for *country_codes* were persisted.
+
+    Every cached window is dropped, then the default window is reloaded
+    set-based and written back so the next click is served from memory.
+    """
+    if not cache or not country_codes:
+        return
+    await invalidate_countries(cache, country_codes)
+    try:
+        details = await svc.get_country_details(country_codes, DEFAULT_TREND_DAYS)
+    except Exception as e:
+        logger.warning("Country cache reload failed: %s", e)
+        return
+    await set_countries(cache, list(details.values()), DEFAULT_TREND_DAYS)
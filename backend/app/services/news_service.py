@@ -191,7 +191,30 @@ Respond with ONLY a JSON object in this exact format, nothing else:
         top_genre: Optional[str] = None,
         headlines: Optional[list[str]] = None
     ) -> str:
-        """Generate a one-sentence AI summary combining music and news mood."""
+        """Generate a one-sentence AI summary combining music and news mood,
+        falling back to a deterministic sentence without Gemini."""
+        summary = await self.generate_ai_summary(
+            country_code, country_name, mood_label, valence, energy,
+            top_track, top_genre, headlines,
+        )
+        if summary:
+            return summary
+        if not settings.GEMINI_API_KEY:
+            return self._generate_fallback_summary(country_name, mood_label, valence, energy, top_genre)
+        return self._generate_fallback_summary(country_name, mood_label, valence, energy, top_genre, headlines)
+
+    async def generate_ai_summary(
+        self,
+        country_code: str,
+        country_name: str,
+        mood_label: str,
+        valence: float,
+        energy: float,
+        top_track: Optional[str] = None,
+        top_genre: Optional[str] = None,
+        headlines: Optional[list[str]] = None
+    ) -> Optional[str]:
+        """The Gemini summary alone, or ``None`` if there is no key or the call fails."""
         cc = country_code.upper()
         
         # Return cached if available
@@ -199,7 +222,7 @@ Respond with ONLY a JSON object in this exact format, nothing else:
             return self._summary_cache[cc]
         
         if not settings.GEMINI_API_KEY:
-            return self._generate_fallback_summary(country_name, mood_label, valence, energy, top_genre)
+            return None
         
         # Build context
         music_context = f"Music data: valence={valence:.2f} (happiness), energy={energy:.2f}"
@@ -256,7 +279,7 @@ Reply with ONLY your one sentence, nothing else."""
         except Exception as e:
             logger.warning("Gemini summary failed for %s: %s", cc, e)
         
-        return self._generate_fallback_summary(country_name, mood_label, valence, energy, top_genre, headlines)
+        return None
     
     @staticmethod
     def _generate_fallback_summary(
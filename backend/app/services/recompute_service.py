@@ -0,0 +1,210 @@
+"""
+RecomputeService – re-score stored ``country_mood`` history from its raw
+features, without re-fetching anything upstream.
+
+Valence, energy, danceability, acousticness and news_sentiment are streamed
+in chunks of ``RECOMPUTE_BATCH_SIZE`` rows and scored with ``score_moods``
+(the vectorized engine, under a given ``MoodParams`` set).  Rows whose
+score, label or model_version would change are counted into a diff summary;
+on a write they are also staged (binary ``COPY`` on PostgreSQL) and applied
+with one ``UPDATE … FROM``, after which ``country_mood_latest`` and the
+rollups of the touched range are refreshed – all in one transaction.
+
+Stored spikes are not re-detected; re-run ``scripts/detect_anomalies.py``
+after a write that moves many scores.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Column, MetaData, Table, and_, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.config import get_settings
+from app.core.mood_engine import DEFAULT_PARAMS, MOOD_COLORS, MOOD_LABELS, MoodParams
+from app.core.mood_model import MoodModel
+from app.db import dialects
+from app.db.models import CountryMood
+from app.db.session import READ_ONLY
+from app.services.mood_cache import invalidate_countries, invalidate_global
+from app.services.model_registry import score_moods
+from app.services.trends_service import TrendsService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+FEATURE_COLUMNS = ["valence", "energy", "danceability", "acousticness", "news_sentiment"]
+FEATURE_FILL = [np.nan, np.nan, 0.5, 0.5, np.nan]  # used for NULLs
+RESULT_COLUMNS = ["mood_score", "mood_label", "color_code", "model_version"]
+
+# Changed rows, created as a temporary table inside the write's transaction
+_staging = MetaData()
+RECOMPUTE_STAGE = Table(
+    "country_mood_recompute",
+    _staging,
+    *[
+        Column(c, CountryMood.__table__.c[c].type)
+        for c in ["country_code", "date", *RESULT_COLUMNS]
+    ],
+    prefixes=["TEMPORARY"],
+)
+
+
+@dataclass
+class RecomputeReport:
+    model_version: str
+    rows: int = 0            # rows re-scored
+    changed: int = 0         # rows whose score, label or model_version differ
+    score_changes: int = 0
+    label_changes: int = 0
+    mean_abs_delta: float = 0.0  # over changed scores
+    max_abs_delta: float = 0.0
+    transitions: Counter = field(default_factory=Counter)  # (old, new) label → rows
+    countries: list[str] = field(default_factory=list)      # with changed rows
+    first: Optional[dt.datetime] = None  # changed date range
+    last: Optional[dt.datetime] = None
+    written: bool = False
+    seconds: float = 0.0
+
+
+class RecomputeService:
+    def __init__(self, db: AsyncSession, cache=None) -> None:
+        self.db = db
+        self.cache = cache
+        self.dialect = dialects.name_of(db)
+
+    async def run(
+        self,
+        params: MoodParams = DEFAULT_PARAMS,
+        write: bool = False,
+        countries: Sequence[str] = (),
+        start: Optional[dt.date] = None,
+        end: Optional[dt.date] = None,
+        model: Optional[MoodModel] = None,
+        batch_size: Optional[int] = None,
+    ) -> RecomputeReport:
+        """Re-score history (optionally only *countries* / days *start* …
+        *end*, inclusive) under *params* and *model* (default: the
+        configured one).  A dry run only reads; ``write=True`` applies the
+        changes and commits.
+        """
+        started = time.perf_counter()
+        batch_size = batch_size or settings.RECOMPUTE_BATCH_SIZE
+        stmt = select(
+            CountryMood.country_code,
+            CountryMood.date,
+            *[getattr(CountryMood, c) for c in FEATURE_COLUMNS + RESULT_COLUMNS],
+        ).where(CountryMood.valence.is_not(None), CountryMood.energy.is_not(None))
+        if countries:
+            stmt = stmt.where(CountryMood.country_code.in_([c.upper() for c in countries]))
+        if start is not None:
+            stmt = stmt.where(CountryMood.date >= dt.datetime.combine(start, dt.time()))
+        if end is not None:
+            stmt = stmt.where(CountryMood.date < dt.datetime.combine(end + dt.timedelta(days=1), dt.time()))
+        stmt = stmt.execution_options(yield_per=batch_size)
+
+        report = RecomputeReport(model_version="")
+        changed_codes: set[str] = set()
+        delta_sum = 0.0
+        conn: Optional[AsyncConnection] = None
+        if write:
+            conn = await self.db.connection()
+            await conn.run_sync(RECOMPUTE_STAGE.create)
+
+        try:
+            if write:
+                result = await conn.stream(stmt)
+            else:
+                result = await self.db.stream(stmt, bind_arguments=READ_ONLY)
+            async for chunk in result.partitions():
+                codes, dates, *columns = zip(*chunk)
+                # Missing danceability / acousticness score as 0.5, like the
+                # ingest and backfill; missing news_sentiment is NaN (none).
+                features = [
+                    np.array([fill if v is None else v for v in col], dtype=float)
+                    for col, fill in zip(columns, FEATURE_FILL)
+                ]
+                old_score = np.array(columns[len(FEATURE_COLUMNS)], dtype=float)
+                old_label = np.array(columns[len(FEATURE_COLUMNS) + 1], dtype=object)
+                old_version = columns[len(FEATURE_COLUMNS) + 3]
+
+                batch = score_moods(*features, model=model, params=params)
+                report.model_version = batch.model_version
+                labels = np.array(MOOD_LABELS, dtype=object)[batch.label_index]
+                score_changed = batch.mood_score != old_score
+                label_changed = labels != old_label
+                changed = score_changed | label_changed | np.array(
+                    [v != batch.model_version for v in old_version], dtype=bool
+                )
+
+                report.rows += len(chunk)
+                report.changed += int(changed.sum())
+                report.score_changes += int(score_changed.sum())
+                report.label_changes += int(label_changed.sum())
+                deltas = np.abs(batch.mood_score - old_score)[score_changed]
+                if deltas.size:
+                    delta_sum += float(deltas.sum())
+                    report.max_abs_delta = max(report.max_abs_delta, float(deltas.max()))
+                report.transitions.update(zip(old_label[label_changed], labels[label_changed]))
+
+                rows = [
+                    (codes[i], dates[i], float(batch.mood_score[i]), labels[i],
+                     str(MOOD_COLORS[batch.label_index[i]]), batch.model_version)
+                    for i in np.flatnonzero(changed).tolist()
+                ]
+                if rows:
+                    changed_codes.update(r[0] for r in rows)
+                    first, last = min(r[1] for r in rows), max(r[1] for r in rows)
+                    report.first = first if report.first is None else min(report.first, first)
+                    report.last = last if report.last is None else max(report.last, last)
+                    if write:
+                        await self._stage(conn, rows)
+                logger.info("Re-scored %d rows (%d changed)", report.rows, report.changed)
+
+            if write and report.changed:
+                await conn.execute(
+                    update(CountryMood)
+                    .values({c: RECOMPUTE_STAGE.c[c] for c in RESULT_COLUMNS})
+                    .where(
+                        and_(
+                            CountryMood.country_code == RECOMPUTE_STAGE.c.country_code,
+                            CountryMood.date == RECOMPUTE_STAGE.c.date,
+                        )
+                    )
+                )
+                await TrendsService(self.db).refresh_derived(
+                    sorted(changed_codes), report.first, report.last
+                )
+        finally:
+            if write:
+                await conn.run_sync(RECOMPUTE_STAGE.drop, checkfirst=True)
+
+        report.model_version = report.model_version or params.version
+        report.countries = sorted(changed_codes)
+        report.mean_abs_delta = round(delta_sum / report.score_changes, 4) if report.score_changes else 0.0
+        if write:
+            await self.db.commit()
+            report.written = True
+            if report.changed:
+                await invalidate_global(self.cache)
+                await invalidate_countries(self.cache, report.countries)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    async def _stage(self, conn: AsyncConnection, rows: list[tuple]) -> None:
+        """Append changed rows to the staging table: binary ``COPY`` on PostgreSQL."""
+        columns = [c.name for c in RECOMPUTE_STAGE.columns]
+        if self.dialect == dialects.POSTGRESQL:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                RECOMPUTE_STAGE.name, records=rows, columns=columns
+            )
+        else:
+            await conn.execute(RECOMPUTE_STAGE.insert(), [dict(zip(columns, r)) for r in rows])
@@ -0,0 +1,120 @@
+"""
+SummaryWorker – generates missing AI summaries off the request path.
+
+/mood/country/{cc} answers immediately with a deterministic fallback summary
+and hands the country to this worker.  A bounded number of jobs fetch
+headlines, call Gemini, persist the result to the latest row and refresh the
+cached entries, so later requests get the AI text straight from the DB.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.api.deps import get_redis
+from app.config import get_settings
+from app.db.instrumentation import query_tag
+from app.db.session import get_session_factory
+from app.models.schemas import CountryDetailResponse
+from app.services.mood_cache import invalidate_global, write_through
+from app.services.news_service import NewsService
+from app.services.trends_service import TrendsService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def fallback_summary(detail: CountryDetailResponse) -> str:
+    """Deterministic, Gemini-free summary for *detail*."""
+    return NewsService._generate_fallback_summary(
+        detail.country_name,
+        detail.mood_label,
+        detail.valence or 0.5,
+        detail.energy or 0.5,
+        detail.top_genre,
+        detail.news_headlines,
+    )
+
+
+class SummaryWorker:
+    """Runs at most *concurrency* summary jobs at once, one per country."""
+
+    def __init__(self, concurrency: int) -> None:
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.GEMINI_API_KEY)
+
+    def is_pending(self, country_code: str) -> bool:
+        return country_code.upper() in self._pending
+
+    def submit(self, detail: CountryDetailResponse) -> bool:
+        """Schedule a summary for *detail*; returns ``True`` if one is pending."""
+        cc = detail.country_code.upper()
+        if not self.enabled:
+            return False
+        if cc in self._pending:
+            return True
+
+        self._pending.add(cc)
+        task = asyncio.create_task(self._run(detail))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._pending.clear()
+
+    async def _run(self, detail: CountryDetailResponse) -> None:
+        cc = detail.country_code.upper()
+        try:
+            async with self._semaphore:
+                await self._generate(cc, detail)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Background summary failed for %s: %s", cc, e)
+        finally:
+            self._pending.discard(cc)
+
+    async def _generate(self, cc: str, detail: CountryDetailResponse) -> None:
+        # Tasks copy the submitting request's context; don't bill its route.
+        query_tag.set("summary_worker")
+        # A fresh NewsService per job: its in-memory caches never go stale.
+        news = NewsService()
+        headlines = detail.news_headlines
+        fetched = None
+        if not headlines:
+            fetched = (await news.fetch_headlines(cc))[:5] or None
+            headlines = fetched
+
+        summary = await news.generate_ai_summary(
+            country_code=cc,
+            country_name=detail.country_name,
+            mood_label=detail.mood_label,
+            valence=detail.valence or 0.5,
+            energy=detail.energy or 0.5,
+            top_track=detail.top_track,
+            top_genre=detail.top_genre,
+            headlines=headlines,
+        )
+        if not summary:
+            return  # no AI summary; leave the row untouched so a later request retries
+
+        cache = await get_redis()
+        async with get_session_factory()() as db:
+            svc = TrendsService(db)
+            await svc.set_news_summary(cc, summary, fetched)
+            await write_through(cache, svc, [cc])
+        await invalidate_global(cache)
+        logger.info("Stored background summary for %s", cc)
+
+
+summary_worker = SummaryWorker(settings.SUMMARY_WORKER_CONCURRENCY)
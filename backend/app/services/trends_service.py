@@ -5,43 +5,75 @@ Reads from the database and is also the write-path after daily ingestion.
 
 from __future__ import annotations
 
+import dataclasses
 import datetime as dt
 import logging
 from typing import Optional
 
-from sqlalchemy import select, desc
+from sqlalchemy import (
+    Date,
+    and_,
+    JSON,
+    cast,
+    delete,
+    desc,
+    exists,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.db.models import CountryMood, MoodSpike
-from app.models.schemas import MoodTrendPoint
+from app.core.spike_detector import RollingState
+from app.db import dialects
+from app.db.models import (
+    CountryMood,
+    CountryMoodLatest,
+    CountryMoodRollup,
+    CountryNews,
+    MoodSpike,
+    MoodSpikeState,
+)
+from app.db.session import READ_ONLY
+from app.models.schemas import CountryDetailResponse, MoodHistoryPoint, MoodTrendPoint
 
 logger = logging.getLogger(__name__)
 
+UPSERT_BATCH_SIZE = 500
+
+# Columns copied from ``country_mood`` into ``country_mood_latest``
+LATEST_COLUMNS = [
+    c.name for c in CountryMoodLatest.__table__.columns if c.name != "updated_at"
+]
+
+# Mood-row keys that are written to ``country_news`` instead
+NEWS_FIELDS = {"news_headlines": "headlines", "news_summary": "summary"}
+
+# Downsampled resolutions kept in ``country_mood_rollup``
+ROLLUP_RESOLUTIONS = ("week", "month")
+ROLLUP_FEATURES = ("valence", "energy", "danceability", "acousticness")
+# mood_spike_state columns, one per RollingState field
+SPIKE_STATE_FIELDS = tuple(f.name for f in dataclasses.fields(RollingState))
+
+# Built once: a fresh alias per call defeats SQLAlchemy's statement cache.
+_TREND_ALIAS = aliased(CountryMood, name="hist")
+
 
 class TrendsService:
+    """Read methods pass ``READ_ONLY`` so they may be served by a replica;
+    writes (and reads after a write in the same session) use the primary."""
+
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
+        self.dialect = dialects.name_of(db)
 
-    async def get_latest_global(self) -> list[CountryMood]:
+    async def get_latest_global(self) -> list[CountryMoodLatest]:
         """Return the most recent mood row for every country."""
-        subq = (
-            select(
-                CountryMood.country_code,
-                CountryMood.date,
-            )
-            .distinct(CountryMood.country_code)
-            .order_by(CountryMood.country_code, desc(CountryMood.date))
-            .subquery()
-        )
-        stmt = (
-            select(CountryMood)
-            .join(
-                subq,
-                (CountryMood.country_code == subq.c.country_code)
-                & (CountryMood.date == subq.c.date),
-            )
-        )
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(select(CountryMoodLatest), bind_arguments=READ_ONLY)
         return list(result.scalars().all())
 
     async def get_country_trend(
@@ -50,24 +82,52 @@ class TrendsService:
         """Return last *days* mood snapshots for a single country."""
         since = dt.datetime.utcnow() - dt.timedelta(days=days)
         stmt = (
-            select(CountryMood)
+            select(CountryMood.date, CountryMood.mood_score, CountryMood.mood_label)
             .where(
                 CountryMood.country_code == country_code.upper(),
                 CountryMood.date >= since,
             )
             .order_by(CountryMood.date)
         )
-        result = await self.db.execute(stmt)
-        rows = result.scalars().all()
+        result = await self.db.execute(stmt, bind_arguments=READ_ONLY)
         return [
             MoodTrendPoint(
                 date=r.date.date(),
                 mood_score=r.mood_score,
                 mood_label=r.mood_label,
             )
-            for r in rows
+            for r in result
         ]
 
+    async def get_recent_histories(
+        self, country_codes: list[str], days: int, limit: int
+    ) -> dict[str, list]:
+        """Up to *limit* newest mood rows within *days* for each country, oldest
+        first, in one windowed query.
+
+        Used by the ingest right after it writes, so it reads the primary.
+        """
+        since = dt.datetime.utcnow() - dt.timedelta(days=days)
+        rn = (
+            func.row_number()
+            .over(partition_by=CountryMood.country_code, order_by=desc(CountryMood.date))
+            .label("rn")
+        )
+        recent = (
+            select(CountryMood.country_code, CountryMood.date, CountryMood.mood_score, CountryMood.mood_label, rn)
+            .where(CountryMood.country_code.in_(country_codes), CountryMood.date >= since)
+            .subquery("recent")
+        )
+        stmt = (
+            select(recent.c.country_code, recent.c.date, recent.c.mood_score, recent.c.mood_label)
+            .where(recent.c.rn <= limit)
+            .order_by(recent.c.country_code, recent.c.date)
+        )
+        histories: dict[str, list] = {}
+        for row in await self.db.execute(stmt):
+            histories.setdefault(row.country_code, []).append(row._mapping)
+        return histories
+
     async def get_latest_country(self, country_code: str) -> Optional[CountryMood]:
         stmt = (
             select(CountryMood)
@@ -75,12 +135,205 @@ class TrendsService:
             .order_by(desc(CountryMood.date))
             .limit(1)
         )
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(stmt, bind_arguments=READ_ONLY)
         return result.scalar_one_or_none()
 
+    async def get_country_detail(
+        self, country_code: str, days: int = 7
+    ) -> Optional[CountryDetailResponse]:
+        """Latest row, *days*-day trend and active-spike flag in ONE statement.
+
+        The trend is aggregated server-side from the three columns it needs
+        and the spike flag is an ``EXISTS`` probe, both evaluated as scalar
+        subqueries next to the latest row; news text is outer-joined from
+        ``country_news`` for that row's day.
+        """
+        if self.dialect != dialects.POSTGRESQL:
+            # No ordered JSON aggregate elsewhere; the set-based path is fine.
+            return (await self.get_country_details([country_code], days)).get(country_code.upper())
+
+        cc = country_code.upper()
+        now = dt.datetime.utcnow()
+        hist = _TREND_ALIAS
+
+        trend = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_array(
+                                cast(hist.date, Date),
+                                hist.mood_score,
+                                hist.mood_label,
+                            ),
+                            hist.date,
+                        ),
+                        type_=JSON,
+                    ),
+                    literal_column("'[]'::json"),
+                )
+            )
+            .where(
+                hist.country_code == cc,
+                hist.date >= now - dt.timedelta(days=days),
+            )
+            .scalar_subquery()
+        )
+        spike = exists().where(
+            MoodSpike.country_code == cc,
+            MoodSpike.detected_at >= spike_active_since(now),
+        )
+        stmt = (
+            select(
+                CountryMoodLatest,
+                CountryNews.headlines,
+                CountryNews.summary,
+                trend.label("trend"),
+                spike.label("spike_active"),
+            )
+            .outerjoin(CountryNews, _latest_news_join())
+            .where(CountryMoodLatest.country_code == cc)
+        )
+        result = await self.db.execute(stmt, bind_arguments=READ_ONLY)
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        latest, headlines, summary, trend_rows, spike_active = row
+        return _to_detail(
+            latest,
+            [
+                MoodTrendPoint(date=d, mood_score=score, mood_label=label)
+                for d, score, label in trend_rows or []
+            ],
+            bool(spike_active),
+            headlines,
+            summary,
+        )
+
+    async def get_country_details(
+        self, country_codes: list[str], days: int = 7
+    ) -> dict[str, CountryDetailResponse]:
+        """Set-based variant of :meth:`get_country_detail` for many countries.
+
+        Three statements regardless of how many countries are requested:
+        latest rows, trend points and spike flags, each grouped by
+        ``country_code``.  Countries without data are absent from the result.
+        """
+        codes = [cc.upper() for cc in country_codes]
+        if not codes:
+            return {}
+        now = dt.datetime.utcnow()
+
+        latest_stmt = (
+            select(CountryMoodLatest, CountryNews.headlines, CountryNews.summary)
+            .outerjoin(CountryNews, _latest_news_join())
+            .where(CountryMoodLatest.country_code.in_(codes))
+        )
+        latest_rows = (await self.db.execute(latest_stmt, bind_arguments=READ_ONLY)).all()
+        if not latest_rows:
+            return {}
+
+        trend_stmt = (
+            select(
+                CountryMood.country_code,
+                dialects.day(self.dialect, CountryMood.date),
+                CountryMood.mood_score,
+                CountryMood.mood_label,
+            )
+            .where(
+                CountryMood.country_code.in_(codes),
+                CountryMood.date >= now - dt.timedelta(days=days),
+            )
+            .order_by(CountryMood.country_code, CountryMood.date)
+        )
+        trends: dict[str, list[MoodTrendPoint]] = {}
+        for cc, d, score, label in await self.db.execute(trend_stmt, bind_arguments=READ_ONLY):
+            trends.setdefault(cc, []).append(
+                MoodTrendPoint(date=d, mood_score=score, mood_label=label)
+            )
+
+        spike_stmt = (
+            select(MoodSpike.country_code)
+            .where(
+                MoodSpike.country_code.in_(codes),
+                MoodSpike.detected_at >= spike_active_since(now),
+            )
+            .distinct()
+        )
+        spiking = set((await self.db.execute(spike_stmt, bind_arguments=READ_ONLY)).scalars().all())
+
+        return {
+            r.country_code: _to_detail(
+                r, trends.get(r.country_code, []), r.country_code in spiking, headlines, summary
+            )
+            for r, headlines, summary in latest_rows
+        }
+
+    async def get_country_history(
+        self, country_code: str, days: int, resolution: str = "day"
+    ) -> list[MoodHistoryPoint]:
+        """Mood history over the last *days* days at *resolution*.
+
+        ``day`` reads raw ``country_mood`` rows; ``week`` and ``month`` read
+        the pre-aggregated ``country_mood_rollup`` so a year of history is
+        ~52 or ~12 rows.
+        """
+        cc = country_code.upper()
+        since = dt.datetime.utcnow() - dt.timedelta(days=days)
+
+        if resolution == "day":
+            stmt = (
+                select(
+                    CountryMood.date,
+                    CountryMood.mood_score,
+                    CountryMood.mood_label,
+                    *[getattr(CountryMood, f) for f in ROLLUP_FEATURES],
+                )
+                .where(CountryMood.country_code == cc, CountryMood.date >= since)
+                .order_by(CountryMood.date)
+            )
+            return [
+                MoodHistoryPoint(
+                    period_start=r.date.date(),
+                    mood_score=r.mood_score,
+                    mood_score_min=r.mood_score,
+                    mood_score_max=r.mood_score,
+                    mood_label=r.mood_label,
+                    samples=1,
+                    **{f: getattr(r, f) for f in ROLLUP_FEATURES},
+                )
+                for r in await self.db.execute(stmt, bind_arguments=READ_ONLY)
+            ]
+
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution!r}")
+        stmt = (
+            select(CountryMoodRollup)
+            .where(
+                CountryMoodRollup.country_code == cc,
+                CountryMoodRollup.resolution == resolution,
+                CountryMoodRollup.period_start >= period_start(since, resolution),
+            )
+            .order_by(CountryMoodRollup.period_start)
+        )
+        result = await self.db.execute(stmt, bind_arguments=READ_ONLY)
+        return [
+            MoodHistoryPoint(
+                period_start=r.period_start.date(),
+                mood_score=r.mood_score_mean,
+                mood_score_min=r.mood_score_min,
+                mood_score_max=r.mood_score_max,
+                mood_label=r.dominant_label,
+                samples=r.sample_count,
+                **{f: getattr(r, f) for f in ROLLUP_FEATURES},
+            )
+            for r in result.scalars().all()
+        ]
+
     async def has_active_spike(self, country_code: str) -> bool:
         """Check if a spike was detected in the last 24 hours."""
-        since = dt.datetime.utcnow() - dt.timedelta(hours=24)
+        since = spike_active_since(dt.datetime.utcnow())
         stmt = (
             select(MoodSpike)
             .where(
@@ -89,25 +342,253 @@ class TrendsService:
             )
             .limit(1)
         )
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(stmt, bind_arguments=READ_ONLY)
         return result.scalar_one_or_none() is not None
 
     async def get_recent_spikes(self, limit: int = 20) -> list[MoodSpike]:
         stmt = (
             select(MoodSpike)
-            .order_by(desc(MoodSpike.detected_at))
+            .order_by(desc(MoodSpike.detected_at), desc(MoodSpike.id))
             .limit(limit)
         )
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(stmt, bind_arguments=READ_ONLY)
         return list(result.scalars().all())
 
     async def upsert_mood(self, data: dict) -> CountryMood:
         """Insert or update a daily mood row."""
-        row = CountryMood(**data)
-        self.db.add(row)
+        rows = await self.upsert_moods([data])
+        return rows[0]
+
+    async def upsert_moods(
+        self, rows: list[dict], batch_size: int = UPSERT_BATCH_SIZE
+    ) -> list[CountryMood]:
+        """Idempotently write many daily mood rows.
+
+        ``date`` is normalized to the start of its calendar day (UTC) so the
+        ``uq_country_date`` constraint keeps exactly one row per country per
+        day.  Each batch is a single ``INSERT … ON CONFLICT DO UPDATE`` and
+        the whole call commits once.  ``news_headlines`` / ``news_summary``
+        keys are split off into ``country_news``.
+        """
+        if not rows:
+            return []
+
+        # Last write wins within the call; ON CONFLICT cannot touch a row twice.
+        records: dict[tuple[str, dt.datetime], dict] = {}
+        news: list[dict] = []
+        for data in rows:
+            record = {**data, "date": day_start(data.get("date") or dt.datetime.utcnow())}
+            item = {field: record.pop(key, None) for key, field in NEWS_FIELDS.items()}
+            if any(item.values()):
+                news.append({"country_code": record["country_code"], "day": record["date"], **item})
+            records[(record["country_code"], record["date"])] = record
+        columns = sorted({key for record in records.values() for key in record})
+        values = [{c: record.get(c) for c in columns} for record in records.values()]
+
+        stored: list[CountryMood] = []
+        for i in range(0, len(values), batch_size):
+            stmt = dialects.insert(self.dialect, CountryMood).values(values[i : i + batch_size])
+            update_cols = {
+                c: stmt.excluded[c] for c in columns if c not in ("country_code", "date")
+            }
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CountryMood.country_code, CountryMood.date],
+                set_=update_cols,
+            ).returning(CountryMood)
+            result = await self.db.scalars(
+                stmt, execution_options={"populate_existing": True}
+            )
+            stored.extend(result.all())
+
+        await self._upsert_news(news, batch_size)
+        await self._refresh_latest(stored)
+        await self._refresh_rollups(stored)
+        await self.db.commit()
+        return stored
+
+    async def _upsert_news(self, rows: list[dict], batch_size: int = UPSERT_BATCH_SIZE) -> None:
+        """Bulk-write ``country_news``, keeping stored text a recompute lacks."""
+        records = {(r["country_code"], r["day"]): r for r in rows}
+        values = list(records.values())
+        for i in range(0, len(values), batch_size):
+            stmt = dialects.insert(self.dialect, CountryNews).values(values[i : i + batch_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CountryNews.country_code, CountryNews.day],
+                set_={
+                    "headlines": func.coalesce(stmt.excluded.headlines, CountryNews.headlines),
+                    "summary": func.coalesce(stmt.excluded.summary, CountryNews.summary),
+                    "updated_at": func.now(),
+                },
+            )
+            await self.db.execute(stmt)
+
+    async def _refresh_latest(self, rows: list[CountryMood]) -> None:
+        """Fold freshly written history rows into ``country_mood_latest``.
+
+        Only moves a country's entry forward (or rewrites the same day), so
+        backfilling older days never clobbers a newer snapshot.
+        """
+        newest: dict[str, CountryMood] = {}
+        for row in rows:
+            current = newest.get(row.country_code)
+            if current is None or row.date >= current.date:
+                newest[row.country_code] = row
+        if not newest:
+            return
+
+        values = [
+            {c: getattr(row, c) for c in LATEST_COLUMNS} for row in newest.values()
+        ]
+        stmt = dialects.insert(self.dialect, CountryMoodLatest).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CountryMoodLatest.country_code],
+            set_={
+                **{c: stmt.excluded[c] for c in LATEST_COLUMNS if c != "country_code"},
+                "updated_at": func.now(),
+            },
+            where=CountryMoodLatest.date <= stmt.excluded.date,
+        )
+        await self.db.execute(stmt)
+
+    async def _refresh_rollups(self, rows: list[CountryMood]) -> None:
+        """Recompute the week/month rollups covering freshly written rows.
+
+        Only the periods touched by *rows* are re-aggregated from history,
+        so a daily ingest re-reads at most one week and one month per
+        country.
+        """
+        if not rows:
+            return
+        await self._refresh_rollup_range(
+            sorted({r.country_code for r in rows}),
+            min(r.date for r in rows),
+            max(r.date for r in rows),
+        )
+
+    async def _refresh_rollup_range(
+        self, codes: list[str], first: dt.datetime, last: dt.datetime
+    ) -> None:
+        for resolution in ROLLUP_RESOLUTIONS:
+            await self.db.execute(
+                _rollup_upsert(
+                    self.dialect,
+                    resolution,
+                    CountryMood.country_code.in_(codes),
+                    CountryMood.date >= period_start(first, resolution),
+                    CountryMood.date < period_end(last, resolution),
+                )
+            )
+
+    async def refresh_derived(
+        self, codes: list[str], first: dt.datetime, last: dt.datetime
+    ) -> None:
+        """Bring ``country_mood_latest`` and the rollups up to date after a
+        set-based write of *codes*' history between *first* and *last*.
+
+        Like ``upsert_moods``, only moves a latest entry forward; does not
+        commit.
+        """
+        if not codes:
+            return
+        expected = _latest_from_history(self.dialect, CountryMood.country_code.in_(codes))
+        stmt = dialects.insert(self.dialect, CountryMoodLatest).from_select(
+            LATEST_COLUMNS, select(*[expected.c[c] for c in LATEST_COLUMNS]).where(true())
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CountryMoodLatest.country_code],
+            set_={
+                **{c: stmt.excluded[c] for c in LATEST_COLUMNS if c != "country_code"},
+                "updated_at": func.now(),
+            },
+            where=CountryMoodLatest.date <= stmt.excluded.date,
+        )
+        await self.db.execute(stmt)
+        await self._refresh_rollup_range(codes, first, last)
+
+    async def rebuild_rollups(self) -> int:
+        """Recompute every rollup from history in one transaction.
+
+        Periods whose history has been dropped by retention are kept.
+        """
+        for resolution in ROLLUP_RESOLUTIONS:
+            await self.db.execute(_rollup_upsert(self.dialect, resolution))
+        await self.db.commit()
+        return await self.db.scalar(select(func.count()).select_from(CountryMoodRollup))
+
+    async def check_latest(self) -> dict[str, int]:
+        """Compare ``country_mood_latest`` with what history says it should be.
+
+        Returns counts of ``missing`` countries, ``stale`` entries (date or
+        score differ from the newest history row) and ``orphaned`` entries
+        with no history at all.
+        """
+        expected = _latest_from_history(self.dialect)
+        missing = await self.db.scalar(
+            select(func.count())
+            .select_from(expected)
+            .where(
+                ~exists().where(CountryMoodLatest.country_code == expected.c.country_code)
+            )
+        )
+        stale = await self.db.scalar(
+            select(func.count())
+            .select_from(expected)
+            .join(CountryMoodLatest, CountryMoodLatest.country_code == expected.c.country_code)
+            .where(
+                (CountryMoodLatest.date != expected.c.date)
+                | (CountryMoodLatest.mood_score != expected.c.mood_score)
+            )
+        )
+        orphaned = await self.db.scalar(
+            select(func.count())
+            .select_from(CountryMoodLatest)
+            .where(~exists().where(CountryMood.country_code == CountryMoodLatest.country_code))
+        )
+        return {"missing": missing or 0, "stale": stale or 0, "orphaned": orphaned or 0}
+
+    async def rebuild_latest(self) -> int:
+        """Recompute ``country_mood_latest`` from history in one transaction."""
+        expected = _latest_from_history(self.dialect)
+        stmt = dialects.insert(self.dialect, CountryMoodLatest).from_select(
+            # WHERE true: SQLite needs it to parse an upsert from a SELECT.
+            LATEST_COLUMNS, select(*[expected.c[c] for c in LATEST_COLUMNS]).where(true())
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CountryMoodLatest.country_code],
+            set_={
+                **{c: stmt.excluded[c] for c in LATEST_COLUMNS if c != "country_code"},
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(
+            delete(CountryMoodLatest).where(
+                ~exists().where(CountryMood.country_code == CountryMoodLatest.country_code)
+            )
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+        return await self.db.scalar(select(func.count()).select_from(CountryMoodLatest))
+
+    async def set_news_summary(
+        self,
+        country_code: str,
+        summary: str,
+        headlines: Optional[list[str]] = None,
+    ) -> None:
+        """Attach an AI summary (and headlines, if given) to the latest day."""
+        cc = country_code.upper()
+        latest_date = await self.db.scalar(
+            select(CountryMoodLatest.date).where(CountryMoodLatest.country_code == cc)
+        )
+        if latest_date is None:
+            return
+        await self._upsert_news([{
+            "country_code": cc,
+            "day": latest_date,
+            "headlines": headlines or None,
+            "summary": summary,
+        }])
         await self.db.commit()
-        await self.db.refresh(row)
-        return row
 
     async def insert_spike(self, data: dict) -> MoodSpike:
         row = MoodSpike(**data)
@@ -115,3 +596,216 @@ class TrendsService:
         await self.db.commit()
         await self.db.refresh(row)
         return row
+
+    async def get_spike_states(self, country_codes: list[str]) -> dict[str, RollingState]:
+        """Streaming spike-detector state for the given countries (primary)."""
+        result = await self.db.scalars(
+            select(MoodSpikeState).where(MoodSpikeState.country_code.in_(country_codes))
+        )
+        return {
+            row.country_code: RollingState(**{f: getattr(row, f) for f in SPIKE_STATE_FIELDS})
+            for row in result
+        }
+
+    async def save_spike_states(self, states: list[RollingState]) -> None:
+        if not states:
+            return
+        values = [{f: getattr(s, f) for f in SPIKE_STATE_FIELDS} for s in states]
+        stmt = dialects.insert(self.dialect, MoodSpikeState).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MoodSpikeState.country_code],
+            set_={
+                **{c: stmt.excluded[c] for c in values[0] if c != "country_code"},
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def insert_spikes(self, rows: list[dict]) -> list[MoodSpike]:
+        """Insert many spikes in one statement; returns the newly stored rows.
+
+        Spikes already recorded for the same country, day and detector (e.g.
+        by an earlier run that day) are skipped, so they are not returned
+        and not published again.
+        """
+        if not rows:
+            return []
+        stmt = dialects.insert(self.dialect, MoodSpike).on_conflict_do_nothing(
+            index_elements=[MoodSpike.country_code, MoodSpike.detected_at, MoodSpike.detector]
+        )
+        result = await self.db.scalars(stmt.returning(MoodSpike), rows)
+        spikes = list(result.all())
+        await self.db.commit()
+        return spikes
+
+
+def _latest_from_history(dialect: str, *where):
+    """Newest history row per country, as a subquery."""
+    columns = [getattr(CountryMood, c) for c in LATEST_COLUMNS]
+    if dialect == dialects.POSTGRESQL:
+        return (
+            select(*columns)
+            .where(*where)
+            .distinct(CountryMood.country_code)
+            .order_by(CountryMood.country_code, desc(CountryMood.date))
+            .subquery("expected")
+        )
+    ranked = select(
+        *columns,
+        func.row_number()
+        .over(partition_by=CountryMood.country_code, order_by=desc(CountryMood.date))
+        .label("rank"),
+    ).where(*where).subquery("ranked")
+    return (
+        select(*[ranked.c[c] for c in LATEST_COLUMNS])
+        .where(ranked.c.rank == 1)
+        .subquery("expected")
+    )
+
+
+def _rollup_upsert(dialect: str, resolution: str, *where):
+    """``INSERT … SELECT … GROUP BY`` of history into ``country_mood_rollup``.
+
+    The dominant label is the most frequent one in the period (ties go to
+    the alphabetically first), picked with a window over per-label counts.
+    """
+    src = (
+        select(
+            CountryMood.country_code,
+            dialects.truncate(dialect, CountryMood.date, resolution).label("period_start"),
+            CountryMood.mood_label,
+            CountryMood.mood_score,
+            *[getattr(CountryMood, f) for f in ROLLUP_FEATURES],
+        )
+        .where(*where)
+        .cte("src")
+    )
+    labels = (
+        select(
+            src.c.country_code,
+            src.c.period_start,
+            src.c.mood_label,
+            func.row_number()
+            .over(
+                partition_by=(src.c.country_code, src.c.period_start),
+                order_by=(func.count().desc(), src.c.mood_label),
+            )
+            .label("rank"),
+        )
+        .group_by(src.c.country_code, src.c.period_start, src.c.mood_label)
+        .subquery("labels")
+    )
+    source = (
+        select(
+            src.c.country_code,
+            literal(resolution),
+            src.c.period_start,
+            func.count(),
+            func.avg(src.c.mood_score),
+            func.min(src.c.mood_score),
+            func.max(src.c.mood_score),
+            labels.c.mood_label,
+            *[func.avg(src.c[f]) for f in ROLLUP_FEATURES],
+        )
+        .join(
+            labels,
+            and_(
+                labels.c.country_code == src.c.country_code,
+                labels.c.period_start == src.c.period_start,
+            ),
+        )
+        # The WHERE also keeps SQLite's upsert-from-SELECT parse unambiguous.
+        .where(labels.c.rank == 1)
+        .group_by(src.c.country_code, src.c.period_start, labels.c.mood_label)
+    )
+    columns = [
+        "country_code",
+        "resolution",
+        "period_start",
+        "sample_count",
+        "mood_score_mean",
+        "mood_score_min",
+        "mood_score_max",
+        "dominant_label",
+        *ROLLUP_FEATURES,
+    ]
+    stmt = dialects.insert(dialect, CountryMoodRollup).from_select(columns, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            CountryMoodRollup.country_code,
+            CountryMoodRollup.resolution,
+            CountryMoodRollup.period_start,
+        ],
+        set_={
+            **{c: stmt.excluded[c] for c in columns[3:]},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def _latest_news_join():
+    """``country_news`` row for the day held in ``country_mood_latest``."""
+    return and_(
+        CountryNews.country_code == CountryMoodLatest.country_code,
+        CountryNews.day == CountryMoodLatest.date,
+    )
+
+
+def day_start(value: dt.date) -> dt.datetime:
+    """Midnight at the start of *value*'s calendar day (naive UTC)."""
+    return dt.datetime(value.year, value.month, value.day)
+
+
+def spike_active_since(now: dt.datetime) -> dt.datetime:
+    """Spikes are stamped with the start of their day; one counts as
+    active if its day overlaps the last 24 hours."""
+    return day_start(now - dt.timedelta(hours=24))
+
+
+def period_start(value: dt.date, resolution: str) -> dt.datetime:
+    """Start of the ``date_trunc`` period containing *value* (ISO weeks)."""
+    start = day_start(value)
+    if resolution == "week":
+        return start - dt.timedelta(days=start.weekday())
+    if resolution == "month":
+        return start.replace(day=1)
+    return start
+
+
+def period_end(value: dt.date, resolution: str) -> dt.datetime:
+    """Exclusive end of the period containing *value*."""
+    start = period_start(value, resolution)
+    if resolution == "week":
+        return start + dt.timedelta(days=7)
+    if resolution == "month":
+        return (start + dt.timedelta(days=32)).replace(day=1)
+    return start + dt.timedelta(days=1)
+
+
+def _to_detail(
+    latest: CountryMoodLatest,
+    trend: list[MoodTrendPoint],
+    spike_active: bool,
+    headlines: Optional[list[str]] = None,
+    summary: Optional[str] = None,
+) -> CountryDetailResponse:
+    return CountryDetailResponse(
+        country_code=latest.country_code,
+        country_name=latest.country_name,
+        mood_score=latest.mood_score,
+        mood_label=latest.mood_label,
+        color_code=latest.color_code,
+        valence=latest.valence,
+        energy=latest.energy,
+        danceability=latest.danceability,
+        acousticness=latest.acousticness,
+        top_genre=latest.top_genre,
+        top_track=latest.top_track,
+        news_sentiment=latest.news_sentiment,
+        news_headlines=headlines,
+        news_summary=summary,
+        trend=trend,
+        spike_active=spike_active,
+    )
+
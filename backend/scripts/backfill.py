@@ -0,0 +1,77 @@
+"""
+Bulk backfill of country mood history from CSV / Parquet files.
+
+Each file holds one row per country per day of raw inputs:
+
+    country_code, date, valence, energy            (required)
+    danceability, acousticness, news_sentiment,
+    country_name, top_genre, top_track,
+    headlines (JSON list or "|"-separated), summary (optional)
+
+Rows are scored with the configured mood model, COPYed into staging tables and merged
+into country_mood / country_news with one set-based upsert; spikes are
+re-detected over the loaded range.  Re-running the same files is
+idempotent.
+
+Usage:
+    python scripts/backfill.py history_2024.parquet
+    python scripts/backfill.py charts/*.csv --batch-size 50000 --no-spikes
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.api.deps import get_redis
+from app.db.models import Base
+from app.db.session import get_engine, get_session_factory
+from app.services.backfill_service import BACKFILL_BATCH_SIZE, BackfillService, read_frames
+from app.services.mood_cache import invalidate_countries, invalidate_global
+
+engine = get_engine("ingest")
+async_session_factory = get_session_factory("ingest")
+
+
+def _frames(paths: list[str], batch_size: int):
+    for path in paths:
+        print(f"   • {path}")
+        yield from read_frames(path, batch_size)
+
+
+async def main(paths: list[str], batch_size: int, spikes: bool) -> int:
+    print(f"📥 Backfilling {len(paths)} file(s)")
+    print("=" * 60)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_session_factory() as db:
+            report = await BackfillService(db).load(_frames(paths, batch_size), spikes=spikes)
+    finally:
+        await engine.dispose()
+
+    if not report.rows:
+        print("\n⚠️  No rows loaded")
+        return 1
+    print(
+        f"\n✅ {report.rows} mood rows for {len(report.countries)} countries "
+        f"({report.first:%Y-%m-%d} … {report.last:%Y-%m-%d}), "
+        f"{report.news} news rows, {report.spikes} new spikes in {report.seconds:.1f}s"
+    )
+
+    redis = await get_redis()
+    await invalidate_global(redis)
+    await invalidate_countries(redis, report.countries)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help=".csv or .parquet files")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="rows read, scored and copied per batch")
+    parser.add_argument("--no-spikes", action="store_true", help="skip spike re-detection")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.paths, args.batch_size, not args.no_spikes)))
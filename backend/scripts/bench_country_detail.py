@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: country detail lookup.
+
+Compares the old three-query path (get_latest_country + get_country_trend +
+has_active_spike) with the single-statement TrendsService.get_country_detail
+against the configured database.
+
+Usage:
+    python scripts/bench_country_detail.py [iterations] [COUNTRY ...]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.db.session import get_engine, get_session_factory
+from app.services.trends_service import TrendsService
+
+engine = get_engine("scripts")
+async_session_factory = get_session_factory("scripts")
+
+DEFAULT_COUNTRIES = ["US", "GB", "DE", "FR", "JP", "BR", "TR", "IN"]
+
+
+async def three_queries(svc: TrendsService, cc: str) -> None:
+    latest = await svc.get_latest_country(cc)
+    if latest:
+        await svc.get_country_trend(cc)
+        await svc.has_active_spike(cc)
+
+
+async def single_statement(svc: TrendsService, cc: str) -> None:
+    await svc.get_country_detail(cc)
+
+
+async def measure(label: str, fn, countries: list[str], iterations: int) -> list[float]:
+    timings: list[float] = []
+    async with async_session_factory() as db:
+        svc = TrendsService(db)
+        # Warm-up: connection checkout, statement preparation
+        for cc in countries:
+            await fn(svc, cc)
+        for _ in range(iterations):
+            for cc in countries:
+                start = time.perf_counter()
+                await fn(svc, cc)
+                timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"   • {label:<18} mean {statistics.mean(timings):7.3f} ms"
+        f"   p50 {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms"
+    )
+
+
+async def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    countries = [c.upper() for c in sys.argv[2:]] or DEFAULT_COUNTRIES
+
+    print("⏱️  Country detail micro-benchmark")
+    print("=" * 60)
+    print(f"📍 {iterations} iterations × {len(countries)} countries")
+
+    old = await measure("three queries", three_queries, countries, iterations)
+    new = await measure("single statement", single_statement, countries, iterations)
+
+    report("three queries", old)
+    report("single statement", new)
+    print(f"\n🚀 Speed-up (mean): {statistics.mean(old) / statistics.mean(new):.2f}×")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
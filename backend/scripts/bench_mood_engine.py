@@ -0,0 +1,77 @@
+"""
+Micro-benchmark: scalar compute_mood vs vectorized compute_moods.
+
+Scores the same random rows both ways (about a third without news
+sentiment, plus rows on the classification boundaries), reports rows per
+second and checks that every score, label and color matches exactly.
+
+Usage:
+    python scripts/bench_mood_engine.py [rows]        # default 1,000,000
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.mood_engine import compute_mood, compute_moods
+
+
+def make_rows(n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    cols = {
+        "valence": rng.random(n),
+        "energy": rng.random(n),
+        "danceability": rng.random(n),
+        "acousticness": rng.random(n),
+        "news_sentiment": rng.uniform(-1, 1, n),
+    }
+    cols["news_sentiment"][rng.random(n) < 0.3] = np.nan
+    # Exercise the branch edges: valence 0.45 flips the energy sign,
+    # ±0.15 news and 0.4 / 0.5 / 0.55 / 0.6 energy split the near-zero zone.
+    edge = n // 100
+    cols["valence"][:edge] = rng.choice([0.4, 0.45, 0.5], edge)
+    cols["energy"][edge : 2 * edge] = rng.choice([0.5, 0.55, 0.6], edge)
+    cols["news_sentiment"][2 * edge : 3 * edge] = rng.choice([-0.15, 0.15], edge)
+    return cols
+
+
+def main(n: int) -> int:
+    cols = make_rows(n)
+    print(f"🧮 Scoring {n:,} rows")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    batch = compute_moods(**cols)
+    vector_s = time.perf_counter() - start
+    print(f"   compute_moods   {vector_s * 1000:9.1f} ms   {n / vector_s:14,.0f} rows/s")
+
+    rows = zip(*(cols[c].tolist() for c in ("valence", "energy", "danceability", "acousticness", "news_sentiment")))
+    start = time.perf_counter()
+    scalar = [
+        compute_mood(v, e, d, a, None if np.isnan(s) else s)
+        for v, e, d, a, s in rows
+    ]
+    scalar_s = time.perf_counter() - start
+    print(f"   compute_mood    {scalar_s * 1000:9.1f} ms   {n / scalar_s:14,.0f} rows/s")
+    print(f"   speed-up        {scalar_s / vector_s:9.1f}×")
+
+    mismatches = sum(
+        (r.mood_score, r.mood_label, r.color_code) != (score, label, color)
+        for r, score, label, color in zip(
+            scalar, batch.mood_score.tolist(), batch.mood_label.tolist(), batch.color_code.tolist()
+        )
+    )
+    if mismatches:
+        print(f"\n❌ {mismatches} rows differ from compute_mood")
+        return 1
+    print("\n✅ All rows match compute_mood exactly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
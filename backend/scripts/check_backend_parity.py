@@ -0,0 +1,204 @@
+"""
+Storage backend parity check: PostgreSQL vs embedded SQLite.
+
+Loads the same deterministic history into both backends through
+TrendsService and compares every read the API serves (global list, trends,
+details, history at each resolution, spikes, latest/rollup maintenance).
+Each backend must also agree with itself: country_mood_latest matches the
+history, and the incremental rollups match a full rebuild.  Exits 1 on any
+difference.
+
+Without a PostgreSQL URL (--postgres-url or PARITY_POSTGRES_URL) only the
+SQLite half runs, so the self-checks still gate CI without a server.  The
+PostgreSQL URL must point at a scratch database: its tables are dropped and
+recreated.
+
+Usage:
+    python scripts/check_backend_parity.py
+    python scripts/check_backend_parity.py --postgres-url postgresql+asyncpg://…/worldmood_ci
+    python scripts/check_backend_parity.py --postgres-url … --sqlite-path /tmp/parity.db
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import dialects
+from app.db.models import Base, CountryMoodRollup
+from app.db.partitions import ensure_partitions
+from app.services.trends_service import TrendsService, day_start
+
+COUNTRIES = ["US", "GB", "DE", "FR", "JP"]
+LABELS = ["Happy", "Calm", "Sad", "Anxious", "Angry"]
+HISTORY_DAYS = 120
+
+
+def build_history(seed: int = 7) -> tuple[list[dict], list[dict]]:
+    rng = random.Random(seed)
+    today = day_start(dt.datetime.utcnow())
+    rows = [
+        {
+            "country_code": cc,
+            "country_name": cc,
+            "date": today - dt.timedelta(days=d),
+            "mood_score": round(rng.uniform(-1, 1), 4),
+            "mood_label": rng.choice(LABELS),
+            "color_code": "#123456",
+            "valence": round(rng.random(), 4),
+            "energy": round(rng.random(), 4),
+            "danceability": round(rng.random(), 4),
+            "acousticness": None if d % 5 == 0 else round(rng.random(), 4),
+            "news_headlines": [f"{cc} headline {d}"] if d % 3 == 0 else None,
+            "news_summary": f"{cc} summary {d}" if d % 4 == 0 else None,
+        }
+        for cc in COUNTRIES
+        for d in range(HISTORY_DAYS)
+    ]
+    spikes = [
+        {
+            "country_code": cc,
+            "detected_at": today - dt.timedelta(hours=hours),
+            "previous_label": "Happy",
+            "new_label": "Sad",
+            "delta": -0.4,
+            "reason": "parity",
+        }
+        for cc, hours in (("US", 2), ("GB", 30), ("JP", 5))
+    ]
+    return rows, spikes
+
+
+def normalize(value):
+    """Round floats and sort unordered collections so backends compare equal."""
+    if isinstance(value, float):
+        return round(value, 9)
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items() if k not in ("id", "updated_at", "created_at")}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    if hasattr(value, "model_dump"):
+        return normalize(value.model_dump())
+    if hasattr(value, "__table__"):
+        return normalize({c.name: getattr(value, c.key) for c in value.__table__.columns})
+    return value
+
+
+async def rollup_rows(db) -> list[dict]:
+    result = await db.execute(CountryMoodRollup.__table__.select())
+    return sorted(
+        normalize([dict(row) for row in result.mappings()]),
+        key=lambda r: (r["country_code"], r["resolution"], str(r["period_start"])),
+    )
+
+
+async def collect(url: str) -> dict:
+    engine = create_async_engine(url)
+    if engine.dialect.name == dialects.SQLITE:
+        dialects.configure_sqlite(engine)
+    rows, spikes = build_history()
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            await ensure_partitions(conn, since=dt.date.today() - dt.timedelta(days=HISTORY_DAYS + 31))
+
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            svc = TrendsService(db)
+            # Two passes: the second rewrites the newest week, exercising
+            # the upsert, news-coalesce and incremental rollup paths.
+            await svc.upsert_moods(rows)
+            await svc.upsert_moods([
+                {**r, "mood_score": -r["mood_score"], "news_summary": None}
+                for r in rows if r["date"] >= rows[0]["date"] - dt.timedelta(days=6)
+            ])
+            for spike in spikes:
+                await svc.insert_spike(spike)
+
+            out = {
+                "global": sorted(normalize(await svc.get_latest_global()), key=lambda r: r["country_code"]),
+                "latest_check": await svc.check_latest(),
+                "spikes": normalize(await svc.get_recent_spikes()),
+                "active": {cc: await svc.has_active_spike(cc) for cc in COUNTRIES},
+                "details": normalize(await svc.get_country_details(COUNTRIES, 14)),
+            }
+            for cc in COUNTRIES:
+                out[f"trend:{cc}"] = normalize(await svc.get_country_trend(cc, 14))
+                out[f"latest:{cc}"] = normalize(await svc.get_latest_country(cc))
+                out[f"detail:{cc}"] = normalize(await svc.get_country_detail(cc, 7))
+                for resolution in ("day", "week", "month"):
+                    out[f"history:{cc}:{resolution}"] = normalize(
+                        await svc.get_country_history(cc, 365, resolution)
+                    )
+            incremental = await rollup_rows(db)
+            await svc.rebuild_rollups()
+            rebuilt = await rollup_rows(db)
+            out["rollups"] = rebuilt
+            out["rollups_incremental_matches_rebuild"] = incremental == rebuilt
+            return out
+    finally:
+        await engine.dispose()
+
+
+def self_check(backend: str, out: dict) -> int:
+    """Failures of *out* against its own history; prints each one."""
+    failures = 0
+    if any(out["latest_check"].values()):
+        failures += 1
+        print(f"   ❌ {backend}: country_mood_latest differs from history: {out['latest_check']}")
+    if not out["rollups_incremental_matches_rebuild"]:
+        failures += 1
+        print(f"   ❌ {backend}: incremental rollups differ from a full rebuild")
+    return failures
+
+
+async def main(postgres_url: Optional[str], sqlite_path: str) -> int:
+    if postgres_url:
+        print("⚖️  TrendsService backend parity: PostgreSQL vs SQLite")
+    else:
+        print("⚖️  TrendsService backend checks: SQLite only")
+    print("=" * 60)
+    lite = await collect(f"sqlite+aiosqlite:///{sqlite_path}")
+    failures = self_check("sqlite", lite)
+    checks = 2
+    if not postgres_url:
+        print("   ⏭️  PostgreSQL skipped (no --postgres-url / PARITY_POSTGRES_URL)")
+        print(f"\n{'✅' if not failures else '❌'} {checks - failures}/{checks} checks pass")
+        return 1 if failures else 0
+
+    pg = await collect(postgres_url)
+    failures += self_check("postgresql", pg)
+    checks += 2 + len(pg)
+    for key in pg:
+        if pg[key] != lite.get(key):
+            failures += 1
+            print(f"   ❌ {key}")
+            print(f"      postgresql: {str(pg[key])[:300]}")
+            print(f"      sqlite:     {str(lite.get(key))[:300]}")
+    print(f"\n{'✅' if not failures else '❌'} {checks - failures}/{checks} checks pass")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PostgreSQL vs SQLite TrendsService parity")
+    parser.add_argument(
+        "--postgres-url",
+        default=os.getenv("PARITY_POSTGRES_URL"),
+        help="scratch database; tables are recreated (default: PARITY_POSTGRES_URL; without one only SQLite runs)",
+    )
+    parser.add_argument("--sqlite-path", help="SQLite file (default: a temporary file)")
+    args = parser.parse_args()
+    if args.sqlite_path:
+        sys.exit(asyncio.run(main(args.postgres_url, args.sqlite_path)))
+    with tempfile.TemporaryDirectory() as tmp:
+        sys.exit(asyncio.run(main(args.postgres_url, str(Path(tmp) / "parity.db"))))
@@ -10,9 +10,11 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.db.session import engine
+from app.db.session import get_engine
 from app.config import get_settings
 
+engine = get_engine("scripts")
+
 
 async def check_database():
     """Check database status and generate report."""
@@ -10,10 +10,15 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.db.session import engine
+from sqlalchemy import text
+
+from app.db.session import get_engine
 from app.db.models import Base
+from app.db.partitions import ensure_partitions
 from app.config import get_settings
 
+engine = get_engine("scripts")
+
 
 async def create_tables():
     """Create all database tables."""
@@ -27,9 +32,16 @@ async def create_tables():
     try:
         async with engine.begin() as conn:
             print("\n🔍 Checking existing tables...")
+            if conn.dialect.name == "postgresql" and await _is_legacy_schema(conn):
+                print("\n❌ country_mood exists but is not partitioned (created by an old init_db.sql).")
+                print("   Bring it up to date with the migrations instead:")
+                print("      python -m alembic stamp 001_initial")
+                print("      python -m alembic upgrade head")
+                sys.exit(1)
 
             # Create tables (doesn't DROP, only creates missing ones)
             await conn.run_sync(Base.metadata.create_all)
+            await ensure_partitions(conn)
 
             print("✅ Tables created successfully!")
             print("\n📋 Created tables:")
@@ -37,11 +49,11 @@ async def create_tables():
                 print(f"   • {table.name}")
 
             # Check table count
-            result = await conn.execute("""
+            result = await conn.execute(text("""
                 SELECT table_name
                 FROM information_schema.tables
                 WHERE table_schema = 'public'
-            """)
+            """))
             tables = result.fetchall()
             print(f"\n📊 Total table count: {len(tables)}")
 
@@ -55,12 +67,21 @@ async def create_tables():
         sys.exit(1)
 
 
+async def _is_legacy_schema(conn) -> bool:
+    """True if country_mood is an ordinary table, i.e. predates partitioning;
+    create_all skips existing tables, so it would never be upgraded."""
+    kind = await conn.scalar(text(
+        "SELECT relkind::text FROM pg_class WHERE oid = to_regclass('public.country_mood')"
+    ))
+    return kind == "r"
+
+
 async def check_connection():
     """Test database connection."""
     print("\n🔌 Testing database connection...")
     try:
         async with engine.begin() as conn:
-            result = await conn.execute("SELECT version()")
+            result = await conn.execute(text("SELECT version()"))
             version = result.scalar()
             print(f"✅ Connection successful!")
             print(f"📦 PostgreSQL version: {version.split(',')[0]}")
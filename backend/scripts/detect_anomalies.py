@@ -0,0 +1,103 @@
+"""
+Run the anomaly engine (EWMA chart, CUSUM, IsolationForest) over all stored
+mood history.
+
+Loads every country's scores in one query into a country × day matrix and
+scores it with the configured detectors.  By default it only reports what
+would be flagged; --write stores the anomalies as mood_spike rows at the
+start of their day, skipping ones already recorded for that day and
+detector (by the ingest or an earlier run).
+
+Usage:
+    python scripts/detect_anomalies.py
+    python scripts/detect_anomalies.py --detectors ewma,cusum,iforest --since 2025-01-01
+    python scripts/detect_anomalies.py --detectors cusum --since 2025-01-01 --write
+"""
+import argparse
+import asyncio
+import datetime as dt
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core import anomaly_engine
+from app.db.models import CountryMood
+from app.db.session import READ_ONLY, get_engine, get_session_factory
+from app.services.trends_service import TrendsService
+
+engine = get_engine("scripts")
+async_session_factory = get_session_factory("scripts")
+settings = get_settings()
+
+
+async def main(detectors: list[str], since: dt.date | None, write: bool) -> int:
+    print(f"🔎 Anomaly detectors: {', '.join(detectors)}")
+    print("=" * 60)
+    try:
+        async with async_session_factory() as db:
+            started = time.perf_counter()
+            result = await db.stream(
+                select(CountryMood.country_code, CountryMood.date, CountryMood.mood_score, CountryMood.mood_label)
+                .execution_options(yield_per=50_000),
+                bind_arguments=READ_ONLY,
+            )
+            rows = [row._mapping async for row in result]
+            loaded = time.perf_counter()
+            matrix = anomaly_engine.ScoreMatrix.from_rows(rows)
+            built = time.perf_counter()
+            anomalies = anomaly_engine.detect(
+                matrix, detectors, anomaly_engine.EngineParams.from_settings(settings), since=since
+            )
+            scored = time.perf_counter()
+
+            print(f"   • {len(rows)} rows loaded in {loaded - started:.2f}s")
+            print(f"   • {len(matrix.codes)} countries × {len(matrix.days)} days built in {(built - loaded) * 1000:.0f}ms")
+            print(f"   • scored in {(scored - built) * 1000:.0f}ms")
+            for name, count in sorted(Counter(a.detector for a in anomalies).items()):
+                print(f"   • {name}: {count} anomalies")
+
+            if write and anomalies:
+                # Same (country, day, detector) key as the ingest's spikes, so
+                # ones it already stored are skipped by insert_spikes
+                stored = await TrendsService(db).insert_spikes([
+                    {
+                        "country_code": a.country_code,
+                        "detected_at": a.day,
+                        "previous_label": a.previous_label,
+                        "new_label": a.new_label,
+                        "delta": a.delta,
+                        "reason": a.reason,
+                        "detector": a.detector,
+                    }
+                    for a in anomalies
+                ])
+                print(f"\n✅ {len(stored)} new spikes stored ({len(anomalies) - len(stored)} already recorded)")
+            elif anomalies:
+                print("\nℹ️  Dry run – pass --write to store them")
+    finally:
+        await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--detectors",
+        default=",".join(d for d in settings.SPIKE_DETECTOR.split(",") if d in anomaly_engine.ENGINE_DETECTORS)
+        or "ewma,cusum",
+        help=f"comma-separated subset of {','.join(anomaly_engine.ENGINE_DETECTORS)} "
+        "(iforest takes ~1.5 s over 10 years × 60 countries, the others milliseconds)",
+    )
+    parser.add_argument("--since", type=dt.date.fromisoformat, help="report anomalies from this day on")
+    parser.add_argument("--write", action="store_true", help="store anomalies as mood_spike rows")
+    args = parser.parse_args()
+    names = [d.strip() for d in args.detectors.split(",") if d.strip()]
+    sys.exit(asyncio.run(main(names, args.since, args.write)))
@@ -0,0 +1,76 @@
+"""
+Export country_mood / mood_spike history to Parquet or Arrow IPC.
+
+Streams rows through a server-side cursor in EXPORT_BATCH_SIZE batches, so
+memory use does not grow with the amount of history exported.
+
+Usage:
+    python scripts/export_history.py --out mood.parquet
+    python scripts/export_history.py --table mood_spike --format arrow --out spikes.arrow
+    python scripts/export_history.py --start 2025-01-01 --end 2025-12-31 --countries US,GB \\
+        --compression zstd,country_name=snappy --out mood_2025.parquet
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.db.session import get_engine, get_session_factory
+from app.services.export_service import (
+    EXPORT_TABLES,
+    FORMATS,
+    Compression,
+    ExportRequest,
+    ExportService,
+)
+
+engine = get_engine("scripts")
+async_session_factory = get_session_factory("scripts")
+
+
+async def main(request: ExportRequest, out: str) -> int:
+    print(f"📦 Exporting {request.table} → {out} ({request.format})")
+    print("=" * 60)
+    started = time.perf_counter()
+    try:
+        async with async_session_factory() as db:
+            rows = await ExportService(db).write_file(request, out)
+    finally:
+        await engine.dispose()
+    size_mb = os.path.getsize(out) / 1_048_576
+    print(f"✅ {rows} rows, {size_mb:.1f} MB in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--table", choices=list(EXPORT_TABLES), default="country_mood")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--start", type=dt.date.fromisoformat, help="first day (inclusive)")
+    parser.add_argument("--end", type=dt.date.fromisoformat, help="last day (inclusive)")
+    parser.add_argument("--countries", default="", help="comma-separated ISO codes")
+    parser.add_argument("--batch-size", type=int, default=0, help="rows per batch (default EXPORT_BATCH_SIZE)")
+    parser.add_argument("--compression", help="codec with optional per-column overrides (default EXPORT_COMPRESSION)")
+    parser.add_argument("--out", help="output file (default <table>_<range>.<ext>)")
+    args = parser.parse_args()
+
+    try:
+        request = ExportRequest(
+            table=args.table,
+            format=args.format,
+            start=args.start,
+            end=args.end,
+            countries=tuple(c.strip() for c in args.countries.split(",") if c.strip()),
+            batch_size=args.batch_size,
+            **({"compression": Compression.parse(args.compression)} if args.compression else {}),
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(asyncio.run(main(request, args.out or request.filename)))
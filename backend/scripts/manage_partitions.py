@@ -0,0 +1,67 @@
+"""
+country_mood partition maintenance.
+
+Creates upcoming monthly partitions and applies the retention policy
+(MOOD_RETENTION_MONTHS / MOOD_RETENTION_MODE) by detaching whole partitions
+instead of deleting rows.  Run it from cron, e.g. daily before the ingest.
+
+Usage:
+    python scripts/manage_partitions.py
+    python scripts/manage_partitions.py --ahead 6
+    python scripts/manage_partitions.py --retention-months 24 --mode drop --dry-run
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.config import get_settings
+from app.db.partitions import apply_retention, ensure_partitions, list_partitions
+from app.db.session import get_engine
+
+engine = get_engine("scripts")
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    ahead = settings.MOOD_PARTITION_PREMAKE_MONTHS if args.ahead is None else args.ahead
+    keep = settings.MOOD_RETENTION_MONTHS if args.retention_months is None else args.retention_months
+    mode = args.mode or settings.MOOD_RETENTION_MODE
+
+    print("🗂️  country_mood partition maintenance")
+    print("=" * 60)
+
+    try:
+        async with engine.begin() as conn:
+            created = await ensure_partitions(conn, months_ahead=ahead)
+            print(f"➕ Created: {', '.join(created) if created else 'none'}")
+
+            if keep > 0:
+                expired = await apply_retention(conn, keep_months=keep, mode=mode, dry_run=args.dry_run)
+                verb = f"Would {mode}" if args.dry_run else {"drop": "Dropped", "archive": "Archived"}[mode]
+                print(f"🧹 {verb}: {', '.join(expired) if expired else 'none'}")
+            else:
+                print("🧹 Retention disabled (MOOD_RETENTION_MONTHS=0)")
+
+            partitions = await list_partitions(conn)
+            print(f"\n📋 Attached partitions ({len(partitions)}):")
+            for name in sorted(partitions):
+                print(f"   • {name}")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="country_mood partition maintenance")
+    parser.add_argument("--ahead", type=int, help="months of future partitions to pre-create")
+    parser.add_argument("--retention-months", type=int, help="months of history to keep (0 = forever)")
+    parser.add_argument("--mode", choices=["archive", "drop"], help="what to do with expired partitions")
+    parser.add_argument("--dry-run", action="store_true", help="list expired partitions without touching them")
+    asyncio.run(main(parser.parse_args()))
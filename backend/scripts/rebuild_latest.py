@@ -0,0 +1,73 @@
+"""
+Consistency check for the country_mood_latest table.
+
+Compares the materialized latest-per-country rows with the newest row of
+each country in country_mood history and rebuilds the table when they
+disagree.
+
+Usage:
+    python scripts/rebuild_latest.py           # check, rebuild if inconsistent
+    python scripts/rebuild_latest.py --check   # check only, exit 1 if inconsistent
+    python scripts/rebuild_latest.py --force   # rebuild unconditionally
+    python scripts/rebuild_latest.py --rollups # also recompute week/month rollups
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.db.session import get_engine, get_session_factory
+from app.services.trends_service import TrendsService
+
+engine = get_engine("scripts")
+async_session_factory = get_session_factory("scripts")
+
+
+async def main(check_only: bool, force: bool, rollups: bool) -> int:
+    print("🔍 country_mood_latest consistency check")
+    print("=" * 60)
+
+    try:
+        status = await _check_and_rebuild(check_only, force)
+        if rollups and not check_only:
+            async with async_session_factory() as db:
+                print("\n🔄 Recomputing week/month rollups...")
+                count = await TrendsService(db).rebuild_rollups()
+                print(f"✅ {count} rollup rows")
+        return status
+    finally:
+        await engine.dispose()
+
+
+async def _check_and_rebuild(check_only: bool, force: bool) -> int:
+    async with async_session_factory() as db:
+        svc = TrendsService(db)
+        report = await svc.check_latest()
+        for key, count in report.items():
+            print(f"   • {key:<9} {count}")
+
+        consistent = not any(report.values())
+        if consistent and not force:
+            print("\n✅ Latest table matches history")
+            return 0
+        if check_only:
+            print("\n❌ Latest table is out of sync with history")
+            return 1
+
+        print("\n🔄 Rebuilding from history...")
+        count = await svc.rebuild_latest()
+        print(f"✅ Rebuilt {count} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only report, never rebuild")
+    parser.add_argument("--force", action="store_true", help="rebuild even if consistent")
+    parser.add_argument("--rollups", action="store_true", help="also recompute country_mood_rollup")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.check, args.force, args.rollups)))
@@ -0,0 +1,99 @@
+"""
+Re-score stored mood history from its raw features.
+
+Streams valence, energy, danceability, acousticness and news_sentiment from
+country_mood and scores them with the vectorized mood engine – after
+tuning MoodParams in app/core/mood_engine.py, or under overrides given
+here.  By default it only reports what would change; --write updates the
+rows in bulk and refreshes country_mood_latest and the rollups.
+
+Usage:
+    python scripts/recompute_moods.py
+    python scripts/recompute_moods.py --param happy_min=0.25 --param news_weight=0.4
+    python scripts/recompute_moods.py --params tuned.json --countries US,GB --start 2025-01-01
+    python scripts/recompute_moods.py --rules --write
+"""
+import argparse
+import asyncio
+import datetime as dt
+import json
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.api.deps import get_redis
+from app.core.mood_engine import MoodParams
+from app.core.mood_model import RuleModel
+from app.db.session import get_engine, get_session_factory
+from app.services.recompute_service import RecomputeService
+
+engine = get_engine("scripts")
+async_session_factory = get_session_factory("scripts")
+
+
+async def main(args: argparse.Namespace, params: MoodParams) -> int:
+    print(f"🧮 Re-scoring mood history ({'write' if args.write else 'dry run'})")
+    print("=" * 60)
+    try:
+        redis = await get_redis() if args.write else None
+        async with async_session_factory() as db:
+            report = await RecomputeService(db, redis).run(
+                params,
+                write=args.write,
+                countries=[c.strip() for c in (args.countries or "").split(",") if c.strip()],
+                start=args.start,
+                end=args.end,
+                model=RuleModel() if args.rules else None,
+                batch_size=args.batch_size,
+            )
+    finally:
+        await engine.dispose()
+
+    print(f"   • model_version  {report.model_version}")
+    print(f"   • rows           {report.rows} re-scored in {report.seconds:.2f}s")
+    print(f"   • changed        {report.changed} ({report.score_changes} scores, {report.label_changes} labels)")
+    if report.score_changes:
+        print(f"   • |Δ score|      mean {report.mean_abs_delta:.4f}, max {report.max_abs_delta:.4f}")
+    for (old, new), count in report.transitions.most_common():
+        print(f"     {old:>8} → {new:<8} {count}")
+    if report.changed:
+        print(f"   • countries      {len(report.countries)}, {report.first:%Y-%m-%d} … {report.last:%Y-%m-%d}")
+
+    if report.written:
+        print(f"\n✅ {report.changed} rows updated")
+    elif report.changed:
+        print("\nℹ️  Dry run – pass --write to apply")
+    else:
+        print("\n✅ History already matches")
+    return 0
+
+
+def parse_params(args: argparse.Namespace) -> MoodParams:
+    values = json.loads(Path(args.params).read_text()) if args.params else {}
+    for item in args.param:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected NAME=VALUE, got {item!r}")
+        values[name.strip()] = value
+    return MoodParams.from_dict(values)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUE", help="override one MoodParams field")
+    parser.add_argument("--params", metavar="FILE", help="JSON object of MoodParams overrides")
+    parser.add_argument("--countries", help="comma-separated ISO codes (default: all)")
+    parser.add_argument("--start", type=dt.date.fromisoformat, help="first day (inclusive)")
+    parser.add_argument("--end", type=dt.date.fromisoformat, help="last day (inclusive)")
+    parser.add_argument("--rules", action="store_true", help="label with the rule engine even if a trained model is configured")
+    parser.add_argument("--batch-size", type=int, help="rows per fetch (default RECOMPUTE_BATCH_SIZE)")
+    parser.add_argument("--write", action="store_true", help="apply the changes")
+    args = parser.parse_args()
+    try:
+        params = parse_params(args)
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(asyncio.run(main(args, params)))
@@ -0,0 +1,108 @@
+"""
+Train a mood classifier and save it as a versioned joblib artifact.
+
+Learns mood_label from valence, energy, danceability, acousticness and
+news_sentiment – by default from the stored country_mood history, or from
+labelled CSV / Parquet files with those columns plus mood_label.  The
+artifact lands in MOOD_MODEL_DIR as <version>.joblib; set
+MOOD_MODEL_VERSION=<version> to use it.
+
+Usage:
+    python scripts/train_mood_model.py
+    python scripts/train_mood_model.py --input labelled.parquet --version hgb-2025-06
+"""
+import argparse
+import asyncio
+import datetime as dt
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.mood_engine import MOOD_LABELS
+from app.core.mood_model import FEATURES, save_model
+from app.db.models import CountryMood
+from app.db.session import READ_ONLY, get_engine, get_session_factory
+
+engine = get_engine("scripts")
+async_session_factory = get_session_factory("scripts")
+settings = get_settings()
+
+
+async def load_history() -> pd.DataFrame:
+    columns = [getattr(CountryMood, c) for c in (*FEATURES, "mood_label")]
+    try:
+        async with async_session_factory() as db:
+            result = await db.stream(
+                select(*columns).execution_options(yield_per=50_000), bind_arguments=READ_ONLY
+            )
+            rows = [tuple(row) async for row in result]
+    finally:
+        await engine.dispose()
+    return pd.DataFrame(rows, columns=[*FEATURES, "mood_label"])
+
+
+def load_files(paths: list[str]) -> pd.DataFrame:
+    frames = [pd.read_parquet(p) if p.endswith(".parquet") else pd.read_csv(p) for p in paths]
+    return pd.concat(frames, ignore_index=True)
+
+
+def train(frame: pd.DataFrame, holdout: float, seed: int):
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.model_selection import train_test_split
+
+    frame = frame[frame["mood_label"].isin(MOOD_LABELS)]
+    frame = frame.dropna(subset=["valence", "energy"])
+    X = frame[list(FEATURES)].astype(float).fillna({"danceability": 0.5, "acousticness": 0.5}).to_numpy()
+    y = frame["mood_label"].to_numpy()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=holdout, random_state=seed, stratify=y)
+
+    # Handles NaN (rows without news sentiment) natively
+    model = HistGradientBoostingClassifier(random_state=seed).fit(X_train, y_train)
+    accuracy = float(np.mean(model.predict(X_test) == y_test))
+    return model, accuracy, len(X_train), len(X_test)
+
+
+def main(args) -> int:
+    version = args.version or f"hgb-{dt.date.today():%Y%m%d}"
+    print(f"🧠 Training mood model {version}")
+    print("=" * 60)
+    frame = load_files(args.input) if args.input else asyncio.run(load_history())
+    if frame.empty:
+        print("\n⚠️  No labelled rows to train on")
+        return 1
+
+    started = time.perf_counter()
+    model, accuracy, n_train, n_test = train(frame, args.holdout, args.seed)
+    print(f"   • {n_train} training rows, {n_test} held out")
+    print(f"   • hold-out accuracy {accuracy:.3f} in {time.perf_counter() - started:.1f}s")
+
+    path = save_model(
+        model,
+        args.out_dir or settings.MOOD_MODEL_DIR,
+        version,
+        accuracy=accuracy,
+        training_rows=n_train,
+        source=", ".join(args.input) if args.input else "country_mood",
+    )
+    print(f"\n✅ Saved {path} – set MOOD_MODEL_VERSION={version} to use it")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--input", nargs="+", help="labelled .csv / .parquet files (default: country_mood history)")
+    parser.add_argument("--version", help="artifact version (default hgb-YYYYMMDD)")
+    parser.add_argument("--out-dir", help="artifact directory (default MOOD_MODEL_DIR)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="share of rows held out for accuracy")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(main(parser.parse_args()))
@@ -52,6 +52,7 @@ export interface Spike {
   new_label: string;
   delta: number;
   reason: string | null;
+  detector: string;
 }
 
 export interface SpikeListResponse {
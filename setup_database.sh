@@ -103,11 +103,11 @@ else
     echo "  pip install -r requirements.txt"
 fi
 
-# Create tables
+# Create tables: the schema comes from the Alembic migrations
 echo ""
-echo "📊 Creating database tables..."
+echo "📊 Creating database tables (alembic upgrade head)..."
 cd "$SCRIPT_DIR/backend"
-python scripts/create_tables.py
+python scripts/run_migrations.py
 
 # Check database status
 echo ""